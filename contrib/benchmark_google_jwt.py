@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the cost of building the signed JWT assertion which Google Service
+Account authentication exchanges for a token.
+
+Every available signing backend is measured with a cold key cache (the
+private key is parsed for every assertion) and with a warm one. A key is
+generated if none is given. Example usage:
+
+    python contrib/benchmark_google_jwt.py --runs 200
+    python contrib/benchmark_google_jwt.py --key ~/service-account.json
+"""
+
+from __future__ import with_statement
+from __future__ import print_function
+
+import os
+import sys
+import time
+import argparse
+
+this_dir = os.path.abspath(os.path.split(__file__)[0])
+root_dir = os.path.abspath(os.path.join(this_dir, '../'))
+sys.path.insert(0, root_dir)
+
+from libcloud.common import google  # NOQA
+from libcloud.common.google import GoogleServiceAcctAuthConnection  # NOQA
+
+
+def generate_key():
+    """
+    Generate a PEM encoded RSA private key with cryptography, falling back
+    to PyCrypto. Returns None if neither of them is installed.
+    """
+    try:
+        from cryptography.hazmat.backends import default_backend
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+    except ImportError:
+        pass
+    else:
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048,
+                                       backend=default_backend())
+        return key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.TraditionalOpenSSL,
+            encryption_algorithm=serialization.NoEncryption()
+        ).decode('utf-8')
+
+    try:
+        from Crypto.PublicKey import RSA
+    except ImportError:
+        return None
+
+    return RSA.generate(2048).exportKey().decode('utf-8')
+
+
+def measure(conn, runs, cached):
+    """
+    Return the duration (in seconds) of every assertion.
+    """
+    durations = []
+
+    for _ in range(runs):
+        if not cached:
+            google.JWT_SIGNER_CACHE.clear()
+
+        start = time.time()
+        conn.get_jwt_assertion()
+        durations.append(time.time() - start)
+
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--key', help='Path to a PEM or JSON private key')
+    parser.add_argument('--runs', type=int, default=100,
+                        help='Number of assertions per measurement')
+    args = parser.parse_args()
+
+    key = args.key or generate_key()
+
+    if not key:
+        print('Generating a key requires cryptography or PyCrypto, install '
+              'one of them or pass an existing key with --key')
+        sys.exit(1)
+
+    print('%-15s %-6s %10s %10s %10s' % ('backend', 'cache', 'min (ms)',
+                                         'median', 'max'))
+
+    for signer_class in google.JWT_SIGNER_CLASSES:
+        if not signer_class.is_available():
+            print('%-15s unavailable' % (signer_class.name))
+            continue
+
+        conn = GoogleServiceAcctAuthConnection('bench@example.com', key)
+        conn.signer_class = signer_class
+
+        for cached in (False, True):
+            durations = sorted(measure(conn, args.runs, cached))
+            median = durations[len(durations) // 2]
+
+            print('%-15s %-6s %10.3f %10.3f %10.3f' % (
+                signer_class.name, 'warm' if cached else 'cold',
+                durations[0] * 1000, median * 1000, durations[-1] * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the cold start cost of importing libcloud modules.
+
+Every module is imported in a fresh interpreter so nothing is shared between
+the runs. Example usage:
+
+    python contrib/benchmark_import_time.py --runs 20
+    python contrib/benchmark_import_time.py libcloud.storage.drivers.s3
+"""
+
+from __future__ import with_statement
+from __future__ import print_function
+
+import os
+import sys
+import argparse
+import subprocess
+
+this_dir = os.path.abspath(os.path.split(__file__)[0])
+root_dir = os.path.abspath(os.path.join(this_dir, '../'))
+
+DEFAULT_MODULES = [
+    'libcloud',
+    'libcloud.compute.base',
+    'libcloud.compute.drivers.ec2',
+    'libcloud.compute.drivers.gce',
+]
+
+IMPORT_SCRIPT = """
+import sys
+import time
+
+start = time.time()
+import %(module)s
+duration = time.time() - start
+
+print('%%.6f %%s' %% (duration, 'paramiko' in sys.modules))
+"""
+
+
+def measure_import_time(module, runs):
+    """
+    Import the module ``runs`` times and return a list of durations (in
+    seconds) and a flag indicating whether paramiko got imported.
+    """
+    env = os.environ.copy()
+    env['PYTHONPATH'] = root_dir
+
+    durations = []
+    imported_paramiko = False
+
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, '-c',
+                                          IMPORT_SCRIPT % {'module': module}],
+                                         env=env)
+        duration, paramiko = output.decode('utf-8').strip().split(' ')
+        durations.append(float(duration))
+        imported_paramiko = imported_paramiko or paramiko == 'True'
+
+    return durations, imported_paramiko
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES,
+                        help='Modules to import')
+    parser.add_argument('--runs', type=int, default=10,
+                        help='Number of fresh interpreters per module')
+    args = parser.parse_args()
+
+    print('%-40s %10s %10s %10s  %s' % ('module', 'min (ms)', 'median',
+                                        'max', 'paramiko'))
+
+    for module in args.modules:
+        durations, imported_paramiko = measure_import_time(module,
+                                                           args.runs)
+        durations = sorted(durations)
+        median = durations[len(durations) // 2]
+
+        print('%-40s %10.1f %10.1f %10.1f  %s' % (
+            module, durations[0] * 1000, median * 1000, durations[-1] * 1000,
+            'yes' if imported_paramiko else 'no'))
+
+
+if __name__ == '__main__':
+    main()
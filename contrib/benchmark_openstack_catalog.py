@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the cost of parsing a large Keystone v3 service catalog and of the
+endpoint lookups performed by the OpenStack drivers.
+
+The catalog is generated with the given number of services and regions and
+three interfaces (public, internal, admin) per region. The catalog is indexed
+while it's parsed, so "parse" includes that cost. Example usage:
+
+    python contrib/benchmark_openstack_catalog.py --services 50 --regions 20
+"""
+
+from __future__ import with_statement
+from __future__ import print_function
+
+import os
+import sys
+import time
+import argparse
+
+this_dir = os.path.abspath(os.path.split(__file__)[0])
+root_dir = os.path.abspath(os.path.join(this_dir, '../'))
+sys.path.insert(0, root_dir)
+
+from libcloud.common.openstack_identity import OpenStackServiceCatalog  # NOQA
+
+INTERFACES = ['public', 'internal', 'admin']
+
+
+def generate_catalog(services, regions):
+    """
+    Return a v3 service catalog with ``services`` services, each of them
+    available in ``regions`` regions.
+    """
+    catalog = []
+
+    for service_index in range(services):
+        name = 'service-%s' % (service_index)
+        endpoints = []
+
+        for region_index in range(regions):
+            region = 'region-%s' % (region_index)
+
+            for interface in INTERFACES:
+                url = 'https://%s.%s.%s.example.com/v1' % (
+                    interface, name, region)
+                endpoints.append({'interface': interface, 'region': region,
+                                  'region_id': region, 'url': url})
+
+        catalog.append({'type': 'type-%s' % (service_index), 'name': name,
+                        'endpoints': endpoints})
+
+    return catalog
+
+
+def measure(func, runs):
+    """
+    Call ``func`` ``runs`` times and return the average duration in seconds.
+    """
+    start = time.time()
+
+    for _ in range(runs):
+        func()
+
+    return (time.time() - start) / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--services', type=int, default=50,
+                        help='Number of services in the catalog')
+    parser.add_argument('--regions', type=int, default=20,
+                        help='Number of regions per service')
+    parser.add_argument('--runs', type=int, default=1000,
+                        help='Number of lookups to time')
+    args = parser.parse_args()
+
+    service_catalog = generate_catalog(args.services, args.regions)
+    last_service = args.services - 1
+    last_region = args.regions - 1
+
+    def parse():
+        return OpenStackServiceCatalog(service_catalog=service_catalog,
+                                       auth_version='3.x')
+
+    catalog = parse()
+
+    lookups = [
+        ('get_endpoint', lambda: catalog.get_endpoint(
+            service_type='type-%s' % (last_service),
+            name='service-%s' % (last_service),
+            region='region-%s' % (last_region))),
+        ('get_endpoints', lambda: catalog.get_endpoints(
+            service_type='type-%s' % (last_service))),
+        ('get_regions', lambda: catalog.get_regions(
+            service_type='type-%s' % (last_service))),
+        ('get_service_types', lambda: catalog.get_service_types(
+            region='region-%s' % (last_region))),
+    ]
+
+    print('catalog: %s services, %s regions, %s endpoints' % (
+        args.services, args.regions,
+        args.services * args.regions * len(INTERFACES)))
+    print('%-20s %12s' % ('operation', 'avg (ms)'))
+    parse_runs = max(args.runs // 100, 1)
+    print('%-20s %12.3f' % ('parse', measure(parse, parse_runs) * 1000))
+
+    for name, func in lookups:
+        print('%-20s %12.4f' % (name, measure(func, args.runs) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -26,12 +26,9 @@ from libcloud.base import DriverType  # NOQA
 from libcloud.base import DriverTypeFactoryMap  # NOQA
 from libcloud.base import get_driver  # NOQA
 
-
-try:
-    import paramiko
-    have_paramiko = True
-except ImportError:
-    have_paramiko = False
+# Only checks that paramiko is available, paramiko itself is imported lazily
+from libcloud.compute.ssh import have_paramiko  # NOQA
+from libcloud.compute.ssh import _import_paramiko
 
 __all__ = [
     '__version__',
@@ -62,6 +59,8 @@ def _init_once():
     This checks for the LIBCLOUD_DEBUG environment variable, which if it exists
     is where we will log debug information about the provider transports.
     """
+    global have_paramiko
+
     path = os.getenv('LIBCLOUD_DEBUG')
     if path:
         mode = 'a'
@@ -78,8 +77,12 @@ def _init_once():
         fo = codecs.open(path, mode, encoding='utf8')
         enable_debug(fo)
 
-        if have_paramiko:
+        # paramiko is only imported here since it is slow to import
+        paramiko = _import_paramiko()
+        if paramiko is not None:
             paramiko_logger = paramiko.util.logging.getLogger()
             paramiko_logger.setLevel(logging.DEBUG)
+        else:
+            have_paramiko = False
 
 _init_once()
@@ -21,6 +21,7 @@ import socket
 import copy
 import binascii
 import time
+import threading
 
 from libcloud.utils.py3 import ET
 
@@ -305,7 +306,6 @@ class Connection(object):
     timeout = None
     secure = 1
     driver = None
-    action = None
     cache_busting = False
     backoff = None
     retry_delay = None
@@ -346,6 +346,49 @@ class Connection(object):
         self.backoff = backoff
         self.proxy_url = proxy_url
 
+    def _get_request_state(self):
+        # The values of the request being made are stored per thread so the
+        # hooks (e.g. request signing) can read them back while other threads
+        # issue requests using the same connection
+        state = self.__dict__.get('_request_state')
+        if state is None:
+            state = self.__dict__.setdefault('_request_state',
+                                             threading.local())
+        return state
+
+    @property
+    def action(self):
+        """
+        Action (path) of the request made by the current thread.
+        """
+        return getattr(self._get_request_state(), 'action', None)
+
+    @action.setter
+    def action(self, value):
+        self._get_request_state().action = value
+
+    @property
+    def method(self):
+        """
+        HTTP method of the request made by the current thread.
+        """
+        return getattr(self._get_request_state(), 'method', None)
+
+    @method.setter
+    def method(self, value):
+        self._get_request_state().method = value
+
+    @property
+    def data(self):
+        """
+        Body of the request made by the current thread.
+        """
+        return getattr(self._get_request_state(), 'data', None)
+
+    @data.setter
+    def data(self, value):
+        self._get_request_state().data = value
+
     def set_http_proxy(self, proxy_url):
         """
         Set a HTTP proxy which will be used with this connection.
@@ -577,11 +620,14 @@ class Connection(object):
         if self.connection is None:
             self.connect()
 
+        # Keep a reference in case another thread replaces the connection
+        connection = self.connection
+
         try:
             # @TODO: Should we just pass File object as body to request method
             # instead of dealing with splitting and sending the file ourselves?
             if raw:
-                self.connection.prepared_request(
+                connection.prepared_request(
                     method=method,
                     url=url,
                     body=data,
@@ -593,14 +639,14 @@ class Connection(object):
                     retry_request = retry(timeout=self.timeout,
                                           retry_delay=self.retry_delay,
                                           backoff=self.backoff)
-                    retry_request(self.connection.request)(method=method,
-                                                           url=url,
-                                                           body=data,
-                                                           headers=headers,
-                                                           stream=stream)
+                    retry_request(connection.request)(method=method,
+                                                      url=url,
+                                                      body=data,
+                                                      headers=headers,
+                                                      stream=stream)
                 else:
-                    self.connection.request(method=method, url=url, body=data,
-                                            headers=headers, stream=stream)
+                    connection.request(method=method, url=url, body=data,
+                                       headers=headers, stream=stream)
         except socket.gaierror:
             e = sys.exc_info()[1]
             message = str(e)
@@ -627,11 +673,11 @@ class Connection(object):
         if raw:
             responseCls = self.rawResponseCls
             kwargs = {'connection': self,
-                      'response': self.connection.getresponse()}
+                      'response': connection.getresponse()}
         else:
             responseCls = self.responseCls
             kwargs = {'connection': self,
-                      'response': self.connection.getresponse()}
+                      'response': connection.getresponse()}
 
         try:
             response = responseCls(**kwargs)
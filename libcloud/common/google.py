@@ -24,8 +24,8 @@ OAUTH2: Service Accounts and Client IDs for Installed Applications.
 Both are initially set up from the Cloud Console Console -
 https://cloud.google.com/console
 
-Setting up Service Account authentication (note that you need the PyCrypto
-package installed to use this):
+Setting up Service Account authentication (note that you need the
+cryptography or the PyCrypto package installed to use this):
 
 - Go to the Console
 - Go to your project and then to "APIs & auth" on the left
@@ -72,6 +72,7 @@ try:
 except ImportError:
     import json
 
+import hashlib
 import logging
 import base64
 import errno
@@ -80,8 +81,10 @@ import datetime
 import os
 import socket
 import sys
+import threading
 
 from libcloud.utils.connection import get_response_object
+from libcloud.utils.files import lock_file, write_file_atomically
 from libcloud.utils.py3 import b, httplib, urlencode, urlparse, PY3
 from libcloud.common.base import (ConnectionUserAndKey, JsonResponse,
                                   PollingConnection)
@@ -102,6 +105,15 @@ except ImportError:
 
 UTC_TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
 
+# The JWT header used for Service Account authentication is always the same
+JWT_HEADER_ENC = base64.urlsafe_b64encode(
+    b(json.dumps({'alg': 'RS256', 'typ': 'JWT'})))
+
+# Signers holding parsed private keys, shared by all the connections which
+# use the same key. Keyed by (signer class name, SHA256 digest of the key).
+JWT_SIGNER_CACHE = {}
+JWT_SIGNER_CACHE_LOCK = threading.Lock()
+
 LOG = logging.getLogger(__name__)
 
 
@@ -468,12 +480,100 @@ class GoogleInstalledAppAuthConnection(GoogleBaseAuthConnection):
         return new_token
 
 
+class CryptographyJWTSigner(object):
+    """
+    Sign JWT assertions with RS256 using the cryptography library.
+    """
+    name = 'cryptography'
+
+    def __init__(self, key):
+        from cryptography.hazmat.backends import default_backend
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import padding
+
+        self._key = serialization.load_pem_private_key(
+            b(key), password=None, backend=default_backend())
+        self._padding = padding.PKCS1v15()
+        self._hash = hashes.SHA256()
+
+    @classmethod
+    def is_available(cls):
+        try:
+            import cryptography  # NOQA
+        except ImportError:
+            return False
+        return True
+
+    def sign(self, message):
+        return self._key.sign(message, self._padding, self._hash)
+
+
+class PyCryptoJWTSigner(object):
+    """
+    Sign JWT assertions with RS256 using the PyCrypto library.
+    """
+    name = 'pycrypto'
+
+    def __init__(self, key):
+        self._signer = PKCS1_v1_5.new(RSA.importKey(key))
+
+    @classmethod
+    def is_available(cls):
+        return SHA256 is not None
+
+    def sign(self, message):
+        return self._signer.sign(SHA256.new(message))
+
+
+# Signers in the order of preference. The cryptography library is preferred
+# because it's backed by OpenSSL and signs a lot faster than PyCrypto.
+JWT_SIGNER_CLASSES = [CryptographyJWTSigner, PyCryptoJWTSigner]
+
+
+def get_jwt_signer_class():
+    """
+    Return the first available signer class from JWT_SIGNER_CLASSES.
+
+    :rtype: ``type`` or ``None``
+    """
+    for signer_class in JWT_SIGNER_CLASSES:
+        if signer_class.is_available():
+            return signer_class
+    return None
+
+
+def get_jwt_signer(key, signer_class):
+    """
+    Return a signer for the private key, parsing the key only once.
+
+    :param  key: The RSA private key in the PEM format.
+    :type   key: ``str``
+
+    :param  signer_class: The signer class to use.
+    :type   signer_class: ``type``
+    """
+    cache_key = (signer_class.name, hashlib.sha256(b(key)).hexdigest())
+
+    with JWT_SIGNER_CACHE_LOCK:
+        signer = JWT_SIGNER_CACHE.get(cache_key)
+        if signer is None:
+            signer = signer_class(key)
+            JWT_SIGNER_CACHE[cache_key] = signer
+    return signer
+
+
 class GoogleServiceAcctAuthConnection(GoogleBaseAuthConnection):
     """Authentication class for "Service Account" authentication."""
+
+    # Signer class used to sign the JWT assertions (e.g.
+    # CryptographyJWTSigner). The first available one from
+    # JWT_SIGNER_CLASSES is used if None.
+    signer_class = None
+
     def __init__(self, user_id, key, *args, **kwargs):
         """
-        Check to see if PyCrypto is available, and convert key file path into a
-        key string if the key is in a file.
+        Check to see if a library to sign the JWT assertions is available, and
+        convert key file path into a key string if the key is in a file.
 
         :param  user_id: Email address to be used for Service Account
                 authentication.
@@ -482,9 +582,11 @@ class GoogleServiceAcctAuthConnection(GoogleBaseAuthConnection):
         :param  key: The RSA Key or path to file containing the key.
         :type   key: ``str``
         """
-        if SHA256 is None:
-            raise GoogleAuthError('PyCrypto library required for '
-                                  'Service Account Authentication.')
+        if self.signer_class is None:
+            self.signer_class = get_jwt_signer_class()
+        if self.signer_class is None:
+            raise GoogleAuthError('cryptography or PyCrypto library required '
+                                  'for Service Account Authentication.')
         # Check to see if 'key' is a file and read the file if it is.
         if key.find("PRIVATE KEY---") == -1:
             # key is a file
@@ -511,32 +613,35 @@ class GoogleServiceAcctAuthConnection(GoogleBaseAuthConnection):
         :return:  Dictionary containing token information
         :rtype:   ``dict``
         """
-        # The header is always the same
-        header = {'alg': 'RS256', 'typ': 'JWT'}
-        header_enc = base64.urlsafe_b64encode(b(json.dumps(header)))
+        request = {'grant_type': 'urn:ietf:params:oauth:grant-type:jwt-bearer',
+                   'assertion': self.get_jwt_assertion()}
+
+        return self._token_request(request)
+
+    def get_jwt_assertion(self):
+        """
+        Build and sign the JWT assertion exchanged for a token.
 
+        :return:  The signed JWT.
+        :rtype:   ``bytes``
+        """
         # Construct a claim set
+        now = int(time.time())
         claim_set = {'iss': self.user_id,
                      'scope': self.scopes,
                      'aud': 'https://accounts.google.com/o/oauth2/token',
-                     'exp': int(time.time()) + 3600,
-                     'iat': int(time.time())}
+                     'exp': now + 3600,
+                     'iat': now}
         claim_set_enc = base64.urlsafe_b64encode(b(json.dumps(claim_set)))
 
         # The message contains both the header and claim set
-        message = b'.'.join((header_enc, claim_set_enc))
-        # Then the message is signed using the key supplied
-        key = RSA.importKey(self.key)
-        hash_func = SHA256.new(message)
-        signer = PKCS1_v1_5.new(key)
-        signature = base64.urlsafe_b64encode(signer.sign(hash_func))
-
-        # Finally the message and signature are sent to get a token
-        jwt = b'.'.join((message, signature))
-        request = {'grant_type': 'urn:ietf:params:oauth:grant-type:jwt-bearer',
-                   'assertion': jwt}
+        message = b'.'.join((JWT_HEADER_ENC, claim_set_enc))
+        # Then the message is signed using the key supplied. The key is only
+        # parsed the first time it's used.
+        signer = get_jwt_signer(self.key, self.signer_class)
+        signature = base64.urlsafe_b64encode(signer.sign(message))
 
-        return self._token_request(request)
+        return b'.'.join((message, signature))
 
 
 class GoogleGCEServiceAcctAuthConnection(GoogleBaseAuthConnection):
@@ -622,6 +727,14 @@ class GoogleAuthType(object):
 class GoogleOAuth2Credential(object):
     default_credential_file = '~/.google_libcloud_auth'
 
+    # Tokens which expire in less than this many seconds are refreshed in a
+    # background thread while the current token is still being used.
+    token_refresh_margin = 300
+
+    # Background refreshes are skipped for this many seconds after one has
+    # failed.
+    token_refresh_retry_interval = 30
+
     def __init__(self, user_id, key, auth_type=None, credential_file=None,
                  scopes=None, **kwargs):
         self.auth_type = auth_type or GoogleAuthType.guess_type(user_id)
@@ -643,6 +756,10 @@ class GoogleOAuth2Credential(object):
             'https://www.googleapis.com/auth/ndev.clouddns.readwrite',
         ]
 
+        self._token_lock = threading.Lock()
+        self._refresh_thread = None
+        self._refresh_failed_at = None
+
         self.token = self._get_token_from_file()
 
         if self.auth_type == GoogleAuthType.GCE:
@@ -659,22 +776,111 @@ class GoogleOAuth2Credential(object):
                                   str(self.auth_type))
 
         if self.token is None:
-            self.token = self.oauth2_conn.get_new_token()
-            self._write_token_to_file()
+            self._get_new_token()
 
     @property
     def access_token(self):
-        if self.token_expire_utc_datetime < _utcnow():
+        now = _utcnow()
+        expire_time = self.token_expire_utc_datetime
+        if expire_time < now:
             self._refresh_token()
+        elif expire_time < now + datetime.timedelta(
+                seconds=self.token_refresh_margin):
+            self._start_background_refresh()
         return self.token['access_token']
 
     @property
     def token_expire_utc_datetime(self):
         return _from_utc_timestamp(self.token['expire_time'])
 
+    def _get_new_token(self):
+        """
+        Get a new token unless another process cached one in the meantime.
+        """
+        with self._lock_token_file():
+            token = self._get_token_from_file()
+            if token is not None:
+                self.token = token
+                return
+
+            self.token = self.oauth2_conn.get_new_token()
+            self._write_token_to_file()
+
     def _refresh_token(self):
-        self.token = self.oauth2_conn.refresh_token(self.token)
-        self._write_token_to_file()
+        """
+        Refresh the token unless another thread or process already did.
+
+        Only one process holding the lock on the credential file refreshes
+        the token, the other ones pick up the token it writes to the file.
+        """
+        with self._token_lock:
+            if not self._token_needs_refresh(self.token):
+                return
+
+            with self._lock_token_file():
+                token = self._get_token_from_file()
+                if token is not None and \
+                        not self._token_needs_refresh(token):
+                    self.token = token
+                    return
+
+                self.token = self.oauth2_conn.refresh_token(self.token)
+                self._write_token_to_file()
+
+    def _token_needs_refresh(self, token):
+        """
+        Return True if the token expires within ``token_refresh_margin``.
+        """
+        try:
+            expire_time = _from_utc_timestamp(token['expire_time'])
+        except (KeyError, ValueError):
+            return True
+
+        margin = datetime.timedelta(seconds=self.token_refresh_margin)
+        return expire_time < _utcnow() + margin
+
+    def _start_background_refresh(self):
+        """
+        Refresh the token in a daemon thread unless one is already running
+        or the last one failed less than ``token_refresh_retry_interval``
+        seconds ago.
+        """
+        with self._token_lock:
+            thread = self._refresh_thread
+            if thread is not None and thread.is_alive():
+                return
+
+            retry_interval = self.token_refresh_retry_interval
+            failed_at = self._refresh_failed_at
+            if failed_at is not None and \
+                    time.time() < failed_at + retry_interval:
+                return
+
+            thread = threading.Thread(target=self._background_refresh)
+            thread.daemon = True
+            self._refresh_thread = thread
+            thread.start()
+
+    def _background_refresh(self):
+        try:
+            self._refresh_token()
+        except Exception:
+            # Not fatal, the token is refreshed synchronously once it expires
+            e = sys.exc_info()[1]
+            self._refresh_failed_at = time.time()
+            LOG.info('Failed to refresh auth token in background: %s',
+                     str(e))
+        else:
+            self._refresh_failed_at = None
+
+    def _lock_token_file(self):
+        """
+        Hold an exclusive lock on the credential file while a token is
+        acquired so concurrently started processes don't all request one.
+        Mocked in libcloud.test.common.google.GoogleTestCase.
+        """
+        filename = os.path.expanduser(self.credential_file)
+        return lock_file(os.path.realpath(filename) + '.lock')
 
     def _get_token_from_file(self):
         """
@@ -710,10 +916,8 @@ class GoogleOAuth2Credential(object):
 
         try:
             data = json.dumps(self.token)
-            write_flags = os.O_CREAT | os.O_WRONLY | os.O_TRUNC
-            with os.fdopen(os.open(filename, write_flags,
-                                   int('600', 8)), 'w') as f:
-                f.write(data)
+            # Other processes never read a partially written file
+            write_file_atomically(filename, data, mode=int('600', 8))
         except:
             # Note: Failure to write (cache) token in a file is not fatal. It
             # simply means degraded performance since we will need to acquire a
@@ -17,14 +17,21 @@
 Common utilities for OpenStack
 """
 
+import sys
+import hashlib
+
 from libcloud.utils.py3 import ET
+from libcloud.utils.py3 import b
 from libcloud.utils.py3 import httplib
 
 from libcloud.common.base import ConnectionUserAndKey, Response
+from libcloud.common.exceptions import BaseHTTPError
 from libcloud.common.types import ProviderError
+from libcloud.common.types import InvalidCredsError
 from libcloud.compute.types import (LibcloudError, MalformedResponseError)
 from libcloud.compute.types import KeyPairDoesNotExistError
 from libcloud.common.openstack_identity import get_class_for_auth_version
+from libcloud.common.openstack_identity import AUTH_CACHE
 
 # Imports for backward compatibility reasons
 from libcloud.common.openstack_identity import (OpenStackServiceCatalog,
@@ -123,6 +130,18 @@ class OpenStackBaseConnection(ConnectionUserAndKey):
                                     If not specified, a provider specific
                                     default will be used.
     :type ex_force_service_region: ``str``
+
+    :param ex_auth_cache: Share the auth token and the service catalog with
+                          the other connections which use the same
+                          credentials instead of authenticating again.
+                          (False by default.)
+    :type ex_auth_cache: ``bool``
+
+    :param ex_auth_cache_file: Path to a file the shared auth tokens and
+                               service catalogs are persisted to so other
+                               processes can use them as well. Implies
+                               ``ex_auth_cache``.
+    :type ex_auth_cache_file: ``str``
     """
 
     auth_url = None
@@ -148,6 +167,8 @@ class OpenStackBaseConnection(ConnectionUserAndKey):
                  ex_force_service_type=None,
                  ex_force_service_name=None,
                  ex_force_service_region=None,
+                 ex_auth_cache=False,
+                 ex_auth_cache_file=None,
                  retry_delay=None, backoff=None):
         super(OpenStackBaseConnection, self).__init__(
             user_id, key, secure=secure, timeout=timeout,
@@ -165,8 +186,13 @@ class OpenStackBaseConnection(ConnectionUserAndKey):
         self._ex_force_service_type = ex_force_service_type
         self._ex_force_service_name = ex_force_service_name
         self._ex_force_service_region = ex_force_service_region
+        self._ex_auth_cache = ex_auth_cache or bool(ex_auth_cache_file)
+        self._ex_auth_cache_file = ex_auth_cache_file
         self._osa = None
 
+        # True if the current token has been obtained from AUTH_CACHE
+        self._auth_from_cache = False
+
         if ex_force_auth_token and not ex_force_base_url:
             raise LibcloudError(
                 'Must also provide ex_force_base_url when specifying '
@@ -215,12 +241,24 @@ class OpenStackBaseConnection(ConnectionUserAndKey):
         if method.upper() in ['POST', 'PUT'] and default_content_type:
             headers = {'Content-Type': default_content_type}
 
-        return super(OpenStackBaseConnection, self).request(action=action,
-                                                            params=params,
-                                                            data=data,
-                                                            method=method,
-                                                            headers=headers,
-                                                            raw=raw)
+        try:
+            return super(OpenStackBaseConnection, self).request(
+                action=action, params=params, data=data, method=method,
+                headers=headers, raw=raw)
+        except (InvalidCredsError, BaseHTTPError):
+            e = sys.exc_info()[1]
+            code = getattr(e, 'code', getattr(e, 'http_code', None))
+
+            if not self._auth_from_cache or code != httplib.UNAUTHORIZED:
+                raise
+
+            # The shared token has been revoked or the account has changed.
+            # Drop it from the cache and authenticate once again.
+            self._invalidate_cached_auth()
+
+            return super(OpenStackBaseConnection, self).request(
+                action=action, params=params, data=data, method=method,
+                headers=headers, raw=raw)
 
     def _get_auth_url(self):
         """
@@ -312,29 +350,107 @@ class OpenStackBaseConnection(ConnectionUserAndKey):
             return
 
         if not osa.is_token_valid():
-            # Token is not available or it has expired. Need to retrieve a
-            # new one.
-            if self._auth_version == '2.0_apikey':
-                kwargs = {'auth_type': 'api_key'}
-            elif self._auth_version == '2.0_password':
-                kwargs = {'auth_type': 'password'}
+            # Token is not available or it has expired. Use the token another
+            # connection retrieved for the same credentials or retrieve a new
+            # one.
+            cache_entry = self._get_cached_auth()
+
+            self._auth_from_cache = cache_entry is not None
+
+            if cache_entry is not None:
+                osa.auth_token = cache_entry['auth_token']
+                osa.auth_token_expires = cache_entry['auth_token_expires']
+                osa.auth_user_info = cache_entry['auth_user_info']
+                osa.urls = cache_entry['urls']
             else:
-                kwargs = {}
+                if self._auth_version == '2.0_apikey':
+                    kwargs = {'auth_type': 'api_key'}
+                elif self._auth_version == '2.0_password':
+                    kwargs = {'auth_type': 'password'}
+                else:
+                    kwargs = {}
 
-            osa = osa.authenticate(**kwargs)  # may throw InvalidCreds
+                osa = osa.authenticate(**kwargs)  # may throw InvalidCreds
 
             self.auth_token = osa.auth_token
             self.auth_token_expires = osa.auth_token_expires
             self.auth_user_info = osa.auth_user_info
 
-            # Pull out and parse the service catalog
-            osc = OpenStackServiceCatalog(service_catalog=osa.urls,
-                                          auth_version=self._auth_version)
+            # Pull out and parse the service catalog. The parsed catalog is
+            # shared as well.
+            osc = cache_entry and cache_entry.get('service_catalog')
+
+            if osc is None:
+                osc = OpenStackServiceCatalog(service_catalog=osa.urls,
+                                              auth_version=self._auth_version)
             self.service_catalog = osc
 
+            if cache_entry is not None:
+                cache_entry['service_catalog'] = osc
+            elif osa.is_token_valid():
+                self._cache_auth(osa, osc)
+
         url = self._ex_force_base_url or self.get_endpoint()
         self._set_up_connection_info(url=url)
 
+    def _get_auth_cache_key(self):
+        """
+        Return the key identifying the credentials used by this connection
+        in the auth cache. Only a digest of the secret is part of the key.
+
+        :rtype: ``str``
+        """
+        key_digest = hashlib.sha256(b(self.key or '')).hexdigest()
+        values = [self._get_auth_url(), self._auth_version, self.user_id,
+                  self._ex_tenant_name, self._ex_domain_name,
+                  self._ex_token_scope, key_digest]
+        return '|'.join(['%s' % (value or '') for value in values])
+
+    def _get_cached_auth(self):
+        """
+        Return the cached auth token information for the credentials used by
+        this connection, or None if there is no valid one.
+
+        :rtype: ``dict`` or ``None``
+        """
+        if not self._ex_auth_cache:
+            return None
+
+        return AUTH_CACHE.get(self._get_auth_cache_key(),
+                              cache_file=self._ex_auth_cache_file)
+
+    def _invalidate_cached_auth(self):
+        """
+        Remove the token used by this connection from the auth cache and
+        make sure a new one is retrieved on the next request.
+        """
+        osa = self.get_auth_class()
+
+        AUTH_CACHE.invalidate(self._get_auth_cache_key(),
+                              auth_token=self.auth_token,
+                              cache_file=self._ex_auth_cache_file)
+
+        self._auth_from_cache = False
+        self.auth_token = None
+        self.auth_token_expires = None
+        osa.auth_token = None
+        osa.auth_token_expires = None
+
+    def _cache_auth(self, osa, service_catalog):
+        """
+        Share the auth token information obtained by this connection.
+        """
+        if not self._ex_auth_cache:
+            return
+
+        entry = {'auth_token': osa.auth_token,
+                 'auth_token_expires': osa.auth_token_expires,
+                 'auth_user_info': osa.auth_user_info,
+                 'urls': osa.urls,
+                 'service_catalog': service_catalog}
+        AUTH_CACHE.put(self._get_auth_cache_key(), entry,
+                       cache_file=self._ex_auth_cache_file)
+
 
 class OpenStackException(ProviderError):
     pass
@@ -420,7 +536,9 @@ class OpenStackDriverMixin(object):
                  ex_tenant_name=None,
                  ex_force_service_type=None,
                  ex_force_service_name=None,
-                 ex_force_service_region=None, *args, **kwargs):
+                 ex_force_service_region=None,
+                 ex_auth_cache=False,
+                 ex_auth_cache_file=None, *args, **kwargs):
         self._ex_force_base_url = ex_force_base_url
         self._ex_force_auth_url = ex_force_auth_url
         self._ex_force_auth_version = ex_force_auth_version
@@ -431,6 +549,8 @@ class OpenStackDriverMixin(object):
         self._ex_force_service_type = ex_force_service_type
         self._ex_force_service_name = ex_force_service_name
         self._ex_force_service_region = ex_force_service_region
+        self._ex_auth_cache = ex_auth_cache or bool(ex_auth_cache_file)
+        self._ex_auth_cache_file = ex_auth_cache_file
 
     def openstack_connection_kwargs(self):
         """
@@ -458,4 +578,8 @@ class OpenStackDriverMixin(object):
             rv['ex_force_service_name'] = self._ex_force_service_name
         if self._ex_force_service_region:
             rv['ex_force_service_region'] = self._ex_force_service_region
+        if self._ex_auth_cache:
+            rv['ex_auth_cache'] = self._ex_auth_cache
+        if self._ex_auth_cache_file:
+            rv['ex_auth_cache_file'] = self._ex_auth_cache_file
         return rv
@@ -18,11 +18,14 @@ Common / shared code for handling authentication against OpenStack identity
 service (Keystone).
 """
 
+import os
 import sys
 import datetime
+import threading
 
 from libcloud.utils.py3 import httplib
 from libcloud.utils.iso8601 import parse_date
+from libcloud.utils.files import lock_file, write_file_atomically
 
 from libcloud.common.base import (ConnectionUserAndKey, Response,
                                   CertificateConnection)
@@ -67,6 +70,8 @@ __all__ = [
     'OpenStackServiceCatalogEntryEndpoint',
     'OpenStackIdentityEndpointType',
 
+    'OpenStackAuthenticationCache',
+
     'OpenStackIdentityConnection',
     'OpenStackIdentity_1_0_Connection',
     'OpenStackIdentity_1_1_Connection',
@@ -171,6 +176,10 @@ class OpenStackServiceCatalog(object):
     'serviceCatalog' in the auth response. This will do the work of figuring
     out which services actually exist in the catalog as well as split them up
     by type, name, and region if available
+
+    The entries are indexed by service type and name and the endpoints by
+    service type, name, region and endpoint type when the catalog is parsed,
+    so the endpoint lookups don't need to scan the whole catalog.
     """
 
     _auth_version = None
@@ -198,6 +207,7 @@ class OpenStackServiceCatalog(object):
         entries = sorted(entries,
                          key=lambda x: x.service_type + (x.service_name or ''))
         self._entries = entries  # stories all the service catalog entries
+        self._build_indexes()
 
     def get_entries(self):
         """
@@ -237,17 +247,11 @@ class OpenStackServiceCatalog(object):
         """
         endpoints = []
 
-        for entry in self._entries:
-            # Note: "if XXX and YYY != XXX" comparison is used to support
-            # partial lookups.
-            # This allows user to pass in only one argument to the method (only
-            # service_type or name), both of them or neither.
-            if service_type and entry.service_type != service_type:
-                continue
-
-            if name and entry.service_name != name:
-                continue
-
+        # Note: Empty arguments match anything to support partial lookups.
+        # This allows user to pass in only one argument to the method (only
+        # service_type or name), both of them or neither.
+        for entry in self._get_matching_entries(service_type=service_type,
+                                                name=name):
             for endpoint in entry.endpoints:
                 endpoints.append(endpoint)
 
@@ -261,23 +265,23 @@ class OpenStackServiceCatalog(object):
         Note: If no or more than one matching endpoint is found, an exception
         is thrown.
         """
-        endpoints = []
-
-        for entry in self._entries:
-            if service_type and entry.service_type != service_type:
-                continue
-
-            if name and entry.service_name != name:
-                continue
+        if service_type and name and region and endpoint_type:
+            key = (service_type, name, region, endpoint_type)
+            endpoints = self._endpoints_index.get(key, [])
+        else:
+            endpoints = []
 
-            for endpoint in entry.endpoints:
-                if region and endpoint.region != region:
-                    continue
+            for entry in self._get_matching_entries(service_type=service_type,
+                                                    name=name):
+                for endpoint in entry.endpoints:
+                    if region and endpoint.region != region:
+                        continue
 
-                if endpoint_type and endpoint.endpoint_type != endpoint_type:
-                    continue
+                    if endpoint_type and \
+                            endpoint.endpoint_type != endpoint_type:
+                        continue
 
-                endpoints.append(endpoint)
+                    endpoints.append(endpoint)
 
         if len(endpoints) == 1:
             return endpoints[0]
@@ -298,10 +302,7 @@ class OpenStackServiceCatalog(object):
         """
         regions = set()
 
-        for entry in self._entries:
-            if service_type and entry.service_type != service_type:
-                continue
-
+        for entry in self._get_matching_entries(service_type=service_type):
             for endpoint in entry.endpoints:
                 if endpoint.region:
                     regions.add(endpoint.region)
@@ -346,10 +347,7 @@ class OpenStackServiceCatalog(object):
         if '2.0' not in self._auth_version:
             raise ValueError('Unsupported version: %s' % (self._auth_version))
 
-        for entry in self._entries:
-            if service_type and entry.service_type != service_type:
-                continue
-
+        for entry in self._get_matching_entries(service_type=service_type):
             include = True
             for endpoint in entry.endpoints:
                 if region and endpoint.region != region:
@@ -361,6 +359,42 @@ class OpenStackServiceCatalog(object):
 
         return sorted(list(names))
 
+    def _build_indexes(self):
+        """
+        Index the entries by service type and name and the endpoints by
+        service type, name, region and endpoint type.
+
+        Both entry attributes are optional in the lookups, so the entries are
+        also indexed under None (which matches anything) instead of each of
+        them. Lookups which don't specify all the endpoint attributes filter
+        the endpoints of the matching entries.
+        """
+        entries_index = {}
+        endpoints_index = {}
+
+        for entry in self._entries:
+            for service_type in set([entry.service_type or None, None]):
+                for name in set([entry.service_name or None, None]):
+                    key = (service_type, name)
+                    entries_index.setdefault(key, []).append(entry)
+
+            for endpoint in entry.endpoints:
+                key = (entry.service_type, entry.service_name,
+                       endpoint.region, endpoint.endpoint_type)
+                endpoints_index.setdefault(key, []).append(endpoint)
+
+        self._entries_index = entries_index
+        self._endpoints_index = endpoints_index
+
+    def _get_matching_entries(self, service_type=None, name=None):
+        """
+        Return the entries with the provided service type and name.
+
+        :rtype: ``list`` of :class:`.OpenStackServiceCatalogEntry`
+        """
+        key = (service_type or None, name or None)
+        return self._entries_index.get(key, [])
+
     def _parse_service_catalog_auth_v1(self, service_catalog):
         entries = []
 
@@ -526,6 +560,188 @@ class OpenStackServiceCatalogEntryEndpoint(object):
                  'type=%s' % (self.region, self.url, self.endpoint_type)))
 
 
+def is_token_expired(expires):
+    """
+    Return True if a token expiring at the provided time has expired or is
+    about to expire in less than AUTH_TOKEN_EXPIRES_GRACE_SECONDS.
+
+    :param expires: Token expiration time.
+    :type expires: :class:`datetime.datetime`
+
+    :rtype: ``bool``
+    """
+    if not expires:
+        return True
+
+    expires = expires - \
+        datetime.timedelta(seconds=AUTH_TOKEN_EXPIRES_GRACE_SECONDS)
+
+    time_tuple_expires = expires.utctimetuple()
+    time_tuple_now = datetime.datetime.utcnow().utctimetuple()
+
+    return time_tuple_now >= time_tuple_expires
+
+
+class OpenStackAuthenticationCache(object):
+    """
+    Tokens and service catalogs shared by all the connections which
+    authenticate with the same credentials.
+
+    Entries are dictionaries with the "auth_token", "auth_token_expires",
+    "auth_user_info" and "urls" keys. They can optionally be persisted to a
+    JSON file so other processes can use them as well. The parsed service
+    catalog is kept under the "service_catalog" key in memory only.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, cache_file=None):
+        """
+        Return the entry for the key if it hasn't expired yet.
+
+        :param key: Key identifying the credentials.
+        :type key: ``str``
+
+        :param cache_file: Optional path to a file the entries are persisted
+                           to.
+        :type cache_file: ``str``
+
+        :rtype: ``dict`` or ``None``
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is None and cache_file:
+            entry = self._read_cache_file(cache_file).get(key)
+            if entry is not None:
+                try:
+                    entry['auth_token_expires'] = \
+                        parse_date(entry['auth_token_expires'])
+                except Exception:
+                    entry = None
+
+        if entry is None or is_token_expired(entry['auth_token_expires']):
+            return None
+
+        with self._lock:
+            self._entries[key] = entry
+
+        return entry
+
+    def put(self, key, entry, cache_file=None):
+        """
+        Store the entry for the key.
+
+        :param key: Key identifying the credentials.
+        :type key: ``str``
+
+        :param entry: The token information.
+        :type entry: ``dict``
+
+        :param cache_file: Optional path to a file the entries are persisted
+                           to.
+        :type cache_file: ``str``
+        """
+        # Only cache tokens with a known expiration, anything else (e.g. a
+        # token set by hand or mocked) would be handed to every other
+        # connection
+        if not entry.get('auth_token') or \
+                not isinstance(entry.get('auth_token_expires'),
+                               datetime.datetime):
+            return
+
+        with self._lock:
+            self._entries[key] = entry
+
+        if cache_file:
+            with self._lock_cache_file(cache_file):
+                entries = self._read_cache_file(cache_file)
+                entries[key] = dict(entry)
+                entries[key].pop('service_catalog', None)
+                entries[key]['auth_token_expires'] = \
+                    entry['auth_token_expires'].isoformat()
+                self._write_cache_file(cache_file, entries)
+
+    def clear(self, key=None):
+        """
+        Remove the entry for the key, or all the in-memory entries.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def invalidate(self, key, auth_token, cache_file=None):
+        """
+        Remove the entry for the key if it still holds the provided token,
+        e.g. because the token has been rejected by the API.
+
+        Entries which already hold a different token are kept since another
+        connection has obtained a new token in the meantime.
+
+        :param key: Key identifying the credentials.
+        :type key: ``str``
+
+        :param auth_token: The rejected token.
+        :type auth_token: ``str``
+
+        :param cache_file: Optional path to a file the entries are persisted
+                           to.
+        :type cache_file: ``str``
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['auth_token'] == auth_token:
+                del self._entries[key]
+
+        if cache_file:
+            with self._lock_cache_file(cache_file):
+                entries = self._read_cache_file(cache_file)
+                entry = entries.get(key)
+                if entry is not None and \
+                        entry.get('auth_token') == auth_token:
+                    del entries[key]
+                    self._write_cache_file(cache_file, entries)
+
+    def _lock_cache_file(self, cache_file):
+        # Other connections and processes update the same file
+        filename = os.path.realpath(os.path.expanduser(cache_file))
+        return lock_file(filename + '.lock')
+
+    def _read_cache_file(self, cache_file):
+        filename = os.path.realpath(os.path.expanduser(cache_file))
+
+        try:
+            with open(filename, 'r') as fp:
+                entries = json.load(fp)
+        except (IOError, ValueError):
+            # Missing or corrupted cache file is not fatal
+            return {}
+
+        if not isinstance(entries, dict):
+            return {}
+
+        return entries
+
+    def _write_cache_file(self, cache_file, entries):
+        filename = os.path.realpath(os.path.expanduser(cache_file))
+
+        try:
+            # The tokens are secrets, so only the owner can read the file
+            write_file_atomically(filename, json.dumps(entries),
+                                  mode=int('600', 8))
+        except (IOError, OSError):
+            # Failure to persist the cache is not fatal
+            pass
+
+
+# Cache shared by all the OpenStack connections
+AUTH_CACHE = OpenStackAuthenticationCache()
+
+
 class OpenStackAuthResponse(Response):
     def success(self):
         return self.status in [httplib.OK, httplib.CREATED,
@@ -645,19 +861,7 @@ class OpenStackIdentityConnection(ConnectionUserAndKey):
         if not self.auth_token:
             return False
 
-        if not self.auth_token_expires:
-            return False
-
-        expires = self.auth_token_expires - \
-            datetime.timedelta(seconds=AUTH_TOKEN_EXPIRES_GRACE_SECONDS)
-
-        time_tuple_expires = expires.utctimetuple()
-        time_tuple_now = datetime.datetime.utcnow().utctimetuple()
-
-        if time_tuple_now < time_tuple_expires:
-            return True
-
-        return False
+        return not is_token_expired(self.auth_token_expires)
 
     def authenticate(self, force=False):
         """
@@ -21,6 +21,7 @@ from __future__ import with_statement
 
 import sys
 import time
+import copy
 import hashlib
 import os
 import socket
@@ -37,19 +38,12 @@ from libcloud.compute.ssh import SSHClient
 from libcloud.common.base import ConnectionKey
 from libcloud.common.base import BaseDriver
 from libcloud.common.types import LibcloudError
-from libcloud.compute.ssh import have_paramiko
 
 from libcloud.utils.networking import is_private_subnet
 from libcloud.utils.networking import is_valid_ip_address
+from libcloud.utils.concurrency import DEFAULT_MAX_WORKERS, run_concurrently
 
-if have_paramiko:
-    from paramiko.ssh_exception import SSHException
-    from paramiko.ssh_exception import AuthenticationException
-
-    SSH_TIMEOUT_EXCEPTION_CLASSES = (AuthenticationException, SSHException,
-                                     IOError, socket.gaierror, socket.error)
-else:
-    SSH_TIMEOUT_EXCEPTION_CLASSES = (IOError, socket.gaierror, socket.error)
+SSH_TIMEOUT_EXCEPTION_CLASSES = (IOError, socket.gaierror, socket.error)
 
 # How long to wait for the node to come online after creating it
 NODE_ONLINE_WAIT_TIMEOUT = 10 * 60
@@ -69,6 +63,8 @@ __all__ = [
     'NodeAuthSSHKey',
     'NodeAuthPassword',
     'NodeDriver',
+    'NodeDeploymentResult',
+    'wait_until_nodes_running',
 
     'StorageVolume',
     'StorageVolumeState',
@@ -80,11 +76,58 @@ __all__ = [
 ]
 
 
-class UuidMixin(object):
+class _SlotsStateMixin(object):
+    """
+    Mixin class which allows objects using ``__slots__`` to be pickled and
+    inspected using ``vars()``.
+
+    Python 2 refuses to pickle objects which use ``__slots__`` unless they
+    define ``__getstate__``.
+    """
+
+    __slots__ = ()
+
+    def __getstate__(self):
+        state = {}
+
+        for klass in type(self).__mro__:
+            for name in klass.__dict__.get('__slots__', ()):
+                if name in ('__dict__', '__weakref__'):
+                    continue
+
+                try:
+                    state[name] = getattr(self, name)
+                except AttributeError:
+                    # Slot has not been assigned
+                    pass
+
+        # Instances of subclasses which don't declare __slots__ also have a
+        # real instance dictionary
+        if type(self).__dictoffset__:
+            state.update(self.__dict__)
+
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @property
+    def __dict__(self):
+        """
+        Copy of the instance attributes, kept for code which uses ``vars()``
+        on these objects.
+        """
+        return self.__getstate__()
+
+
+class UuidMixin(_SlotsStateMixin):
     """
     Mixin class for get_uuid function.
     """
 
+    __slots__ = ('_uuid',)
+
     def __init__(self):
         self._uuid = None
 
@@ -165,10 +208,20 @@ class Node(UuidMixin):
 
     >>> node.extra
     {'foo': 'bar'}
+
+    Node and the other core resource classes (NodeSize, NodeImage,
+    StorageVolume and VolumeSnapshot) use ``__slots__`` so a large number
+    of them can be held in memory cheaply. Subclasses which don't declare
+    ``__slots__`` can still set arbitrary attributes.
     """
 
+    __slots__ = ('id', 'name', 'state', 'public_ips', 'private_ips', 'driver',
+                 'size', 'created_at', '_image', '_image_loader', '_extra',
+                 '_extra_loader')
+
     def __init__(self, id, name, state, public_ips, private_ips,
-                 driver, size=None, image=None, extra=None, created_at=None):
+                 driver, size=None, image=None, extra=None, created_at=None,
+                 extra_loader=None, image_loader=None):
         """
         :param id: Node ID.
         :type id: ``str``
@@ -201,6 +254,17 @@ class Node(UuidMixin):
                       this node.
         :type extra: ``dict``
 
+        :param extra_loader: Optional callable which returns the ``extra``
+                             dictionary. If provided, ``extra`` is ignored
+                             and the dictionary is only built the first
+                             time the attribute is accessed.
+        :type extra_loader: ``callable``
+
+        :param image_loader: Optional callable which returns the ``image``.
+                             If provided, ``image`` is ignored and the
+                             image is only resolved the first time the
+                             attribute is accessed.
+        :type image_loader: ``callable``
         """
         self.id = str(id) if id else None
         self.name = name
@@ -210,10 +274,69 @@ class Node(UuidMixin):
         self.driver = driver
         self.size = size
         self.created_at = created_at
-        self.image = image
-        self.extra = extra or {}
+
+        if image_loader is not None:
+            self._image = None
+            self._image_loader = image_loader
+        else:
+            self.image = image
+
+        if extra_loader is not None:
+            self._extra = None
+            self._extra_loader = extra_loader
+        else:
+            self.extra = extra or {}
+
         UuidMixin.__init__(self)
 
+    @property
+    def image(self):
+        """
+        Image of this node.
+
+        :rtype: :class:`.NodeImage`
+        """
+        if self._image_loader is not None:
+            self._image = self._image_loader()
+            self._image_loader = None
+
+        return self._image
+
+    @image.setter
+    def image(self, value):
+        self._image = value
+        self._image_loader = None
+
+    @property
+    def extra(self):
+        """
+        Provider specific attributes associated with this node.
+
+        :rtype: ``dict``
+        """
+        if self._extra_loader is not None:
+            self._extra = self._extra_loader() or {}
+            self._extra_loader = None
+
+        return self._extra
+
+    @extra.setter
+    def extra(self, value):
+        self._extra = value
+        self._extra_loader = None
+
+    def __getstate__(self):
+        # Store the image and the extra dictionary instead of their loaders,
+        # which usually can't be pickled
+        image = self.image
+        extra = self.extra
+        state = super(Node, self).__getstate__()
+        del state['_image'], state['_image_loader']
+        del state['_extra'], state['_extra_loader']
+        state['image'] = image
+        state['extra'] = extra
+        return state
+
     def reboot(self):
         """
         Reboot this node
@@ -291,6 +414,9 @@ class NodeSize(UuidMixin):
     4
     """
 
+    __slots__ = ('id', 'name', 'ram', 'disk', 'bandwidth', 'price', 'driver',
+                 'extra')
+
     def __init__(self, id, name, ram, disk, bandwidth, price,
                  driver, extra=None):
         """
@@ -358,6 +484,8 @@ class NodeImage(UuidMixin):
     >>> node = driver.create_node(image=image)
     """
 
+    __slots__ = ('id', 'name', 'driver', 'extra')
+
     def __init__(self, id, name, driver, extra=None):
         """
         :param id: Image ID.
@@ -519,6 +647,8 @@ class StorageVolume(UuidMixin):
     A base StorageVolume class to derive from.
     """
 
+    __slots__ = ('id', 'name', 'size', 'driver', 'extra', 'state')
+
     def __init__(self, id, name, size, driver,
                  state=None, extra=None):
         """
@@ -606,10 +736,13 @@ class StorageVolume(UuidMixin):
                self.id, self.size, self.driver.name)
 
 
-class VolumeSnapshot(object):
+class VolumeSnapshot(_SlotsStateMixin):
     """
     A base VolumeSnapshot class to derive from.
     """
+
+    __slots__ = ('id', 'driver', 'size', 'extra', 'created', 'state', 'name')
+
     def __init__(self, id, driver, size=None, extra=None, created=None,
                  state=None, name=None):
         """
@@ -698,6 +831,59 @@ class KeyPair(object):
                 (self.name, self.fingerprint, self.driver.name))
 
 
+class NodeDeploymentResult(object):
+    """
+    Outcome of a single node deployment performed by
+    :meth:`NodeDriver.deploy_nodes`.
+    """
+
+    def __init__(self, index, node=None, ip_addresses=None, deployment=None,
+                 error=None, create_time=None, wait_time=None,
+                 deploy_time=None):
+        """
+        :param index: Index of the node in the requested batch.
+        :type index: ``int``
+
+        :param node: Created node or None if the node couldn't be created.
+        :type node: :class:`.Node`
+
+        :param ip_addresses: IP addresses which were used for SSH.
+        :type ip_addresses: ``list`` of ``str``
+
+        :param deployment: Deployment which has been run on this node.
+        :type deployment: :class:`Deployment`
+
+        :param error: Exception which caused the deployment to fail. A
+                      :class:`DeploymentError` if the node has been created.
+        :type error: :class:`Exception`
+
+        :param create_time: Seconds spent creating the node.
+        :type create_time: ``float``
+
+        :param wait_time: Seconds spent waiting for the node to be running.
+        :type wait_time: ``float``
+
+        :param deploy_time: Seconds spent running the deployment.
+        :type deploy_time: ``float``
+        """
+        self.index = index
+        self.node = node
+        self.ip_addresses = ip_addresses
+        self.deployment = deployment
+        self.error = error
+        self.create_time = create_time
+        self.wait_time = wait_time
+        self.deploy_time = deploy_time
+
+    @property
+    def success(self):
+        return self.error is None
+
+    def __repr__(self):
+        return (('<NodeDeploymentResult: index=%s, node=%s, success=%s>')
+                % (self.index, self.node and self.node.id, self.success))
+
+
 class NodeDriver(BaseDriver):
     """
     A base NodeDriver class to derive from
@@ -728,6 +914,15 @@ class NodeDriver(BaseDriver):
 
     NODE_STATE_MAP = {}
 
+    #: If True, drivers which support it build the ``extra`` dictionary of
+    #: the returned nodes lazily, the first time it's accessed. This makes
+    #: listing nodes considerably cheaper when only the id, state or IP
+    #: addresses are used, at the cost of keeping the raw API response for
+    #: each node in memory until ``extra`` is accessed. Attributes which are
+    #: derived from the same lookups (such as the image of GCE nodes booted
+    #: from a disk) are resolved the first time they're accessed as well.
+    lazy_extra = False
+
     def list_nodes(self):
         """
         List all nodes.
@@ -738,6 +933,20 @@ class NodeDriver(BaseDriver):
         raise NotImplementedError(
             'list_nodes not implemented for this driver')
 
+    def iterate_nodes(self):
+        """
+        Return a generator of nodes.
+
+        Drivers which support paginated listing override this method so
+        the nodes are yielded page by page. The default implementation
+        wraps :meth:`list_nodes`.
+
+        :return: A generator of node objects
+        :rtype: ``generator`` of :class:`.Node`
+        """
+        for node in self.list_nodes():
+            yield node
+
     def list_sizes(self, location=None):
         """
         List sizes on a provider
@@ -844,6 +1053,44 @@ class NodeDriver(BaseDriver):
         raise NotImplementedError(
             'create_node not implemented for this driver')
 
+    def create_nodes(self, count, max_workers=DEFAULT_MAX_WORKERS,
+                     **kwargs):
+        """
+        Create multiple nodes with the same configuration.
+
+        The default implementation calls :meth:`create_node` for every node
+        using a pool of at most ``max_workers`` threads. Drivers for
+        providers which support creating multiple nodes in a single API call
+        override this method.
+
+        If creating one of the nodes raises an exception, the exception is
+        propagated once all the other nodes have been processed. Keep in mind
+        that the nodes which have been created successfully are not destroyed
+        in this case.
+
+        :param count: Number of nodes to create.
+        :type count: ``int``
+
+        :param max_workers: Maximum number of concurrent requests.
+        :type max_workers: ``int``
+
+        :param kwargs: Keyword arguments which are accepted by
+                       :meth:`create_node`. If ``name`` is provided and
+                       ``count`` is larger than 1, a ``-<index>`` suffix is
+                       appended to the name of each node (drivers which use
+                       a native batch API call might name the nodes
+                       differently).
+
+        :return: The newly created nodes.
+        :rtype: ``list`` of :class:`.Node`
+        """
+        def create(index):
+            return self.create_node(**self._get_batch_create_node_kwargs(
+                kwargs, index=index, count=count))
+
+        return self._run_concurrently_for_nodes(create, range(count),
+                                                max_workers=max_workers)
+
     def deploy_node(self, **kwargs):
         """
         Create a new node, and start deployment.
@@ -929,85 +1176,137 @@ class NodeDriver(BaseDriver):
         :param ssh_interface: The interface to wait for. Default is
                                    'public_ips', other option is 'private_ips'.
         :type ssh_interface: ``str``
-        """
-        if not libcloud.compute.ssh.have_paramiko:
-            raise RuntimeError('paramiko is not installed. You can install ' +
-                               'it using pip: pip install paramiko')
 
-        if 'auth' in kwargs:
-            auth = kwargs['auth']
-            if not isinstance(auth, (NodeAuthSSHKey, NodeAuthPassword)):
-                raise NotImplementedError(
-                    'If providing auth, only NodeAuthSSHKey or'
-                    'NodeAuthPassword is supported')
-        elif 'ssh_key' in kwargs:
-            # If an ssh_key is provided we can try deploy_node
-            pass
-        elif 'create_node' in self.features:
-            f = self.features['create_node']
-            if 'generates_password' not in f and "password" not in f:
-                raise NotImplementedError(
-                    'deploy_node not implemented for this driver')
-        else:
-            raise NotImplementedError(
-                'deploy_node not implemented for this driver')
+        :param ssh_pool: Optional pool the SSH client is taken from. Pooled
+                         connections are left open once the deployment has
+                         finished so they can be reused by the following
+                         deployments to the same node. Call
+                         :meth:`SSHClientPool.close` when done.
+        :type ssh_pool: :class:`SSHClientPool`
+        """
+        self._check_deploy_node_supported(kwargs)
 
         node = self.create_node(**kwargs)
-        max_tries = kwargs.get('max_tries', 3)
-
-        password = None
-        if 'auth' in kwargs:
-            if isinstance(kwargs['auth'], NodeAuthPassword):
-                password = kwargs['auth'].password
-        elif 'password' in node.extra:
-            password = node.extra['password']
-
-        ssh_interface = kwargs.get('ssh_interface', 'public_ips')
 
         # Wait until node is up and running and has IP assigned
         try:
-            node, ip_addresses = self.wait_until_running(
+            running_node, ip_addresses = self.wait_until_running(
                 nodes=[node],
                 wait_period=3,
                 timeout=kwargs.get('timeout', NODE_ONLINE_WAIT_TIMEOUT),
-                ssh_interface=ssh_interface)[0]
+                ssh_interface=kwargs.get('ssh_interface', 'public_ips'))[0]
         except Exception:
             e = sys.exc_info()[1]
             raise DeploymentError(node=node, original_exception=e, driver=self)
 
-        ssh_username = kwargs.get('ssh_username', 'root')
-        ssh_alternate_usernames = kwargs.get('ssh_alternate_usernames', [])
-        ssh_port = kwargs.get('ssh_port', 22)
-        ssh_timeout = kwargs.get('ssh_timeout', 10)
-        ssh_key_file = kwargs.get('ssh_key', None)
-        timeout = kwargs.get('timeout', SSH_CONNECT_TIMEOUT)
+        node = self._copy_generated_password(created_node=node,
+                                             running_node=running_node)
 
-        deploy_error = None
+        self._deploy_running_node(task=kwargs['deploy'], node=node,
+                                  ip_addresses=ip_addresses, kwargs=kwargs)
+        return node
 
-        for username in ([ssh_username] + ssh_alternate_usernames):
+    def deploy_nodes(self, count, max_workers=DEFAULT_MAX_WORKERS,
+                     **kwargs):
+        """
+        Create multiple nodes and run a deployment on each of them.
+
+        Nodes are created concurrently, each node is waited for using
+        :meth:`wait_until_running` and the deployment is then run over SSH.
+        Every step uses a pool of at most ``max_workers`` threads.
+
+        Unlike :meth:`deploy_node`, a failure on a single node doesn't abort
+        the whole batch. The outcome of every node is reported using a
+        :class:`.NodeDeploymentResult` instance instead.
+
+        Every node gets its own copy of ``deploy`` so the output of the
+        script steps (``stdout``, ``stderr``, ``exit_status``) can be
+        inspected per node using :attr:`.NodeDeploymentResult.deployment`.
+
+        :param count: Number of nodes to create.
+        :type count: ``int``
+
+        :param max_workers: Maximum number of nodes which are created or
+                            deployed to concurrently (default is 10).
+        :type max_workers: ``int``
+
+        :param kwargs: Keyword arguments which are accepted by
+                       :meth:`deploy_node`. If ``name`` is provided and
+                       ``count`` is larger than 1, a ``-<index>`` suffix is
+                       appended to the name of each node.
+
+        :return: List of deployment results, one per requested node.
+        :rtype: ``list`` of :class:`.NodeDeploymentResult`
+        """
+        self._check_deploy_node_supported(kwargs)
+
+        results = [NodeDeploymentResult(index=index) for index in range(count)]
+
+        def create(result):
+            create_kwargs = self._get_batch_create_node_kwargs(
+                kwargs, index=result.index, count=count)
+
+            start = time.time()
             try:
-                self._connect_and_run_deployment_script(
-                    task=kwargs['deploy'], node=node,
-                    ssh_hostname=ip_addresses[0], ssh_port=ssh_port,
-                    ssh_username=username, ssh_password=password,
-                    ssh_key_file=ssh_key_file, ssh_timeout=ssh_timeout,
-                    timeout=timeout, max_tries=max_tries)
-            except Exception:
-                # Try alternate username
-                # Todo: Need to fix paramiko so we can catch a more specific
-                # exception
-                e = sys.exc_info()[1]
-                deploy_error = e
-            else:
-                # Script successfully executed, don't try alternate username
-                deploy_error = None
-                break
+                result.node = self.create_node(**create_kwargs)
+            finally:
+                result.create_time = time.time() - start
 
-        if deploy_error is not None:
-            raise DeploymentError(node=node, original_exception=deploy_error,
-                                  driver=self)
+        for result, (_, exc) in zip(results, run_concurrently(
+                create, results, max_workers=max_workers)):
+            if exc is not None:
+                result.error = exc
 
-        return node
+        created = [result for result in results if result.error is None]
+
+        if not created:
+            return results
+
+        # Wait until the nodes are up and running and have IP assigned. Each
+        # node is waited for separately so a node which doesn't come up in
+        # time doesn't prevent the deployment to the other ones.
+        def wait(result):
+            start = time.time()
+            try:
+                running = self.wait_until_running(
+                    nodes=[result.node],
+                    wait_period=3,
+                    timeout=kwargs.get('timeout', NODE_ONLINE_WAIT_TIMEOUT),
+                    ssh_interface=kwargs.get('ssh_interface', 'public_ips'))
+            finally:
+                result.wait_time = time.time() - start
+
+            running_node, result.ip_addresses = running[0]
+            result.node = self._copy_generated_password(
+                created_node=result.node, running_node=running_node)
+
+        for result, (_, exc) in zip(created, run_concurrently(
+                wait, created, max_workers=max_workers)):
+            if exc is not None:
+                result.error = DeploymentError(node=result.node,
+                                               original_exception=exc,
+                                               driver=self)
+
+        def deploy(result):
+            result.deployment = copy.deepcopy(kwargs['deploy'])
+
+            start = time.time()
+            try:
+                self._deploy_running_node(task=result.deployment,
+                                          node=result.node,
+                                          ip_addresses=result.ip_addresses,
+                                          kwargs=kwargs)
+            finally:
+                result.deploy_time = time.time() - start
+
+        deployable = [result for result in created if result.error is None]
+
+        for result, (_, exc) in zip(deployable, run_concurrently(
+                deploy, deployable, max_workers=max_workers)):
+            if exc is not None:
+                result.error = exc
+
+        return results
 
     def reboot_node(self, node):
         """
@@ -1038,6 +1337,56 @@ class NodeDriver(BaseDriver):
         raise NotImplementedError(
             'destroy_node not implemented for this driver')
 
+    def reboot_nodes(self, nodes, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Reboot multiple nodes.
+
+        The default implementation calls :meth:`reboot_node` for every node
+        using a pool of at most ``max_workers`` threads. Drivers for
+        providers which support rebooting multiple nodes in a single API
+        call override this method.
+
+        If rebooting one of the nodes raises an exception, the exception is
+        propagated once all the other nodes have been processed.
+
+        :param nodes: The nodes to be rebooted
+        :type nodes: ``list`` of :class:`.Node`
+
+        :param max_workers: Maximum number of concurrent requests.
+        :type max_workers: ``int``
+
+        :return: List of boolean values, one for each node, in the same order
+                 as ``nodes``.
+        :rtype: ``list`` of ``bool``
+        """
+        return self._run_concurrently_for_nodes(self.reboot_node, nodes,
+                                                max_workers=max_workers)
+
+    def destroy_nodes(self, nodes, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Destroy multiple nodes.
+
+        The default implementation calls :meth:`destroy_node` for every node
+        using a pool of at most ``max_workers`` threads. Drivers for
+        providers which support destroying multiple nodes in a single API
+        call override this method.
+
+        If destroying one of the nodes raises an exception, the exception is
+        propagated once all the other nodes have been processed.
+
+        :param nodes: The nodes to be destroyed
+        :type nodes: ``list`` of :class:`.Node`
+
+        :param max_workers: Maximum number of concurrent requests.
+        :type max_workers: ``int``
+
+        :return: List of boolean values, one for each node, in the same order
+                 as ``nodes``.
+        :rtype: ``list`` of ``bool``
+        """
+        return self._run_concurrently_for_nodes(self.destroy_node, nodes,
+                                                max_workers=max_workers)
+
     ##
     # Volume and snapshot management methods
     ##
@@ -1051,6 +1400,17 @@ class NodeDriver(BaseDriver):
         raise NotImplementedError(
             'list_volumes not implemented for this driver')
 
+    def iterate_volumes(self):
+        """
+        Return a generator of storage volumes.
+
+        The default implementation wraps :meth:`list_volumes`.
+
+        :rtype: ``generator`` of :class:`.StorageVolume`
+        """
+        for volume in self.list_volumes():
+            yield volume
+
     def list_volume_snapshots(self, volume):
         """
         List snapshots for a storage volume.
@@ -1171,6 +1531,20 @@ class NodeDriver(BaseDriver):
         raise NotImplementedError(
             'list_images not implemented for this driver')
 
+    def iterate_images(self, location=None):
+        """
+        Return a generator of images.
+
+        The default implementation wraps :meth:`list_images`.
+
+        :param location: The location at which to list images.
+        :type location: :class:`.NodeLocation`
+
+        :rtype: ``generator`` of :class:`.NodeImage`
+        """
+        for image in self.list_images(location=location):
+            yield image
+
     def create_image(self, node, name, description=None):
         """
         Creates an image from a node object.
@@ -1322,13 +1696,19 @@ class NodeDriver(BaseDriver):
 
     def wait_until_running(self, nodes, wait_period=3,
                            timeout=600, ssh_interface='public_ips',
-                           force_ipv4=True, ex_list_nodes_kwargs=None):
+                           force_ipv4=True, ex_list_nodes_kwargs=None,
+                           backoff=1, max_wait_period=None, jitter=0):
         """
         Block until the provided nodes are considered running.
 
         Node is considered running when it's state is "running" and when it has
         at least one IP address assigned.
 
+        Only the provided nodes are polled on drivers which support filtering
+        nodes by id, otherwise all the nodes are listed on each iteration.
+        Use :func:`wait_until_nodes_running` to wait for nodes which belong
+        to different drivers.
+
         :param nodes: List of nodes to wait for.
         :type nodes: ``list`` of :class:`.Node`
 
@@ -1336,6 +1716,18 @@ class NodeDriver(BaseDriver):
                             iteration. (default is 3)
         :type wait_period: ``int``
 
+        :param backoff: Multiplier applied to the wait period after each loop
+                        iteration. (default is 1, no backoff)
+        :type backoff: ``float``
+
+        :param max_wait_period: Upper bound for the wait period when
+                                ``backoff`` is used. (default is no bound)
+        :type max_wait_period: ``int``
+
+        :param jitter: Randomize each wait period by up to this fraction of
+                       its value, e.g. 0.1 for +/- 10%. (default is 0)
+        :type jitter: ``float``
+
         :param timeout: How many seconds to wait before giving up.
                         (default is 600)
         :type timeout: ``int``
@@ -1380,11 +1772,13 @@ class NodeDriver(BaseDriver):
 
         start = time.time()
         end = start + timeout
+        current_wait_period = wait_period
 
         uuids = set([node.uuid for node in nodes])
 
         while time.time() < end:
-            all_nodes = self.list_nodes(**ex_list_nodes_kwargs)
+            all_nodes = self._list_nodes_for_wait(
+                nodes=nodes, ex_list_nodes_kwargs=ex_list_nodes_kwargs)
             matching_nodes = list([node for node in all_nodes
                                    if node.uuid in uuids])
 
@@ -1406,12 +1800,43 @@ class NodeDriver(BaseDriver):
             if len(running_nodes) == len(uuids) == len(addresses):
                 return list(zip(running_nodes, addresses))
             else:
-                time.sleep(wait_period)
+                sleep_period = current_wait_period
+
+                if jitter:
+                    sleep_period *= 1 + random.uniform(-jitter, jitter)
+
+                # Don't sleep past the deadline
+                sleep_period = min(sleep_period, max(end - time.time(), 0))
+                time.sleep(sleep_period)
+
+                current_wait_period *= backoff
+
+                if max_wait_period is not None:
+                    current_wait_period = min(current_wait_period,
+                                              max_wait_period)
                 continue
 
         raise LibcloudError(value='Timed out after %s seconds' % (timeout),
                             driver=self)
 
+    def _list_nodes_for_wait(self, nodes, ex_list_nodes_kwargs):
+        """
+        Return the nodes which are polled by :meth:`wait_until_running`.
+
+        The default implementation lists all the nodes. Drivers which can
+        filter nodes by id should override this method so only the provided
+        nodes are retrieved.
+
+        :param nodes: Nodes which are waited for.
+        :type nodes: ``list`` of :class:`.Node`
+
+        :param ex_list_nodes_kwargs: Keyword arguments for ``list_nodes``.
+        :type ex_list_nodes_kwargs: ``dict``
+
+        :rtype: ``list`` of :class:`.Node`
+        """
+        return self.list_nodes(**ex_list_nodes_kwargs)
+
     def _get_and_check_auth(self, auth):
         """
         Helper function for providers supporting :class:`.NodeAuthPassword` or
@@ -1468,6 +1893,25 @@ class NodeDriver(BaseDriver):
                                        ssh_interface=ssh_interface,
                                        force_ipv4=force_ipv4)
 
+    def _get_ssh_timeout_exception_classes(self):
+        """
+        Return exception classes which cause a SSH connection to be retried.
+
+        paramiko is imported lazily so its exception classes can't be part
+        of the module level ``SSH_TIMEOUT_EXCEPTION_CLASSES`` tuple.
+        """
+        if not libcloud.compute.ssh.have_paramiko:
+            return SSH_TIMEOUT_EXCEPTION_CLASSES
+
+        try:
+            from paramiko.ssh_exception import SSHException
+            from paramiko.ssh_exception import AuthenticationException
+        except ImportError:
+            return SSH_TIMEOUT_EXCEPTION_CLASSES
+
+        return ((AuthenticationException, SSHException) +
+                SSH_TIMEOUT_EXCEPTION_CLASSES)
+
     def _ssh_client_connect(self, ssh_client, wait_period=1.5, timeout=300):
         """
         Try to connect to the remote SSH server. If a connection times out or
@@ -1488,11 +1932,12 @@ class NodeDriver(BaseDriver):
         """
         start = time.time()
         end = start + timeout
+        exception_classes = self._get_ssh_timeout_exception_classes()
 
         while time.time() < end:
             try:
                 ssh_client.connect()
-            except SSH_TIMEOUT_EXCEPTION_CLASSES:
+            except exception_classes:
                 e = sys.exc_info()[1]
                 message = str(e).lower()
                 expected_msg = 'no such file or directory'
@@ -1512,22 +1957,158 @@ class NodeDriver(BaseDriver):
         raise LibcloudError(value='Could not connect to the remote SSH ' +
                             'server. Giving up.', driver=self)
 
+    def _get_batch_create_node_kwargs(self, kwargs, index, count):
+        """
+        Return create_node keyword arguments for the node with the provided
+        index in a batch of ``count`` nodes.
+        """
+        kwargs = kwargs.copy()
+
+        if 'name' in kwargs and count > 1:
+            kwargs['name'] = '%s-%s' % (kwargs['name'], index + 1)
+
+        return kwargs
+
+    def _run_concurrently_for_nodes(self, func, nodes, max_workers):
+        """
+        Call ``func`` for every node concurrently and return the results in
+        the same order as ``nodes``. The first raised exception is re-raised
+        once all the nodes have been processed.
+        """
+        results = []
+        for result, exc in run_concurrently(func, nodes,
+                                            max_workers=max_workers):
+            if exc is not None:
+                raise exc
+
+            results.append(result)
+
+        return results
+
+    def _check_deploy_node_supported(self, kwargs):
+        """
+        Verify that paramiko is available and that the driver is able to
+        provide credentials for the deployment.
+        """
+        if not libcloud.compute.ssh.have_paramiko:
+            raise RuntimeError('paramiko is not installed. You can install ' +
+                               'it using pip: pip install paramiko')
+
+        if 'auth' in kwargs:
+            auth = kwargs['auth']
+            if not isinstance(auth, (NodeAuthSSHKey, NodeAuthPassword)):
+                raise NotImplementedError(
+                    'If providing auth, only NodeAuthSSHKey or'
+                    'NodeAuthPassword is supported')
+        elif 'ssh_key' in kwargs:
+            # If an ssh_key is provided we can try deploy_node
+            pass
+        elif 'create_node' in self.features:
+            f = self.features['create_node']
+            if 'generates_password' not in f and "password" not in f:
+                raise NotImplementedError(
+                    'deploy_node not implemented for this driver')
+        else:
+            raise NotImplementedError(
+                'deploy_node not implemented for this driver')
+
+    def _copy_generated_password(self, created_node, running_node):
+        """
+        Copy the password generated by the provider to the node returned by
+        :meth:`wait_until_running`.
+
+        Drivers which generate a password usually only return it in the
+        result of :meth:`create_node` and not when the nodes are listed.
+
+        :rtype: :class:`.Node`
+        :return: ``running_node``
+        """
+        password = created_node.extra.get('password', None)
+
+        if (password is not None and
+                running_node.extra.get('password', None) is None):
+            running_node.extra['password'] = password
+
+        return running_node
+
+    def _deploy_running_node(self, task, node, ip_addresses, kwargs):
+        """
+        Run the deployment task on a running node, trying all the provided
+        usernames.
+
+        :param kwargs: Keyword arguments passed to :meth:`deploy_node`.
+        :type kwargs: ``dict``
+
+        :rtype: :class:`.Node`
+        :return: Node instance on success.
+        """
+        max_tries = kwargs.get('max_tries', 3)
+
+        password = None
+        if 'auth' in kwargs:
+            if isinstance(kwargs['auth'], NodeAuthPassword):
+                password = kwargs['auth'].password
+        elif 'password' in node.extra:
+            password = node.extra['password']
+
+        ssh_username = kwargs.get('ssh_username', 'root')
+        ssh_alternate_usernames = kwargs.get('ssh_alternate_usernames', [])
+        ssh_port = kwargs.get('ssh_port', 22)
+        ssh_timeout = kwargs.get('ssh_timeout', 10)
+        ssh_key_file = kwargs.get('ssh_key', None)
+        timeout = kwargs.get('timeout', SSH_CONNECT_TIMEOUT)
+
+        deploy_error = None
+
+        for username in ([ssh_username] + ssh_alternate_usernames):
+            try:
+                self._connect_and_run_deployment_script(
+                    task=task, node=node,
+                    ssh_hostname=ip_addresses[0], ssh_port=ssh_port,
+                    ssh_username=username, ssh_password=password,
+                    ssh_key_file=ssh_key_file, ssh_timeout=ssh_timeout,
+                    timeout=timeout, max_tries=max_tries,
+                    ssh_pool=kwargs.get('ssh_pool', None))
+            except Exception:
+                # Try alternate username
+                # Todo: Need to fix paramiko so we can catch a more specific
+                # exception
+                e = sys.exc_info()[1]
+                deploy_error = e
+            else:
+                # Script successfully executed, don't try alternate username
+                deploy_error = None
+                break
+
+        if deploy_error is not None:
+            raise DeploymentError(node=node, original_exception=deploy_error,
+                                  driver=self)
+
+        return node
+
     def _connect_and_run_deployment_script(self, task, node, ssh_hostname,
                                            ssh_port, ssh_username,
                                            ssh_password, ssh_key_file,
-                                           ssh_timeout, timeout, max_tries):
+                                           ssh_timeout, timeout, max_tries,
+                                           ssh_pool=None):
         """
         Establish an SSH connection to the node and run the provided deployment
         task.
 
+        If ``ssh_pool`` is provided, an already established connection is
+        reused and the connection is left open after the deployment.
+
         :rtype: :class:`.Node`:
         :return: Node instance on success.
         """
-        ssh_client = SSHClient(hostname=ssh_hostname,
-                               port=ssh_port, username=ssh_username,
-                               password=ssh_password,
-                               key_files=ssh_key_file,
-                               timeout=ssh_timeout)
+        ssh_kwargs = {'hostname': ssh_hostname, 'port': ssh_port,
+                      'username': ssh_username, 'password': ssh_password,
+                      'key_files': ssh_key_file, 'timeout': ssh_timeout}
+
+        if ssh_pool is not None:
+            ssh_client = ssh_pool.get_client(**ssh_kwargs)
+        else:
+            ssh_client = SSHClient(**ssh_kwargs)
 
         ssh_client = self._ssh_client_connect(ssh_client=ssh_client,
                                               timeout=timeout)
@@ -1535,10 +2116,12 @@ class NodeDriver(BaseDriver):
         # Execute the deployment task
         node = self._run_deployment_script(task=task, node=node,
                                            ssh_client=ssh_client,
-                                           max_tries=max_tries)
+                                           max_tries=max_tries,
+                                           close_client=ssh_pool is None)
         return node
 
-    def _run_deployment_script(self, task, node, ssh_client, max_tries=3):
+    def _run_deployment_script(self, task, node, ssh_client, max_tries=3,
+                               close_client=True):
         """
         Run the deployment script on the provided node. At this point it is
         assumed that SSH connection has already been established.
@@ -1556,6 +2139,10 @@ class NodeDriver(BaseDriver):
                           before giving up. (default is 3)
         :type max_tries: ``int``
 
+        :param close_client: Close the SSH connection once the deployment
+                             has succeeded. (default is True)
+        :type close_client: ``bool``
+
         :rtype: :class:`.Node`
         :return: ``Node`` Node instance on success.
         """
@@ -1573,7 +2160,9 @@ class NodeDriver(BaseDriver):
                                         % (max_tries, str(e)), driver=self)
             else:
                 # Deployment succeeded
-                ssh_client.close()
+                if close_client:
+                    ssh_client.close()
+
                 return node
 
     def _get_size_price(self, size_id):
@@ -1585,6 +2174,54 @@ class NodeDriver(BaseDriver):
                               size_id=size_id)
 
 
+def wait_until_nodes_running(nodes, max_workers=DEFAULT_MAX_WORKERS,
+                             **kwargs):
+    """
+    Block until the provided nodes, which can belong to different drivers,
+    are considered running.
+
+    Nodes are grouped by their driver and every group is waited for
+    concurrently using :meth:`NodeDriver.wait_until_running`.
+
+    :param nodes: List of nodes to wait for.
+    :type nodes: ``list`` of :class:`.Node`
+
+    :param max_workers: Maximum number of drivers which are polled
+                        concurrently.
+    :type max_workers: ``int``
+
+    :param kwargs: Keyword arguments which are passed to
+                   :meth:`NodeDriver.wait_until_running`.
+
+    :return: ``[(Node, ip_addresses)]`` list of tuple of Node instance and
+             list of ip_address in the same order as ``nodes``.
+    :rtype: ``list`` of ``tuple``
+    """
+    groups = []
+    for node in nodes:
+        for driver, driver_nodes in groups:
+            if driver is node.driver:
+                driver_nodes.append(node)
+                break
+        else:
+            groups.append((node.driver, [node]))
+
+    def wait(group):
+        driver, driver_nodes = group
+        return driver.wait_until_running(nodes=driver_nodes, **kwargs)
+
+    results = {}
+    for result, exc in run_concurrently(wait, groups,
+                                        max_workers=max_workers):
+        if exc is not None:
+            raise exc
+
+        for node, ip_addresses in result:
+            results[node.uuid] = (node, ip_addresses)
+
+    return [results[node.uuid] for node in nodes]
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod()
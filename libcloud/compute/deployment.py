@@ -20,9 +20,17 @@ Provides generic deployment steps for machines post boot.
 from __future__ import with_statement
 
 import os
+import zlib
+import hashlib
 import binascii
 
+try:
+    from shlex import quote
+except ImportError:
+    from pipes import quote
+
 from libcloud.utils.py3 import basestring, PY3
+from libcloud.common.types import LibcloudError
 
 
 class Deployment(object):
@@ -84,18 +92,33 @@ class SSHKeyDeployment(Deployment):
 class FileDeployment(Deployment):
     """
     Installs a file on the server.
+
+    The file is streamed to the server in chunks so large files are never
+    fully loaded in memory.
     """
 
-    def __init__(self, source, target):
+    def __init__(self, source, target, compress=False, verify_checksum=False):
         """
         :type source: ``str``
         :keyword source: Local path of file to be installed
 
         :type target: ``str``
         :keyword target: Path to install file on node
+
+        :type compress: ``bool``
+        :keyword compress: Compress the file with gzip while uploading it and
+                           decompress it on the node. Requires ``gzip`` on the
+                           node.
+
+        :type verify_checksum: ``bool``
+        :keyword verify_checksum: Compare the SHA256 checksum of the installed
+                                  file with the checksum of the local file.
+                                  Requires ``sha256sum`` on the node.
         """
         self.source = source
         self.target = target
+        self.compress = compress
+        self.verify_checksum = verify_checksum
 
     def run(self, node, client):
         """
@@ -106,12 +129,95 @@ class FileDeployment(Deployment):
         perms = int(oct(os.stat(self.source).st_mode)[4:], 8)
 
         with open(self.source, 'rb') as fp:
-            content = fp.read()
+            reader = _ChecksumReader(fp)
+
+            if self.compress:
+                path = self.target + '.gz'
+                client.putfo(path=path, fo=_GzipReader(reader), chmod=perms)
+            else:
+                client.putfo(path=self.target, fo=reader, chmod=perms)
+
+        if self.compress:
+            # gzip retains the permissions of the compressed file
+            self._run_command(client, 'gzip -d -f %s' % (quote(path)))
+
+        if self.verify_checksum:
+            stdout = self._run_command(client,
+                                       'sha256sum %s' % (quote(self.target)))
+            checksum = stdout.split()[0] if stdout.strip() else None
+
+            if checksum != reader.hexdigest():
+                raise LibcloudError(value=('Checksum of the uploaded file %s '
+                                           'doesn\'t match: %s != %s' %
+                                           (self.target, checksum,
+                                            reader.hexdigest())),
+                                    driver=None)
 
-        client.put(path=self.target, chmod=perms,
-                   contents=content)
         return node
 
+    def _run_command(self, client, cmd):
+        stdout, stderr, exit_status = client.run(cmd)
+
+        if exit_status != 0:
+            raise LibcloudError(value=('Command "%s" failed with exit status '
+                                       '%s: %s' % (cmd, exit_status, stderr)),
+                                driver=None)
+
+        return stdout
+
+
+class _ChecksumReader(object):
+    """
+    File-like object which computes a SHA256 checksum of the data which is
+    read from the wrapped object.
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.hash = hashlib.sha256()
+
+    def read(self, size=-1):
+        data = self.fp.read(size)
+        self.hash.update(data)
+        return data
+
+    def hexdigest(self):
+        return self.hash.hexdigest()
+
+
+class _GzipReader(object):
+    """
+    File-like object which returns the gzip compressed data of the wrapped
+    object.
+    """
+
+    # Size of the chunks read from the wrapped object
+    CHUNK_SIZE = 65536
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION,
+                                           zlib.DEFLATED,
+                                           16 + zlib.MAX_WBITS)
+        self.buffer = b''
+        self.eof = False
+
+    def read(self, size=-1):
+        while not self.eof and (size < 0 or len(self.buffer) < size):
+            data = self.fp.read(self.CHUNK_SIZE)
+
+            if data:
+                self.buffer += self.compressor.compress(data)
+            else:
+                self.buffer += self.compressor.flush()
+                self.eof = True
+
+        if size < 0:
+            size = len(self.buffer)
+
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
 
 class ScriptDeployment(Deployment):
     """
@@ -20,7 +20,6 @@ Amazon EC2, Eucalyptus, Nimbus and Outscale drivers.
 import re
 import sys
 import base64
-import copy
 import warnings
 import time
 
@@ -35,6 +34,7 @@ from libcloud.common.aws import AWSBaseResponse, SignedAWSConnection
 from libcloud.common.aws import DEFAULT_SIGNATURE_VERSION
 from libcloud.common.types import (InvalidCredsError, MalformedResponseError,
                                    LibcloudError)
+from libcloud.pricing import register_pricing_invalidation_callback
 from libcloud.compute.providers import Provider
 from libcloud.compute.base import Node, NodeDriver, NodeLocation, NodeSize
 from libcloud.compute.base import NodeImage, StorageVolume, VolumeSnapshot
@@ -3263,10 +3263,101 @@ VOLUME_MODIFICATION_ATTRIBUTE_MAP = {
     }
 }
 
+# Extraction plans for the attribute maps above, keyed by the map id. See
+# _get_extra_attributes_plan for details.
+EXTRA_ATTRIBUTES_PLANS = {}
+
+# Size attributes (including the price) keyed by the pricing API name and the
+# region name. Shared between the driver instances and cleared when the
+# pricing data changes. See BaseEC2NodeDriver._get_size_catalog.
+SIZE_CATALOG = {}
+
 VALID_EC2_REGIONS = REGION_DETAILS.keys()
 VALID_EC2_REGIONS = [r for r in VALID_EC2_REGIONS if r != 'nimbus']
 VALID_VOLUME_TYPES = ['standard', 'io1', 'gp2', 'st1', 'sc1']
 
+# Maximum number of values EC2 accepts for a single filter
+MAX_FILTER_VALUES = 200
+
+
+def _get_extra_attributes_plan(mapping, namespace=NAMESPACE):
+    """
+    Return the extraction plan for the provided attributes mapping.
+
+    The plan is a list of ``(attribute, tags, transform_func)`` tuples where
+    ``tags`` is a tuple with the namespaced element tag of every step in the
+    attribute xpath. Plans are built once per mapping and reused for every
+    parsed element.
+
+    :rtype: ``list`` of ``tuple``
+    """
+    key = (id(mapping), namespace)
+    cached = EXTRA_ATTRIBUTES_PLANS.get(key, None)
+
+    # The mapping is stored next to the plan so a recycled id of a
+    # garbage collected mapping can't return a stale plan
+    if cached is not None and cached[0] is mapping:
+        return cached[1]
+
+    plan = []
+    for attribute, values in mapping.items():
+        tags = tuple([fixxpath(xpath=tag, namespace=namespace)
+                      for tag in values['xpath'].split('/')])
+        plan.append((attribute, tags, values['transform_func']))
+
+    EXTRA_ATTRIBUTES_PLANS[key] = (mapping, plan)
+    return plan
+
+
+def _invalidate_size_catalog(driver_type=None, driver_name=None):
+    """
+    Remove the cached sizes which use the invalidated pricing data.
+    """
+    if driver_type not in [None, 'compute']:
+        return
+
+    for key in list(SIZE_CATALOG.keys()):
+        if driver_name is None or key[0] == driver_name:
+            SIZE_CATALOG.pop(key, None)
+
+
+register_pricing_invalidation_callback(_invalidate_size_catalog)
+
+
+def _find_child_text(element, tags, indexes):
+    """
+    Return the text of the first element matching the provided tags path.
+
+    This is equivalent to ``element.findtext('/'.join(tags))``, but children
+    of every visited element are only traversed once and indexed by tag in
+    ``indexes`` so they can be reused for the remaining attributes.
+
+    :rtype: ``str`` or ``None``
+    """
+    index = indexes.get(element, None)
+
+    if index is None:
+        index = {}
+        for child in element:
+            index.setdefault(child.tag, []).append(child)
+        indexes[element] = index
+
+    matches = index.get(tags[0], None)
+
+    if not matches:
+        return None
+
+    if len(tags) == 1:
+        return matches[0].text or ''
+
+    for match in matches:
+        value = _find_child_text(match, tags[1:], indexes)
+
+        if value is not None:
+            return value
+
+    return None
+
 
 class EC2NodeLocation(NodeLocation):
     def __init__(self, id, name, country, driver, availability_zone):
@@ -3701,6 +3792,10 @@ class BaseEC2NodeDriver(NodeDriver):
     path = '/'
     signature_version = DEFAULT_SIGNATURE_VERSION
 
+    # Maximum number of instances passed to a single TerminateInstances or
+    # RebootInstances call
+    INSTANCE_ACTION_BATCH_SIZE = 100
+
     NODE_STATE_MAP = {
         'pending': NodeState.PENDING,
         'running': NodeState.RUNNING,
@@ -3752,34 +3847,77 @@ class BaseEC2NodeDriver(NodeDriver):
             params.update(self._build_filters(ex_filters))
 
         elem = self.connection.request(self.path, params=params).object
+        return self._to_nodes_with_addresses(elem)
 
-        nodes = []
-        for rs in findall(element=elem, xpath='reservationSet/item',
-                          namespace=NAMESPACE):
-            nodes += self._to_nodes(rs, 'instancesSet/item')
+    def _list_nodes_for_wait(self, nodes, ex_list_nodes_kwargs):
+        """
+        Only retrieve the nodes which are waited for.
 
-        nodes_elastic_ips_mappings = self.ex_describe_addresses(nodes)
+        A filter is used instead of ``ex_node_ids`` because EC2 returns an
+        error for instance IDs which are not visible yet, which is common
+        right after the instances have been created. EC2 only accepts
+        ``MAX_FILTER_VALUES`` values per filter so large batches of nodes are
+        retrieved using multiple requests.
+        """
+        kwargs = dict(ex_list_nodes_kwargs)
+        filters = dict(kwargs.get('ex_filters') or {})
 
-        for node in nodes:
-            ips = nodes_elastic_ips_mappings[node.id]
-            node.public_ips.extend(ips)
+        if kwargs.get('ex_node_ids') or 'instance-id' in filters:
+            return self.list_nodes(**kwargs)
 
-        return nodes
+        node_ids = [node.id for node in nodes]
+        result = []
 
-    def list_sizes(self, location=None):
-        available_types = REGION_DETAILS[self.region_name]['instance_types']
-        sizes = []
+        for index in range(0, len(node_ids), MAX_FILTER_VALUES):
+            filters['instance-id'] = node_ids[index:index + MAX_FILTER_VALUES]
+            kwargs['ex_filters'] = dict(filters)
+            result.extend(self.list_nodes(**kwargs))
 
-        for instance_type in available_types:
-            attributes = INSTANCE_TYPES[instance_type]
-            attributes = copy.deepcopy(attributes)
-            try:
-                price = self._get_size_price(size_id=instance_type)
-                attributes['price'] = price
-            except KeyError:
-                attributes['price'] = None  # pricing not available
-            sizes.append(NodeSize(driver=self, **attributes))
-        return sizes
+        return result
+
+    def iterate_nodes(self, ex_node_ids=None, ex_filters=None,
+                      ex_page_size=1000):
+        """
+        Return a generator of nodes.
+
+        Nodes are retrieved page by page using the ``MaxResults`` and
+        ``NextToken`` request parameters so only a single page is held in
+        memory at a time.
+
+        :param      ex_node_ids: List of ``node.id``. EC2 doesn't allow
+                                 ``MaxResults`` to be combined with instance
+                                 IDs so all the matching nodes are returned
+                                 in a single page when this is provided.
+        :type       ex_node_ids: ``list`` of ``str``
+
+        :param      ex_filters: The filters so that the list includes
+                                information for certain nodes only.
+        :type       ex_filters: ``dict``
+
+        :param      ex_page_size: Maximum number of nodes to retrieve per
+                                  request (5 - 1000).
+        :type       ex_page_size: ``int``
+
+        :rtype: ``generator`` of :class:`Node`
+        """
+        params = {'Action': 'DescribeInstances'}
+
+        if ex_node_ids:
+            params.update(self._pathlist('InstanceId', ex_node_ids))
+            ex_page_size = None
+
+        if ex_filters:
+            params.update(self._build_filters(ex_filters))
+
+        for elem in self._request_pages(params, page_size=ex_page_size):
+            for node in self._to_nodes_with_addresses(elem):
+                yield node
+
+    def list_sizes(self, location=None):
+        catalog = self._get_size_catalog(
+            instance_types=INSTANCE_TYPES,
+            available_types=REGION_DETAILS[self.region_name]['instance_types'])
+        return self._to_sizes_from_catalog(catalog)
 
     def list_images(self, location=None, ex_image_ids=None, ex_owner=None,
                     ex_executableby=None, ex_filters=None):
@@ -3822,27 +3960,44 @@ class BaseEC2NodeDriver(NodeDriver):
 
         :rtype: ``list`` of :class:`NodeImage`
         """
-        params = {'Action': 'DescribeImages'}
-
-        if ex_owner:
-            params.update({'Owner.1': ex_owner})
-
-        if ex_executableby:
-            params.update({'ExecutableBy.1': ex_executableby})
-
-        if ex_image_ids:
-            for index, image_id in enumerate(ex_image_ids):
-                index += 1
-                params.update({'ImageId.%s' % (index): image_id})
-
-        if ex_filters:
-            params.update(self._build_filters(ex_filters))
+        params = self._get_describe_images_params(
+            ex_image_ids=ex_image_ids, ex_owner=ex_owner,
+            ex_executableby=ex_executableby, ex_filters=ex_filters)
 
         images = self._to_images(
             self.connection.request(self.path, params=params).object
         )
         return images
 
+    def iterate_images(self, location=None, ex_image_ids=None, ex_owner=None,
+                       ex_executableby=None, ex_filters=None,
+                       ex_page_size=None):
+        """
+        Return a generator of images.
+        @inherits: :class:`BaseEC2NodeDriver.list_images`
+
+        Images are retrieved page by page when ``ex_page_size`` is provided.
+        It's not set by default since not all the EC2 compatible APIs
+        support paginating ``DescribeImages`` results, but ``NextToken`` is
+        always followed if it's present in the response.
+
+        :param      ex_page_size: Maximum number of images to retrieve per
+                                  request (5 - 1000).
+        :type       ex_page_size: ``int``
+
+        :rtype: ``generator`` of :class:`NodeImage`
+        """
+        params = self._get_describe_images_params(
+            ex_image_ids=ex_image_ids, ex_owner=ex_owner,
+            ex_executableby=ex_executableby, ex_filters=ex_filters)
+
+        if ex_image_ids:
+            ex_page_size = None
+
+        for response in self._request_pages(params, page_size=ex_page_size):
+            for image in self._to_images(response):
+                yield image
+
     def get_image(self, image_id):
         """
         Gets an image based on an image_id.
@@ -3883,6 +4038,31 @@ class BaseEC2NodeDriver(NodeDriver):
         ]
         return volumes
 
+    def iterate_volumes(self, node=None, ex_page_size=500):
+        """
+        Return a generator of volumes which are retrieved page by page.
+
+        :param      node: Only return volumes attached to this node.
+        :type       node: :class:`Node`
+
+        :param      ex_page_size: Maximum number of volumes to retrieve per
+                                  request (5 - 500).
+        :type       ex_page_size: ``int``
+
+        :rtype: ``generator`` of :class:`StorageVolume`
+        """
+        params = {
+            'Action': 'DescribeVolumes',
+        }
+        if node:
+            filters = {'attachment.instance-id': node.id}
+            params.update(self._build_filters(filters))
+
+        for response in self._request_pages(params, page_size=ex_page_size):
+            for el in response.findall(fixxpath(xpath='volumeSet/item',
+                                                namespace=NAMESPACE)):
+                yield self._to_volume(el)
+
     def create_node(self, **kwargs):
         """
         Create a new EC2 node.
@@ -4097,6 +4277,27 @@ class BaseEC2NodeDriver(NodeDriver):
         else:
             return nodes
 
+    def create_nodes(self, count, max_workers=None, **kwargs):
+        """
+        Create multiple nodes using a single RunInstances call.
+
+        All the nodes get the same ``Name`` tag. Unless ``ex_mincount`` is
+        provided, the call fails if ``count`` instances can't be launched.
+
+        See also :meth:`NodeDriver.create_nodes`. ``max_workers`` is ignored.
+
+        :rtype: ``list`` of :class:`Node`
+        """
+        kwargs['ex_mincount'] = kwargs.get('ex_mincount', count)
+        kwargs['ex_maxcount'] = count
+
+        nodes = self.create_node(**kwargs)
+
+        if not isinstance(nodes, list):
+            nodes = [nodes]
+
+        return nodes
+
     def reboot_node(self, node):
         params = {'Action': 'RebootInstances'}
         params.update(self._pathlist('InstanceId', [node.id]))
@@ -4109,6 +4310,42 @@ class BaseEC2NodeDriver(NodeDriver):
         res = self.connection.request(self.path, params=params).object
         return self._get_terminate_boolean(res)
 
+    def reboot_nodes(self, nodes, max_workers=None):
+        """
+        Reboot multiple nodes using a single RebootInstances call for up to
+        ``INSTANCE_ACTION_BATCH_SIZE`` nodes.
+
+        See also :meth:`NodeDriver.reboot_nodes`. ``max_workers`` is ignored.
+        """
+        results = []
+
+        for batch, res in self._request_instance_batches('RebootInstances',
+                                                         nodes):
+            results.extend([self._get_boolean(res)] * len(batch))
+
+        return results
+
+    def destroy_nodes(self, nodes, max_workers=None):
+        """
+        Destroy multiple nodes using a single TerminateInstances call for up
+        to ``INSTANCE_ACTION_BATCH_SIZE`` nodes.
+
+        See also :meth:`NodeDriver.destroy_nodes`. ``max_workers`` is ignored.
+        """
+        states = {}
+
+        for _, res in self._request_instance_batches('TerminateInstances',
+                                                     nodes):
+            for item in findall(element=res, xpath='instancesSet/item',
+                                namespace=NAMESPACE):
+                instance_id = findtext(element=item, xpath='instanceId',
+                                       namespace=NAMESPACE)
+                states[instance_id] = item.findtext('.//{%s}name' %
+                                                    (NAMESPACE))
+
+        return [states.get(node.id, None) in ('shutting-down', 'terminated')
+                for node in nodes]
+
     def create_volume(self, size, name, location=None, snapshot=None,
                       ex_volume_type='standard', ex_iops=None,
                       ex_encrypted=False, ex_kms_key_id=None):
@@ -4279,6 +4516,31 @@ class BaseEC2NodeDriver(NodeDriver):
         snapshots = self._to_snapshots(response)
         return snapshots
 
+    def iterate_snapshots(self, owner=None, ex_page_size=1000):
+        """
+        Return a generator of snapshots which are retrieved page by page.
+
+        :param owner: The owner of the snapshot: self|amazon|ID
+        :type owner: ``str``
+
+        :param ex_page_size: Maximum number of snapshots to retrieve per
+                             request (5 - 1000).
+        :type ex_page_size: ``int``
+
+        :rtype: ``generator`` of :class:`VolumeSnapshot`
+        """
+        params = {
+            'Action': 'DescribeSnapshots',
+        }
+        if owner:
+            params.update({
+                'Owner.1': owner,
+            })
+
+        for response in self._request_pages(params, page_size=ex_page_size):
+            for snapshot in self._to_snapshots(response):
+                yield snapshot
+
     def destroy_volume_snapshot(self, snapshot):
         params = {
             'Action': 'DeleteSnapshot',
@@ -4956,6 +5218,30 @@ class BaseEC2NodeDriver(NodeDriver):
         response = self.connection.request(self.path, params=params)
         return self._to_security_groups(response.object)
 
+    def ex_iterate_security_groups(self, filters=None, ex_page_size=1000):
+        """
+        Return a generator of :class:`EC2SecurityGroup` objects for the
+        current region which are retrieved page by page.
+
+        :param      filters: The filters so that the list returned includes
+                             information for specific security groups only.
+        :type       filters: ``dict``
+
+        :param      ex_page_size: Maximum number of security groups to
+                                  retrieve per request (5 - 1000).
+        :type       ex_page_size: ``int``
+
+        :rtype:     ``generator`` of :class:`EC2SecurityGroup`
+        """
+        params = {'Action': 'DescribeSecurityGroups'}
+
+        if filters:
+            params.update(self._build_filters(filters))
+
+        for response in self._request_pages(params, page_size=ex_page_size):
+            for group in self._to_security_groups(response):
+                yield group
+
     def ex_create_security_group(self, name, description, vpc_id=None):
         """
         Creates a new Security Group in EC2-Classic or a targeted VPC.
@@ -5630,23 +5916,20 @@ class BaseEC2NodeDriver(NodeDriver):
 
         result = self.connection.request(self.path, params=params).object
 
-        node_instance_ids = [node.id for node in nodes]
         nodes_elastic_ip_mappings = {}
+        for node in nodes:
+            nodes_elastic_ip_mappings.setdefault(node.id, [])
 
         # We will set only_associated to True so that we only get back
-        # IPs which are associated with instances
+        # IPs which are associated with instances. The response is parsed
+        # only once and the addresses are indexed by the instance id.
         only_associated = True
 
-        for node_id in node_instance_ids:
-            nodes_elastic_ip_mappings.setdefault(node_id, [])
-            for addr in self._to_addresses(result,
-                                           only_associated):
-
-                instance_id = addr.instance_id
+        for addr in self._to_addresses(result, only_associated):
+            ips = nodes_elastic_ip_mappings.get(addr.instance_id, None)
 
-                if node_id == instance_id:
-                    nodes_elastic_ip_mappings[instance_id].append(
-                        addr.ip)
+            if ips is not None:
+                ips.append(addr.ip)
 
         return nodes_elastic_ip_mappings
 
@@ -6670,6 +6953,58 @@ class BaseEC2NodeDriver(NodeDriver):
 
         return kwargs
 
+    def _request_pages(self, params, page_size=None):
+        """
+        Perform a request and yield the response object for each page of
+        results, following ``nextToken`` until the results are exhausted.
+
+        :param      params: Request parameters.
+        :type       params: ``dict``
+
+        :param      page_size: Value for the ``MaxResults`` parameter. If not
+                               provided, the page size is chosen by the API.
+        :type       page_size: ``int``
+
+        :rtype: ``generator`` of ``xml.etree.ElementTree.Element``
+        """
+        params = params.copy()
+
+        if page_size:
+            params['MaxResults'] = page_size
+
+        while True:
+            response = self.connection.request(self.path,
+                                               params=params).object
+            yield response
+
+            next_token = findtext(element=response, xpath='nextToken',
+                                  namespace=NAMESPACE)
+
+            if not next_token:
+                break
+
+            params['NextToken'] = next_token
+
+    def _to_nodes_with_addresses(self, object):
+        """
+        Build nodes from a DescribeInstances response and add the Elastic
+        IP addresses associated with them to their public IPs.
+
+        :rtype: ``list`` of :class:`Node`
+        """
+        nodes = []
+        for rs in findall(element=object, xpath='reservationSet/item',
+                          namespace=NAMESPACE):
+            nodes += self._to_nodes(rs, 'instancesSet/item')
+
+        nodes_elastic_ips_mappings = self.ex_describe_addresses(nodes)
+
+        for node in nodes:
+            ips = nodes_elastic_ips_mappings[node.id]
+            node.public_ips.extend(ips)
+
+        return nodes
+
     def _to_nodes(self, object, xpath):
         return [self._to_node(el)
                 for el in object.findall(fixxpath(xpath=xpath,
@@ -6694,16 +7029,43 @@ class BaseEC2NodeDriver(NodeDriver):
         private_ip = findtext(element=element, xpath='privateIpAddress',
                               namespace=NAMESPACE)
         private_ips = [private_ip] if private_ip else []
+
+        # Get our tags
+        tags = self._get_resource_tags(element)
+        name = tags.get('Name', instance_id)
+
+        if self.lazy_extra:
+            def extra_loader():
+                return self._to_node_extra(element, tags)
+
+            return Node(id=instance_id, name=name, state=state,
+                        public_ips=public_ips, private_ips=private_ips,
+                        driver=self.connection.driver, created_at=created,
+                        extra_loader=extra_loader)
+
+        return Node(id=instance_id, name=name, state=state,
+                    public_ips=public_ips, private_ips=private_ips,
+                    driver=self.connection.driver, created_at=created,
+                    extra=self._to_node_extra(element, tags))
+
+    def _to_node_extra(self, element, tags):
+        """
+        Build the extra dictionary for a node.
+
+        :param      element: Instance element to parse the values from.
+        :type       element: xml.etree.ElementTree.Element.
+
+        :param      tags: Node tags.
+        :type       tags: ``dict``
+
+        :rtype: ``dict``
+        """
         product_codes = []
         for p in findall(element=element,
                          xpath="productCodesSet/item/productCode",
                          namespace=NAMESPACE):
             product_codes.append(p)
 
-        # Get our tags
-        tags = self._get_resource_tags(element)
-        name = tags.get('Name', instance_id)
-
         # Get our extra dictionary
         extra = self._get_extra_dict(
             element, RESOURCE_EXTRA_ATTRIBUTES_MAP['node'])
@@ -6716,10 +7078,7 @@ class BaseEC2NodeDriver(NodeDriver):
         extra['product_codes'] = product_codes
         extra['tags'] = tags
 
-        return Node(id=instance_id, name=name, state=state,
-                    public_ips=public_ips, private_ips=private_ips,
-                    driver=self.connection.driver, created_at=created,
-                    extra=extra)
+        return extra
 
     def _to_images(self, object):
         return [self._to_image(el) for el in object.findall(
@@ -7434,6 +7793,86 @@ class BaseEC2NodeDriver(NodeDriver):
         tag = '{%s}%s' % (NAMESPACE, 'return')
         return element.findtext(tag) == 'true'
 
+    def _get_size_catalog(self, instance_types, available_types):
+        """
+        Return the attributes of the sizes available in the current region.
+
+        The attributes and the prices are only computed once per pricing API
+        name and region and shared between all the driver instances.
+
+        :rtype: ``tuple`` of ``dict``
+        """
+        key = (self.api_name, self.region_name)
+        catalog = SIZE_CATALOG.get(key, None)
+
+        if catalog is None:
+            catalog = []
+
+            for instance_type in available_types:
+                attributes = dict(instance_types[instance_type])
+                try:
+                    price = self._get_size_price(size_id=instance_type)
+                    attributes['price'] = price
+                except KeyError:
+                    attributes['price'] = None  # pricing not available
+                catalog.append(attributes)
+
+            catalog = tuple(catalog)
+            SIZE_CATALOG[key] = catalog
+
+        return catalog
+
+    def _to_sizes_from_catalog(self, catalog):
+        sizes = []
+
+        for attributes in catalog:
+            attributes = attributes.copy()
+
+            # Don't share the (mutable) extra dictionary with the catalog
+            if 'extra' in attributes:
+                attributes['extra'] = attributes['extra'].copy()
+
+            sizes.append(NodeSize(driver=self, **attributes))
+
+        return sizes
+
+    def _get_instance_batches(self, nodes):
+        """
+        Split the provided nodes into batches which can be passed to a single
+        API call.
+        """
+        size = self.INSTANCE_ACTION_BATCH_SIZE
+        return [nodes[i:i + size] for i in range(0, len(nodes), size)]
+
+    def _request_instance_batches(self, action, nodes):
+        """
+        Call the provided action for every batch of nodes and return a list
+        of ``(batch, response)`` tuples.
+
+        If the call for one of the batches raises an exception, the exception
+        is re-raised once all the other batches have been processed.
+        """
+        results = []
+        error = None
+
+        for batch in self._get_instance_batches(nodes):
+            params = {'Action': action}
+            params.update(self._pathlist('InstanceId',
+                                         [node.id for node in batch]))
+            try:
+                res = self.connection.request(self.path, params=params).object
+            except Exception:
+                if error is None:
+                    error = sys.exc_info()[1]
+                continue
+
+            results.append((batch, res))
+
+        if error is not None:
+            raise error
+
+        return results
+
     def _get_terminate_boolean(self, element):
         status = element.findtext(".//{%s}%s" % (NAMESPACE, 'name'))
         return any([term_status == status
@@ -7472,12 +7911,12 @@ class BaseEC2NodeDriver(NodeDriver):
 
         :rtype: ``dict``
         """
+        plan = _get_extra_attributes_plan(mapping)
+        indexes = {}
+
         extra = {}
-        for attribute, values in mapping.items():
-            transform_func = values['transform_func']
-            value = findattr(element=element,
-                             xpath=values['xpath'],
-                             namespace=NAMESPACE)
+        for attribute, tags, transform_func in plan:
+            value = _find_child_text(element, tags, indexes)
             if value is not None:
                 extra[attribute] = transform_func(value)
             else:
@@ -7512,6 +7951,31 @@ class BaseEC2NodeDriver(NodeDriver):
 
         return tags
 
+    def _get_describe_images_params(self, ex_image_ids=None, ex_owner=None,
+                                    ex_executableby=None, ex_filters=None):
+        """
+        Return the query parameters for a DescribeImages request.
+
+        :rtype: ``dict``
+        """
+        params = {'Action': 'DescribeImages'}
+
+        if ex_owner:
+            params.update({'Owner.1': ex_owner})
+
+        if ex_executableby:
+            params.update({'ExecutableBy.1': ex_executableby})
+
+        if ex_image_ids:
+            for index, image_id in enumerate(ex_image_ids):
+                index += 1
+                params.update({'ImageId.%s' % (index): image_id})
+
+        if ex_filters:
+            params.update(self._build_filters(ex_filters))
+
+        return params
+
     def _get_block_device_mapping_params(self, block_device_mapping):
         """
         Return a list of dictionaries with query parameters for
@@ -8173,15 +8637,10 @@ class OutscaleNodeDriver(BaseEC2NodeDriver):
         """
         available_types =\
             self.region_details[self.region_name]['instance_types']
-        sizes = []
-
-        for instance_type in available_types:
-            attributes = OUTSCALE_INSTANCE_TYPES[instance_type]
-            attributes = copy.deepcopy(attributes)
-            price = self._get_size_price(size_id=instance_type)
-            attributes.update({'price': price})
-            sizes.append(NodeSize(driver=self, **attributes))
-        return sizes
+        catalog = self._get_size_catalog(
+            instance_types=OUTSCALE_INSTANCE_TYPES,
+            available_types=available_types)
+        return self._to_sizes_from_catalog(catalog)
 
     def ex_modify_instance_keypair(self, instance_id, key_name=None):
         """
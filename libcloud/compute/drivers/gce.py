@@ -17,9 +17,17 @@ Module for Google Compute Engine Driver.
 """
 from __future__ import with_statement
 
+import os
+import bisect
 import datetime
 import time
 import sys
+import threading
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
 
 from libcloud.common.base import LazyObject
 from libcloud.common.google import GoogleOAuth2Credential
@@ -28,7 +36,7 @@ from libcloud.common.google import GoogleBaseConnection
 from libcloud.common.google import GoogleBaseError
 from libcloud.common.google import ResourceNotFoundError
 from libcloud.common.google import ResourceExistsError
-from libcloud.common.types import ProviderError
+from libcloud.common.types import LibcloudError, ProviderError
 
 from libcloud.compute.base import Node, NodeDriver, NodeImage, NodeLocation
 from libcloud.compute.base import NodeSize, StorageVolume, VolumeSnapshot
@@ -36,10 +44,30 @@ from libcloud.compute.base import UuidMixin
 from libcloud.compute.providers import Provider
 from libcloud.compute.types import NodeState
 from libcloud.utils.iso8601 import parse_date
+from libcloud.utils.concurrency import DEFAULT_MAX_WORKERS, run_concurrently
+from libcloud.utils.files import lock_file, write_file_atomically
 
 API_VERSION = 'v1'
 DEFAULT_TASK_COMPLETION_TIMEOUT = 180
 
+# How long (in seconds) the zone and region catalogues are cached for
+DEFAULT_LOCATION_CACHE_TTL = 3600
+
+# Raw zone and region API items shared by all the driver instances which use
+# the same project. Keyed by (project, kind) and holding (timestamp, items).
+LOCATION_CACHE = {}
+LOCATION_CACHE_LOCK = threading.Lock()
+
+# How long (in seconds) the image indexes are cached for
+DEFAULT_IMAGE_INDEX_TTL = 600
+
+# Image indexes shared by all the driver instances. Keyed by project name.
+IMAGE_INDEX_CACHE = {}
+IMAGE_INDEX_CACHE_LOCK = threading.Lock()
+
+# How long (in seconds) the disk details used to build nodes are cached for
+DEFAULT_VOLUME_INDEX_TTL = 60
+
 
 def timestamp_to_datetime(timestamp):
     """
@@ -136,8 +164,8 @@ class GCEConnection(GoogleBaseConnection):
         Perform request(s) to obtain all results from 'api_name'.
 
         This method will make requests to the aggregated 'api_name' until
-        all results are received.  It will then, through a helper function,
-        combine all results and return a single 'items' dictionary.
+        all results are received and combine them into a single 'items'
+        dictionary.
 
         :param    api_name: Name of API to call. Consult API docs
                   for valid names.
@@ -148,63 +176,103 @@ class GCEConnection(GoogleBaseConnection):
                   ex: { 'items': {'zones/us-central1-a': {disks: []}} }
         :rtype:   ``dict``
         """
-        request_path = "/aggregated/%s" % api_name
-        api_responses = []
+        merged_items = {}
+        for key, items in self.iterate_aggregated_items(api_name):
+            merged_items.setdefault(key, {}).setdefault(api_name, [])
+            merged_items[key][api_name].extend(items)
+        return {'items': merged_items}
 
-        params = {'maxResults': 500}
-        more_results = True
-        while more_results:
-            self.gce_params = params
-            response = self.request(request_path, method='GET').object
-            if 'items' in response:
-                api_responses.append(response)
-            more_results = 'pageToken' in params
-        return self._merge_response_items(api_name, api_responses)
-
-    def _merge_response_items(self, list_name, response_list):
-        """
-        Take a list of API responses ("item"-portion only) and combine them.
-
-        Helper function to combine multiple aggegrated responses into a single
-        dictionary that resembles an API response.
-
-        Note: keys that don't have a 'list_name" key (including warnings)
-        are omitted.
-
-        :param   list_name: Name of list in dict.  Practically, this is
-                          the name of the API called (e.g. 'disks').
-        :type    list_name: ``str``
-
-        :param   response_list: list of API responses (e.g. resp['items']).
-                                Each entry in the list is the result of a
-                                single API call.  Expected format is:
-                                [ { items: {
-                                             key1: { api_name:[]},
-                                             key2: { api_name:[]}
-                                           }}, ... ]
-        :type    response_list: ``dict``
-
-        :return: dict in the format of:
-                 { items: {key: {api_name:[]}, key2: {api_name:[]}} }
-                 ex: { items: {
-                         'us-east1-a': {'disks': []},
-                         'us-east1-b': {'disks': []}
-                         }}
-        :rtype:  ``dict``
+    def iterate_aggregated_items(self, api_name, max_results=500):
+        """
+        Yield the results from the aggregated 'api_name' as pages arrive.
+
+        Unlike :meth:`request_aggregated_items` the pages are not held in
+        memory, every page yields one ``(key, items)`` tuple for each zone or
+        region it contains results for. A key can be yielded more than once
+        if its results span multiple pages.
+
+        >>> for key, disks in conn.iterate_aggregated_items('disks'):
+        ...     print(key, len(disks))
+        zones/us-central1-a 2
+        zones/europe-west1-a 1
+
+        :param    api_name: Name of API to call (e.g. 'disks').
+        :type     api_name: ``str``
+
+        :keyword  max_results: Maximum number of results in a page.
+        :type     max_results: ``int``
+
+        :return:  Generator of (key, items) tuples, where key is the zone or
+                  region (e.g. 'zones/us-central1-a').
+        :rtype:   ``generator``
+        """
+        request_path = '/aggregated/%s' % (api_name)
+        for response in self._iterate_pages(request_path, max_results):
+            for key, value in response.get('items', {}).items():
+                # Keys without results only contain a warning
+                if api_name in value:
+                    yield key, value[api_name]
+
+    def request_zonal_items(self, api_name, zones,
+                            max_workers=DEFAULT_MAX_WORKERS, max_results=500):
+        """
+        Obtain all results from 'api_name' by listing every zone in parallel.
+
+        This is an alternative to :meth:`request_aggregated_items` for
+        projects with so many resources that paging through the aggregated
+        list sequentially takes too long. The result has the same format.
+
+        :param    api_name: Name of a zonal API (e.g. 'disks', 'instances').
+        :type     api_name: ``str``
+
+        :param    zones: Names of the zones to list.
+        :type     zones: ``list`` of ``str``
+
+        :keyword  max_workers: Maximum number of zones listed concurrently.
+        :type     max_workers: ``int``
+
+        :keyword  max_results: Maximum number of results in a page.
+        :type     max_results: ``int``
+
+        :return:  dict in the format of the aggregated API response.
+                  format: { 'items': {'zones/zone': {api_name: []}} }
+        :rtype:   ``dict``
         """
+        def list_zone(zone):
+            request_path = '/zones/%s/%s' % (zone, api_name)
+            items = []
+            for response in self._iterate_pages(request_path, max_results):
+                items.extend(response.get('items', []))
+            return items
+
+        zones = list(zones)
+        results = run_concurrently(list_zone, zones, max_workers=max_workers)
+
         merged_items = {}
-        for resp in response_list:
-            if 'items' in resp:
-                # example k would be a zone or region name
-                # example v would be { "disks" : [], "otherkey" : "..." }
-                for k, v in resp['items'].items():
-                    if list_name in v:
-                        merged_items.setdefault(k, {}).setdefault(
-                            list_name, [])
-                        # Combine the list with the existing list.
-                        merged_items[k][list_name] += v[list_name]
+        for zone, (items, exc) in zip(zones, results):
+            if exc is not None:
+                raise exc
+            if items:
+                merged_items['zones/%s' % (zone)] = {api_name: items}
         return {'items': merged_items}
 
+    def _iterate_pages(self, request_path, max_results):
+        """
+        Yield every page of a list request.
+
+        The page token is passed explicitly rather than through gce_params
+        so pages of different lists can be requested concurrently.
+        """
+        params = {'maxResults': max_results}
+        while True:
+            response = self.request(request_path, method='GET',
+                                    params=dict(params)).object
+            yield response
+
+            if 'nextPageToken' not in response:
+                break
+            params['pageToken'] = response['nextPageToken']
+
 
 class GCEList(object):
     """
@@ -306,6 +374,322 @@ class GCEList(object):
         return self
 
 
+class GCEOperationTimeoutError(LibcloudError):
+    """
+    Raised when a GCE operation doesn't complete in time.
+    """
+    pass
+
+
+class GCEOperationFuture(object):
+    """
+    Result of a GCE operation tracked by a :class:`GCEOperationWaiter`.
+    """
+
+    def __init__(self, operation, deadline, poll_interval=None):
+        """
+        :param  operation: The operation dictionary returned by the API.
+        :type   operation: ``dict``
+
+        :param  deadline: Time after which the operation is timed out.
+        :type   deadline: ``float``
+
+        :keyword  poll_interval: Seconds between status checks of this
+                                 operation.
+        :type     poll_interval: ``float``
+        """
+        self.operation = operation
+        self.deadline = deadline
+        self.poll_interval = poll_interval
+        self._exception = None
+        self._event = threading.Event()
+
+    def __repr__(self):
+        return '<GCEOperationFuture name="%s" done="%s">' % (
+            self.operation.get('name'), self.done())
+
+    def done(self):
+        """
+        Return True if the operation has completed (or failed).
+
+        :rtype: ``bool``
+        """
+        return self._event.is_set()
+
+    def result(self, timeout=None):
+        """
+        Wait for the operation to complete and return the final operation
+        dictionary.
+
+        Errors reported by the API while polling (including failed
+        operations) are re-raised here. :class:`GCEOperationTimeoutError` is
+        raised if the operation doesn't complete in time.
+
+        :keyword  timeout: Maximum number of seconds to wait for. If None,
+                           wait until the waiter gives up on the operation.
+        :type     timeout: ``float``
+
+        :return:  The completed operation dictionary.
+        :rtype:   ``dict``
+        """
+        self._event.wait(timeout)
+
+        if not self._event.is_set():
+            raise GCEOperationTimeoutError(
+                'Operation %s did not complete in %s seconds' %
+                (self.operation.get('name'), timeout))
+
+        if self._exception is not None:
+            raise self._exception
+
+        return self.operation
+
+    def _set_result(self, operation):
+        self.operation = operation
+        self._event.set()
+
+    def _set_exception(self, exception):
+        self._exception = exception
+        self._event.set()
+
+
+class GCEOperationWaiter(object):
+    """
+    Track many pending GCE operations and poll them from a single loop.
+
+    Operations are submitted with :meth:`submit` which returns a
+    :class:`GCEOperationFuture`. A background thread polls all the pending
+    operations concurrently every ``poll_interval`` seconds and resolves
+    their futures once they are done. The thread exits when there are no
+    pending operations left.
+
+    >>> operation = driver.connection.request(request, method='POST').object
+    >>> future = driver.operation_waiter.submit(operation)
+    >>> future.result()
+    """
+
+    def __init__(self, connection, poll_interval=None, timeout=None,
+                 max_workers=DEFAULT_MAX_WORKERS):
+        """
+        :param  connection: Connection used to poll the operations.
+        :type   connection: :class:`GCEConnection`
+
+        :keyword  poll_interval: Seconds between polling rounds. Defaults to
+                                 the connection poll interval.
+        :type     poll_interval: ``float``
+
+        :keyword  timeout: Default number of seconds to wait for an
+                           operation. Defaults to the connection timeout.
+        :type     timeout: ``int``
+
+        :keyword  max_workers: Maximum number of concurrent poll requests.
+        :type     max_workers: ``int``
+        """
+        self.connection = connection
+        self.poll_interval = poll_interval if poll_interval is not None \
+            else connection.poll_interval
+        self.timeout = timeout if timeout is not None else connection.timeout
+        self.max_workers = max_workers
+        self._pending = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, operation, timeout=None, poll_interval=None):
+        """
+        Start tracking an operation.
+
+        :param  operation: The operation dictionary returned by the API.
+        :type   operation: ``dict``
+
+        :keyword  timeout: Seconds to wait for the operation to complete.
+        :type     timeout: ``int``
+
+        :keyword  poll_interval: Seconds between status checks of this
+                                 operation. The polling loop runs at the
+                                 shortest interval of all the pending
+                                 operations.
+        :type     poll_interval: ``float``
+
+        :return:  Future which is resolved once the operation is done.
+        :rtype:   :class:`GCEOperationFuture`
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        future = GCEOperationFuture(operation, deadline=time.time() + timeout,
+                                    poll_interval=poll_interval)
+
+        if operation.get('status') == 'DONE':
+            future._set_result(operation)
+            return future
+
+        with self._lock:
+            self._pending.append(future)
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+
+        return future
+
+    def wait(self, futures, timeout=None):
+        """
+        Wait for all the futures and return their operations.
+
+        :param  futures: Futures returned by :meth:`submit`.
+        :type   futures: ``list`` of :class:`GCEOperationFuture`
+
+        :keyword  timeout: Maximum number of seconds to wait for all of them.
+        :type     timeout: ``float``
+
+        :return:  Completed operation dictionaries in the same order.
+        :rtype:   ``list`` of ``dict``
+        """
+        end = time.time() + timeout if timeout is not None else None
+        operations = []
+
+        for future in futures:
+            remaining = max(end - time.time(), 0) if end is not None else None
+            operations.append(future.result(timeout=remaining))
+
+        return operations
+
+    def poll(self, futures):
+        """
+        Poll the given futures once (concurrently) and resolve the ones
+        whose operation has completed, failed or timed out.
+
+        :param  futures: Futures to poll.
+        :type   futures: ``list`` of :class:`GCEOperationFuture`
+        """
+        results = run_concurrently(self._poll_operation, futures,
+                                   max_workers=self.max_workers)
+        now = time.time()
+
+        for future, (operation, exception) in zip(futures, results):
+            if exception is not None:
+                future._set_exception(exception)
+            elif operation['status'] == 'DONE':
+                future._set_result(operation)
+            elif now >= future.deadline:
+                future._set_exception(GCEOperationTimeoutError(
+                    'Operation %s did not complete in time' %
+                    (operation.get('name'))))
+            else:
+                future.operation = operation
+
+    def _poll_operation(self, future):
+        return self.connection.request(future.operation['selfLink']).object
+
+    def _run(self):
+        while True:
+            with self._lock:
+                self._pending = [f for f in self._pending if not f.done()]
+                pending = list(self._pending)
+
+                if not pending:
+                    self._thread = None
+                    return
+
+            try:
+                self.poll(pending)
+            except Exception:
+                e = sys.exc_info()[1]
+                for future in pending:
+                    if not future.done():
+                        future._set_exception(e)
+
+            intervals = [future.poll_interval or self.poll_interval
+                         for future in pending if not future.done()]
+            if intervals:
+                time.sleep(min(intervals))
+
+
+class GCEImageIndex(object):
+    """
+    Index of the images in a project used to resolve image names.
+
+    The index holds the raw API items so it can be shared between driver
+    instances. Exact names are looked up in a dictionary, prefixes are
+    resolved with a binary search over the sorted image names and the
+    result is memoized.
+    """
+
+    def __init__(self, project, items, timestamp=None):
+        """
+        :param  project: Name of the project the images belong to.
+        :type   project: ``str``
+
+        :param  items: Image dictionaries as returned by the API.
+        :type   items: ``list`` of ``dict``
+
+        :keyword  timestamp: Time the items were retrieved at.
+        :type     timestamp: ``float``
+        """
+        self.project = project
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self.images = {}
+        self.families = {}
+        self._prefix_matches = {}
+
+        for item in items:
+            self.images.setdefault(item['name'], item)
+
+            family = item.get('family')
+            # Like the API, only return non-deprecated images for a family
+            if not family or 'deprecated' in item:
+                continue
+
+            latest = self.families.get(family)
+            if latest is None or \
+                    self._get_timestamp(latest) < self._get_timestamp(item):
+                self.families[family] = item
+
+        self.names = sorted(self.images.keys())
+
+    def is_expired(self, ttl):
+        return self.timestamp + ttl < time.time()
+
+    def get(self, name):
+        """
+        Return the image item with the given name or None.
+        """
+        return self.images.get(name)
+
+    def get_family(self, family):
+        """
+        Return the latest non-deprecated image item in the family or None.
+        """
+        return self.families.get(family)
+
+    def match(self, partial_name):
+        """
+        Return the latest image item whose name starts with partial_name or
+        None if there are no such images.
+        """
+        if partial_name in self._prefix_matches:
+            return self._prefix_matches[partial_name]
+
+        latest = None
+        latest_ts = None
+        index = bisect.bisect_left(self.names, partial_name)
+
+        while index < len(self.names) and \
+                self.names[index].startswith(partial_name):
+            item = self.images[self.names[index]]
+            ts = self._get_timestamp(item)
+
+            if latest is None or latest_ts < ts:
+                latest, latest_ts = item, ts
+
+            index += 1
+
+        self._prefix_matches[partial_name] = latest
+        return latest
+
+    def _get_timestamp(self, item):
+        return timestamp_to_datetime(item['creationTimestamp'])
+
+
 class GCELicense(UuidMixin, LazyObject):
     """A GCE License used to track software usage in GCE nodes."""
 
@@ -1796,7 +2180,11 @@ class GCENodeDriver(NodeDriver):
     BACKEND_SERVICE_PROTOCOLS = ['HTTP', 'HTTPS', 'HTTP2', 'TCP', 'SSL']
 
     def __init__(self, user_id, key=None, datacenter=None, project=None,
-                 auth_type=None, scopes=None, credential_file=None, **kwargs):
+                 auth_type=None, scopes=None, credential_file=None,
+                 location_cache_file=None,
+                 location_cache_ttl=DEFAULT_LOCATION_CACHE_TTL,
+                 image_index_ttl=DEFAULT_IMAGE_INDEX_TTL,
+                 volume_index_ttl=DEFAULT_VOLUME_INDEX_TTL, **kwargs):
         """
         :param  user_id: The email address (for service accounts) or Client ID
                          (for installed apps) to be used for authentication.
@@ -1830,6 +2218,24 @@ class GCENodeDriver(NodeDriver):
         :keyword  credential_file: Path to file for caching authentication
                                    information used by GCEConnection.
         :type     credential_file: ``str``
+
+        :keyword  location_cache_file: Path to file for caching the zone and
+                                       region catalogues between processes.
+                                       Disabled by default.
+        :type     location_cache_file: ``str``
+
+        :keyword  location_cache_ttl: How long (in seconds) the zone and
+                                      region catalogues are cached for.
+        :type     location_cache_ttl: ``int``
+
+        :keyword  image_index_ttl: How long (in seconds) the image indexes
+                                   used to resolve image names are cached
+                                   for.
+        :type     image_index_ttl: ``int``
+
+        :keyword  volume_index_ttl: How long (in seconds) the disk details
+                                    used to build nodes are cached for.
+        :type     volume_index_ttl: ``int``
         """
         if not project:
             raise ValueError('Project name must be specified using '
@@ -1841,34 +2247,108 @@ class GCENodeDriver(NodeDriver):
         self.credential_file = credential_file or \
             GoogleOAuth2Credential.default_credential_file + '.' + self.project
 
+        self.location_cache_file = location_cache_file
+        self.location_cache_ttl = location_cache_ttl
+        self.image_index_ttl = image_index_ttl
+        self.volume_index_ttl = volume_index_ttl
+
         super(GCENodeDriver, self).__init__(user_id, key, **kwargs)
 
-        # Cache Zone and Region information to reduce API calls and
-        # increase speed
         self.base_path = '/compute/%s/projects/%s' % (API_VERSION,
                                                       self.project)
-        self.zone_list = self.ex_list_zones()
-        self.zone_dict = {}
-        for zone in self.zone_list:
-            self.zone_dict[zone.name] = zone
-        if datacenter:
-            self.zone = self.ex_get_zone(datacenter)
-        else:
-            self.zone = None
 
-        self.region_list = self.ex_list_regions()
-        self.region_dict = {}
-        for region in self.region_list:
-            self.region_dict[region.name] = region
+        # Zone and Region information is cached to reduce API calls and
+        # increase speed. It's only loaded once it's first used.
+        self._zone_list = None
+        self._zone_dict = None
+        self._region_list = None
+        self._region_dict = None
 
-        if self.zone:
-            self.region = self._get_region_from_zone(self.zone)
-        else:
-            self.region = None
+        self._datacenter = datacenter
+        self._zone = None
+        self._region = None
+
+        self._operation_waiter = None
+        self._operation_waiter_lock = threading.Lock()
 
-        # Volume details are looked up in this name-zone dict.
-        # It is populated if the volume name is not found or the dict is empty.
+        # Volume details are looked up in this name-zone dict. Missing disks
+        # are fetched one by one (or zone by zone when listing nodes) and the
+        # whole dict is dropped once it's older than volume_index_ttl.
         self._ex_volume_dict = {}
+        self._ex_volume_dict_zones = set()
+        self._ex_volume_dict_expires = None
+
+    @property
+    def zone(self):
+        if self._zone is None and self._datacenter:
+            self._zone = self.ex_get_zone(self._datacenter)
+            self._datacenter = None
+
+        return self._zone
+
+    @zone.setter
+    def zone(self, zone):
+        self._zone = zone
+        self._datacenter = None
+        self._region = None
+
+    @property
+    def region(self):
+        if self._region is None and self.zone:
+            self._region = self._get_region_from_zone(self.zone)
+
+        return self._region
+
+    @region.setter
+    def region(self, region):
+        self._region = region
+
+    @property
+    def operation_waiter(self):
+        """
+        Operation waiter shared by everything using this driver.
+
+        :rtype: :class:`GCEOperationWaiter`
+        """
+        with self._operation_waiter_lock:
+            if self._operation_waiter is None:
+                self._operation_waiter = GCEOperationWaiter(self.connection)
+
+        return self._operation_waiter
+
+    @property
+    def zone_list(self):
+        if self._zone_list is None:
+            items = self._get_location_catalog('zones')
+            zone_list = [self._to_zone(z) for z in items]
+            self._zone_dict = dict((z.name, z) for z in zone_list)
+            self._zone_list = zone_list
+
+        return self._zone_list
+
+    @property
+    def zone_dict(self):
+        if self._zone_dict is None:
+            self.zone_list
+
+        return self._zone_dict
+
+    @property
+    def region_list(self):
+        if self._region_list is None:
+            items = self._get_location_catalog('regions')
+            region_list = [self._to_region(r) for r in items]
+            self._region_dict = dict((r.name, r) for r in region_list)
+            self._region_list = region_list
+
+        return self._region_list
+
+    @property
+    def region_dict(self):
+        if self._region_dict is None:
+            self.region_list
+
+        return self._region_dict
 
     def ex_add_access_config(self, node, name, nic, nat_ip=None,
                              config_type=None):
@@ -2010,6 +2490,7 @@ class GCENodeDriver(NodeDriver):
         body = {'labels': labels, 'labelFingerprint': current_fp}
         request = '/global/%s/setLabels' % (image.name)
         self.connection.async_request(request, method='POST', data=body)
+        self._invalidate_image_index()
         return True
 
     def ex_get_serial_output(self, node):
@@ -2501,7 +2982,8 @@ class GCENodeDriver(NodeDriver):
             # The aggregated response returns a dict for each zone
             if zone is None:
                 # Create volume cache now for fast lookups of disk info.
-                self._ex_populate_volume_dict()
+                if ex_use_disk_cache and not self.lazy_extra:
+                    self._ex_prepare_volume_dict()
                 for v in response['items'].values():
                     for i in v.get('instances', []):
                         try:
@@ -2519,6 +3001,8 @@ class GCENodeDriver(NodeDriver):
                         except ResourceNotFoundError:
                             pass
             else:
+                if ex_use_disk_cache and not self.lazy_extra:
+                    self._ex_prepare_volume_dict(zone.name)
                 for i in response['items']:
                     try:
                         list_nodes.append(
@@ -2533,8 +3017,6 @@ class GCENodeDriver(NodeDriver):
                     # other nodes.
                     except ResourceNotFoundError:
                         pass
-        # Clear the volume cache as lookups are complete.
-        self._ex_volume_dict = {}
         return list_nodes
 
     def ex_list_regions(self):
@@ -3481,6 +3963,7 @@ class GCENodeDriver(NodeDriver):
             if not use_existing:
                 raise e
 
+        self._invalidate_image_index()
         return self.ex_get_image(name)
 
     def ex_copy_image(self, name, url, description=None, family=None,
@@ -3531,6 +4014,7 @@ class GCENodeDriver(NodeDriver):
 
         request = '/global/images'
         self.connection.async_request(request, method='POST', data=image_data)
+        self._invalidate_image_index()
         return self.ex_get_image(name)
 
     def ex_create_instancegroup(self, name, zone, description=None,
@@ -4857,10 +5341,14 @@ class GCENodeDriver(NodeDriver):
             description=None, ex_can_ip_forward=None, ex_disks_gce_struct=None,
             ex_nic_gce_struct=None, ex_on_host_maintenance=None,
             ex_automatic_restart=None, ex_image_family=None,
-            ex_preemptible=None, ex_labels=None, ex_disk_size=None):
+            ex_preemptible=None, ex_labels=None, ex_disk_size=None,
+            max_workers=DEFAULT_MAX_WORKERS):
         """
         Create multiple nodes and return a list of Node objects.
 
+        The insert requests are sent and the resulting operations are polled
+        concurrently using a pool of at most ``max_workers`` threads.
+
         Nodes will be named with the base name and a number.  For example, if
         the base name is 'libcloud' and you create 3 nodes, they will be
         named::
@@ -5004,6 +5492,9 @@ class GCENodeDriver(NodeDriver):
                                 Integer in gigabytes.
         :type     ex_disk_size: ``int`` or ``None``
 
+        :keyword  max_workers: Maximum number of concurrent requests.
+        :type     max_workers: ``int``
+
         :return:  A list of Node objects for the new nodes.
         :rtype:   ``list`` of :class:`Node`
 
@@ -5066,25 +5557,36 @@ class GCENodeDriver(NodeDriver):
             status = {'name': name, 'node_response': None, 'node': None}
             status_list.append(status)
 
-        start_time = time.time()
-        complete = False
-        while not complete:
-            if (time.time() - start_time >= timeout):
+        def create_node(status):
+            self._multi_create_node(status, node_attrs)
+
+        def get_node(status):
+            self._multi_get_node(status, node_attrs)
+
+        # Send all the insert requests before waiting for the operations
+        self._multi_run_concurrently(create_node, status_list,
+                                     max_workers=max_workers)
+
+        # The insert operations are polled by the loop shared by all the
+        # users of this driver
+        pending = [status for status in status_list if not status['node']]
+        for status in pending:
+            status['node_future'] = self.operation_waiter.submit(
+                status['node_response'], timeout=timeout,
+                poll_interval=poll_interval)
+
+        for status in pending:
+            try:
+                status['node_future'].result()
+            except GoogleBaseError:
+                # Failed operations are handled by _multi_get_node
+                pass
+            except GCEOperationTimeoutError:
                 raise Exception("Timeout (%s sec) while waiting for multiple "
-                                "instances")
-            complete = True
-            time.sleep(poll_interval)
-            for status in status_list:
-                # Create the node or check status if already in progress.
-                if not status['node']:
-                    if not status['node_response']:
-                        self._multi_create_node(status, node_attrs)
-                    else:
-                        self._multi_check_node(status, node_attrs)
-                # If any of the nodes have not been created (or failed) we are
-                # not done yet.
-                if not status['node']:
-                    complete = False
+                                "instances" % (timeout))
+
+        self._multi_run_concurrently(get_node, pending,
+                                     max_workers=max_workers)
 
         # Return list of nodes
         node_list = []
@@ -6465,6 +6967,7 @@ class GCENodeDriver(NodeDriver):
 
         request = '/global/images/%s' % (image.name)
         self.connection.async_request(request, method='DELETE')
+        self._invalidate_image_index()
         return True
 
     def ex_deprecate_image(self, image, replacement, state=None,
@@ -6531,6 +7034,7 @@ class GCENodeDriver(NodeDriver):
         request = '/global/images/%s/deprecate' % (image.name)
 
         self.connection.request(request, method='POST', data=image_data).object
+        self._invalidate_image_index()
 
         return True
 
@@ -6745,9 +7249,48 @@ class GCENodeDriver(NodeDriver):
             node.extra['boot_disk'].destroy()
         return True
 
+    def create_nodes(self, count, name, size, image, location=None,
+                     max_workers=DEFAULT_MAX_WORKERS, **kwargs):
+        """
+        Create multiple nodes.
+
+        The nodes are named with the base name and a number (``<name>-000``,
+        ``<name>-001``, ...).
+
+        See also :meth:`NodeDriver.create_nodes` and
+        :meth:`ex_create_multiple_nodes` for the additional keyword arguments.
+
+        :return:  A list of Node objects for the new nodes.
+        :rtype:   ``list`` of :class:`Node`
+        """
+        return self.ex_create_multiple_nodes(base_name=name, size=size,
+                                             image=image, number=count,
+                                             location=location,
+                                             max_workers=max_workers,
+                                             **kwargs)
+
+    def destroy_nodes(self, nodes, max_workers=None):
+        """
+        Destroy multiple nodes. All the delete requests are issued first and
+        the resulting operations are then waited for together.
+
+        See also :meth:`NodeDriver.destroy_nodes` and
+        :meth:`ex_destroy_multiple_nodes`.
+
+        :return:  A list of boolean values.  One for each node.  True means
+                  that the node was successfully destroyed.
+        :rtype:   ``list`` of ``bool``
+        """
+        if max_workers is None:
+            max_workers = DEFAULT_MAX_WORKERS
+
+        return self.ex_destroy_multiple_nodes(node_list=nodes,
+                                              max_workers=max_workers)
+
     def ex_destroy_multiple_nodes(self, node_list, ignore_errors=True,
                                   destroy_boot_disk=False, poll_interval=2,
-                                  timeout=DEFAULT_TASK_COMPLETION_TIMEOUT):
+                                  timeout=DEFAULT_TASK_COMPLETION_TIMEOUT,
+                                  max_workers=DEFAULT_MAX_WORKERS):
         """
         Destroy multiple nodes at once.
 
@@ -6769,13 +7312,32 @@ class GCENodeDriver(NodeDriver):
                            destroyed.
         :type     timeout: ``int``
 
+        :keyword  max_workers: Maximum number of nodes which are waited for
+                               concurrently.
+        :type     max_workers: ``int``
+
         :return:  A list of boolean values.  One for each node.  True means
                   that the node was successfully destroyed.
         :rtype:   ``list`` of ``bool``
         """
+        end_time = time.time() + timeout
+
+        def wait_for_operation(operation):
+            # Return True if the operation completed without errors
+            future = self.operation_waiter.submit(
+                operation, timeout=max(end_time - time.time(), 0),
+                poll_interval=poll_interval)
+            try:
+                future.result()
+            except GoogleBaseError:
+                self._catch_error(ignore_errors=ignore_errors)
+                return False
+            except GCEOperationTimeoutError:
+                raise Exception("Timeout (%s sec) while waiting to delete "
+                                "multiple instances" % (timeout))
+            return True
+
         status_list = []
-        complete = False
-        start_time = time.time()
         for node in node_list:
             request = '/zones/%s/instances/%s' % (node.extra['zone'].name,
                                                   node.name)
@@ -6791,58 +7353,41 @@ class GCENodeDriver(NodeDriver):
                       'node_response': response,
                       'disk_success': not destroy_boot_disk,
                       'disk_response': None}
-
             status_list.append(status)
 
-        while not complete:
-            if (time.time() - start_time >= timeout):
-                raise Exception("Timeout (%s sec) while waiting to delete "
-                                "multiple instances")
-            complete = True
-            for status in status_list:
-                # If one of the operations is running, check the status
-                operation = status['node_response'] or status['disk_response']
-                delete_disk = False
-                if operation:
-                    no_errors = True
-                    try:
-                        response = self.connection.request(operation[
-                            'selfLink']).object
-                    except GoogleBaseError:
-                        self._catch_error(ignore_errors=ignore_errors)
-                        no_errors = False
-                        response = {'status': 'DONE'}
-                    if response['status'] == 'DONE':
-                        # If a node was deleted, update status and indicate
-                        # that the disk is ready to be deleted.
-                        if status['node_response']:
-                            status['node_response'] = None
-                            status['node_success'] = no_errors
-                            delete_disk = True
-                        else:
-                            status['disk_response'] = None
-                            status['disk_success'] = no_errors
-                # If we are destroying disks, and the node has been deleted,
-                # destroy the disk.
-                if delete_disk and destroy_boot_disk:
-                    boot_disk = status['node'].extra['boot_disk']
-                    if boot_disk:
-                        request = '/zones/%s/disks/%s' % (
-                            boot_disk.extra['zone'].name, boot_disk.name)
-                        try:
-                            response = self.connection.request(
-                                request, method='DELETE').object
-                        except GoogleBaseError:
-                            self._catch_error(ignore_errors=ignore_errors)
-                            no_errors = False
-                            response = None
-                        status['disk_response'] = response
-                    else:  # If there is no boot disk, ignore
-                        status['disk_success'] = True
-                operation = status['node_response'] or status['disk_response']
-                if operation:
-                    time.sleep(poll_interval)
-                    complete = False
+        def destroy_node(status):
+            if not status['node_response']:
+                return
+
+            status['node_success'] = wait_for_operation(
+                status['node_response'])
+            status['node_response'] = None
+
+            # If we are destroying disks, and the node has been deleted,
+            # destroy the disk.
+            if not destroy_boot_disk:
+                return
+
+            boot_disk = status['node'].extra['boot_disk']
+            if not boot_disk:
+                # If there is no boot disk, ignore
+                status['disk_success'] = True
+                return
+
+            request = '/zones/%s/disks/%s' % (
+                boot_disk.extra['zone'].name, boot_disk.name)
+            try:
+                response = self.connection.request(
+                    request, method='DELETE').object
+            except GoogleBaseError:
+                self._catch_error(ignore_errors=ignore_errors)
+                return
+
+            status['disk_success'] = wait_for_operation(response)
+
+        # The operations of all the nodes are polled from the waiter loop
+        self._multi_run_concurrently(destroy_node, status_list,
+                                     max_workers=max_workers)
 
         success = []
         for status in status_list:
@@ -6946,6 +7491,7 @@ class GCENodeDriver(NodeDriver):
         request = '/zones/%s/disks/%s' % (volume.extra['zone'].name,
                                           volume.name)
         self.connection.async_request(request, method='DELETE')
+        self._ex_discard_volume(volume.name, volume.extra['zone'].name)
         return True
 
     def destroy_volume_snapshot(self, snapshot):
@@ -7167,6 +7713,14 @@ class GCENodeDriver(NodeDriver):
         """
 
         def _try_image_family(image_family, project=None):
+            # Use the image index if it's already loaded for the project
+            index = self._get_image_index(project or self.project,
+                                          cached_only=True)
+            if index is not None:
+                item = index.get_family(image_family)
+                if item:
+                    return self._to_node_image(item)
+
             request = '/global/images/family/%s' % (image_family)
             save_request_path = self.connection.request_path
             if project:
@@ -7417,8 +7971,10 @@ class GCENodeDriver(NodeDriver):
         """
         Return a Volume object based on a volume name and optional zone.
 
-        To improve performance, we request all disks and allow the user
-        to consult the cache dictionary rather than making an API call.
+        To improve performance, disks which were already fetched (e.g. by
+        :meth:`list_nodes`) are kept in a cache dictionary for
+        ``volume_index_ttl`` seconds which can be consulted rather than
+        making an API call.
 
         :param    name: The name of the volume
         :type     name: ``str``
@@ -7429,25 +7985,28 @@ class GCENodeDriver(NodeDriver):
                         or ``None``
 
         :keyword  use_cache: Search for the volume in the existing cache of
-                             volumes.  If True, we omit the API call and search
-                             self.volumes_dict.  If False, a call to
-                             disks/aggregatedList is made prior to searching
-                             self._ex_volume_dict.
+                             volumes.  If True, only volumes missing from
+                             self._ex_volume_dict are fetched.  If False, the
+                             volume is always fetched (using
+                             disks/aggregatedList if no zone is given).
         :type     use_cache: ``bool``
 
         :return:  A StorageVolume object for the volume
         :rtype:   :class:`StorageVolume`
         """
-        if not self._ex_volume_dict or use_cache is False:
-            # Make the API call and build volume dictionary
-            self._ex_populate_volume_dict()
-
         try:
             # if zone is of class GCEZone or NodeLocation, get name instead
             zone = zone.name
         except AttributeError:
             pass
 
+        if use_cache is False:
+            if zone is None or zone == 'all':
+                self._ex_populate_volume_dict()
+            else:
+                volume = self._ex_fetch_volume(name, zone)
+                return self._to_storage_volume(volume)
+
         return self._ex_lookup_volume(name, zone)
 
     def ex_get_region(self, name):
@@ -7741,6 +8300,15 @@ class GCENodeDriver(NodeDriver):
         :return:  A StorageVolume object for the volume.
         :rtype:   :class:`StorageVolume` or raise ``ResourceNotFoundError``.
         """
+        self._ex_expire_volume_dict()
+
+        if zone is not None and zone != 'all':
+            # Only the missing disk is fetched when the zone is known
+            volume = self._ex_volume_dict.get(volume_name, {}).get(zone)
+            if volume is None:
+                volume = self._ex_fetch_volume(volume_name, zone)
+            return self._to_storage_volume(volume)
+
         if volume_name not in self._ex_volume_dict:
             # Possibly added through another thread/process, so re-populate
             # _volume_dict and try again.  If still not found, raise exception.
@@ -7752,31 +8320,136 @@ class GCENodeDriver(NodeDriver):
         # Disk names are not unique across zones, so if zone is None or
         # 'all', we return the first one we find for that disk name.  For
         # consistency, we sort by keys and set the zone to the first key.
-        if zone is None or zone == 'all':
-            zone = sorted(self._ex_volume_dict[volume_name])[0]
+        zone = sorted(self._ex_volume_dict[volume_name])[0]
+        return self._to_storage_volume(self._ex_volume_dict[volume_name][zone])
 
-        volume = self._ex_volume_dict[volume_name].get(zone, None)
-        if not volume:
+    def _ex_fetch_volume(self, volume_name, zone):
+        """
+        Fetch a single disk and store it in _ex_volume_dict.
+
+        :param    volume_name: The name of the volume.
+        :type     volume_name: ``str``
+
+        :param    zone: The name of the zone the volume is in.
+        :type     zone: ``str``
+
+        :return:  The disk information as returned by the API.
+        :rtype:   ``dict``
+        """
+        request = '/zones/%s/disks/%s' % (zone, volume_name)
+        try:
+            volume = self.connection.request(request, method='GET').object
+        except ResourceNotFoundError:
+            self._ex_discard_volume(volume_name, zone)
             raise ResourceNotFoundError(
                 'Volume \'%s\' not found for zone %s.' % (volume_name,
                                                           zone), None, None)
-        return self._to_storage_volume(volume)
 
-    def _ex_populate_volume_dict(self):
+        self._ex_expire_volume_dict()
+        self._ex_touch_volume_dict()
+        self._ex_volume_dict.setdefault(volume_name, {})[zone] = volume
+        return volume
+
+    def _ex_prepare_volume_dict(self, zone=None):
+        """
+        Make sure the disks of a zone (or all zones) are in _ex_volume_dict.
+
+        The disks are only listed if they weren't already listed in the last
+        ``volume_index_ttl`` seconds.
+
+        :keyword  zone: The name of the zone or ``None`` for all zones.
+        :type     zone: ``str`` or ``None``
+
+        return:  ``None``
+        """
+        self._ex_expire_volume_dict()
+
+        if 'all' in self._ex_volume_dict_zones or \
+                zone in self._ex_volume_dict_zones:
+            return None
+
+        self._ex_populate_volume_dict(zone)
+        return None
+
+    def _ex_populate_volume_dict(self, zone=None):
         """
-        Fetch the volume information using disks/aggregatedList
-        and store it in _ex_volume_dict.
+        Fetch the volume information using disks/aggregatedList (or the
+        disks list of a single zone) and store it in _ex_volume_dict.
+
+        :keyword  zone: The name of the zone or ``None`` for all zones.
+        :type     zone: ``str`` or ``None``
 
         return:  ``None``
         """
-        # fill the volume dict by making an aggegatedList call to disks.
-        aggregated_items = self.connection.request_aggregated_items(
-            "disks")
+        if zone is None:
+            # fill the volume dict by making an aggegatedList call to disks.
+            aggregated_items = self.connection.request_aggregated_items(
+                "disks")
+        else:
+            aggregated_items = self.connection.request_zonal_items(
+                "disks", [zone])
 
         # _ex_volume_dict is in the format of:
         # { 'disk_name' : { 'zone1': disk, 'zone2': disk, ... }}
-        self._ex_volume_dict = self._build_volume_dict(
-            aggregated_items['items'])
+        volume_dict = self._build_volume_dict(aggregated_items['items'])
+
+        self._ex_expire_volume_dict()
+        if zone is None:
+            # Every zone was listed, so the whole dict can be replaced
+            self._ex_volume_dict = volume_dict
+            self._ex_volume_dict_zones = set(['all'])
+            self._ex_volume_dict_expires = time.time() + \
+                self.volume_index_ttl
+            return None
+
+        self._ex_touch_volume_dict()
+        for name, zones in list(self._ex_volume_dict.items()):
+            # Drop the disks of the zone which have been deleted
+            zones.pop(zone, None)
+            if not zones:
+                del self._ex_volume_dict[name]
+        for name, zones in volume_dict.items():
+            self._ex_volume_dict.setdefault(name, {}).update(zones)
+        self._ex_volume_dict_zones.add(zone)
+
+        return None
+
+    def _ex_discard_volume(self, volume_name, zone):
+        """
+        Remove a single disk from _ex_volume_dict.
+
+        return:  ``None``
+        """
+        zones = self._ex_volume_dict.get(volume_name, {})
+        zones.pop(zone, None)
+        if not zones:
+            self._ex_volume_dict.pop(volume_name, None)
+
+        return None
+
+    def _ex_touch_volume_dict(self):
+        """
+        Start the TTL of _ex_volume_dict if it's empty.
+
+        return:  ``None``
+        """
+        if self._ex_volume_dict_expires is None:
+            self._ex_volume_dict_expires = time.time() + \
+                self.volume_index_ttl
+
+        return None
+
+    def _ex_expire_volume_dict(self):
+        """
+        Clear _ex_volume_dict if it's older than ``volume_index_ttl``.
+
+        return:  ``None``
+        """
+        expires = self._ex_volume_dict_expires
+        if expires is not None and time.time() >= expires:
+            self._ex_volume_dict = {}
+            self._ex_volume_dict_zones = set()
+            self._ex_volume_dict_expires = None
 
         return None
 
@@ -7842,6 +8515,97 @@ class GCENodeDriver(NodeDriver):
         response = self.connection.request(url, method='GET').object
         return GCENodeDriver.KIND_METHOD_MAP[response['kind']](self, response)
 
+    def _get_location_catalog(self, kind):
+        """
+        Return the raw API items for all the zones or regions in the project.
+
+        Items are looked up in the cache shared by all the driver instances
+        for the same project, then in the location cache file (if
+        configured) and only requested from the API if neither of them holds
+        a fresh copy.
+
+        :param  kind: Either 'zones' or 'regions'.
+        :type   kind: ``str``
+
+        :return:  List of zone or region dictionaries.
+        :rtype:   ``list`` of ``dict``
+        """
+        key = (self.project, kind)
+        now = time.time()
+
+        with LOCATION_CACHE_LOCK:
+            cached = LOCATION_CACHE.get(key)
+
+        if cached is None or cached[0] + self.location_cache_ttl < now:
+            cached = self._read_location_cache_file(kind)
+
+        if cached is None or cached[0] + self.location_cache_ttl < now:
+            response = self.connection.request('/%s' % (kind),
+                                               method='GET').object
+            cached = (now, response.get('items', []))
+            self._write_location_cache_file(kind, cached)
+
+        with LOCATION_CACHE_LOCK:
+            LOCATION_CACHE[key] = cached
+
+        return cached[1]
+
+    def _read_location_cache_file(self, kind):
+        """
+        Read the zone or region items from the location cache file.
+
+        :return:  ``(timestamp, items)`` tuple or None
+        :rtype:   ``tuple`` or ``None``
+        """
+        if not self.location_cache_file:
+            return None
+
+        filename = os.path.realpath(
+            os.path.expanduser(self.location_cache_file))
+
+        try:
+            with open(filename, 'r') as fp:
+                data = json.load(fp)
+            entry = data[self.project][kind]
+            return (entry['timestamp'], entry['items'])
+        except (IOError, ValueError, KeyError, TypeError):
+            # Note: A missing or corrupted cache file is not fatal, the items
+            # are simply requested from the API.
+            return None
+
+    def _write_location_cache_file(self, kind, cached):
+        """
+        Store the zone or region items in the location cache file.
+        """
+        if not self.location_cache_file:
+            return
+
+        filename = os.path.realpath(
+            os.path.expanduser(self.location_cache_file))
+
+        # The file is shared by every project and kind, so concurrent
+        # writers must not overwrite each other's entries
+        with lock_file(filename + '.lock'):
+            try:
+                with open(filename, 'r') as fp:
+                    data = json.load(fp)
+                if not isinstance(data, dict):
+                    data = {}
+            except (IOError, ValueError):
+                data = {}
+
+            data.setdefault(self.project, {})[kind] = {
+                'timestamp': cached[0], 'items': cached[1]}
+
+            try:
+                # Concurrent readers never see a partially written file
+                write_file_atomically(filename, json.dumps(data),
+                                      mode=int('644', 8))
+            except (IOError, OSError):
+                # Note: Failure to write the cache file is not fatal, the
+                # items will be requested again by the next process.
+                pass
+
     def _get_region_from_zone(self, zone):
         """
         Return the Region object that contains the given Zone object.
@@ -7920,21 +8684,132 @@ class GCENodeDriver(NodeDriver):
                   if no matching image is found.
         :rtype:   :class:`GCENodeImage` or ``None``
         """
-        project_images_list = self.ex_list(
-            self.list_images, ex_project=project, ex_include_deprecated=True)
+        start = time.time()
+        indexes = self._get_image_indexes(project)
+        image = self._find_image_in_indexes(indexes, partial_name)
+
+        # A cached index doesn't know about images created since it was
+        # built, e.g. by another process, so rebuild it once before giving up
+        stale = [index.project for index in indexes if index.timestamp < start]
+        if image is None and stale:
+            indexes = self._get_image_indexes(project, refresh=stale)
+            image = self._find_image_in_indexes(indexes, partial_name)
+
+        return image
+
+    def _get_image_indexes(self, project, refresh=()):
+        """
+        Return the image indexes of the projects searched by
+        :meth:`_match_images`.
+
+        :keyword  refresh: Names of the projects whose index is rebuilt.
+        :type     refresh: ``list`` of ``str``
+        """
+        if project is None:
+            # Search your own project and all the standard image projects
+            indexes = [self._get_image_index(
+                self.project, refresh=self.project in refresh)]
+            for img_proj in list(self.IMAGE_PROJECTS.keys()):
+                try:
+                    indexes.append(self._get_image_index(
+                        img_proj, refresh=img_proj in refresh))
+                except GoogleBaseError:
+                    # do not break if an OS type is invalid
+                    pass
+        else:
+            if isinstance(project, str):
+                project = [project]
+            indexes = [self._get_image_index(proj, refresh=proj in refresh)
+                       for proj in project]
+
+        return indexes
+
+    def _find_image_in_indexes(self, indexes, partial_name):
+        """
+        Return the image with the exact name, or the latest image whose name
+        starts with partial_name, from the given indexes.
+        """
+        for index in indexes:
+            item = index.get(partial_name)
+            if item:
+                return self._to_node_image(item)
+
         partial_match = []
-        for page in project_images_list.page():
-            for image in page:
-                if image.name == partial_name:
-                    return image
-                if image.name.startswith(partial_name):
-                    ts = timestamp_to_datetime(
-                        image.extra['creationTimestamp'])
-                    if not partial_match or partial_match[0] < ts:
-                        partial_match = [ts, image]
+        for index in indexes:
+            item = index.match(partial_name)
+            if item:
+                ts = timestamp_to_datetime(item['creationTimestamp'])
+                if not partial_match or partial_match[0] < ts:
+                    partial_match = [ts, item]
 
         if partial_match:
-            return partial_match[1]
+            return self._to_node_image(partial_match[1])
+
+    def _get_image_index(self, project, cached_only=False, refresh=False):
+        """
+        Return the image index for a project.
+
+        Indexes are shared by all the driver instances and are rebuilt once
+        they are older than ``image_index_ttl`` seconds.
+
+        :param  project: The name of the project.
+        :type   project: ``str``
+
+        :keyword  cached_only: Return None instead of building the index if
+                               there is no fresh index for the project.
+        :type     cached_only: ``bool``
+
+        :keyword  refresh: Rebuild the index even if it is still fresh.
+        :type     refresh: ``bool``
+
+        :return:  The image index for the project
+        :rtype:   :class:`GCEImageIndex` or ``None``
+        """
+        with IMAGE_INDEX_CACHE_LOCK:
+            index = IMAGE_INDEX_CACHE.get(project)
+
+        if index is not None and not refresh and \
+                not index.is_expired(self.image_index_ttl):
+            return index
+
+        if cached_only:
+            return None
+
+        index = GCEImageIndex(project=project,
+                              items=self._list_image_items(project))
+
+        with IMAGE_INDEX_CACHE_LOCK:
+            IMAGE_INDEX_CACHE[project] = index
+
+        return index
+
+    def _invalidate_image_index(self, project=None):
+        """
+        Drop the cached image index for a project (your own by default).
+        """
+        with IMAGE_INDEX_CACHE_LOCK:
+            IMAGE_INDEX_CACHE.pop(project or self.project, None)
+
+    def _list_image_items(self, project):
+        """
+        Return the raw API items for all the images (including deprecated
+        ones) in a project, following the result pages.
+
+        :param  project: The name of the project.
+        :type   project: ``str``
+
+        :return:  List of image dictionaries
+        :rtype:   ``list`` of ``dict``
+        """
+        # An absolute URL is used instead of swapping the shared
+        # request_path, so other threads can use the connection meanwhile
+        request_path = 'https://www.googleapis.com/compute/%s/projects/%s' \
+            '/global/images' % (API_VERSION, project)
+
+        items = []
+        for response in self.connection._iterate_pages(request_path, 500):
+            items.extend(response.get('items', []))
+        return items
 
     def _set_region(self, region):
         """
@@ -8154,6 +9029,16 @@ class GCENodeDriver(NodeDriver):
         request = '/zones/%s/instances' % (location.name)
         return request, node_data
 
+    def _multi_run_concurrently(self, func, status_list, max_workers):
+        """
+        Call ``func`` for every status dictionary concurrently. The first
+        raised exception is re-raised once all the calls have finished.
+        """
+        for _, exc in run_concurrently(func, status_list,
+                                       max_workers=max_workers):
+            if exc is not None:
+                raise exc
+
     def _multi_create_disk(self, status, node_attrs):
         """Create disk for ex_create_multiple_nodes.
 
@@ -8268,10 +9153,11 @@ class GCENodeDriver(NodeDriver):
             status['node'] = GCEFailedNode(status['name'], error, code)
         status['node_response'] = node_res
 
-    def _multi_check_node(self, status, node_attrs):
-        """Check node status for ex_create_multiple_nodes.
+    def _multi_get_node(self, status, node_attrs):
+        """Get the created node for ex_create_multiple_nodes.
 
         :param  status: Dictionary for holding node/disk creation status.
+                        The insert operation must have completed.
                         (This dictionary is modified by this method)
         :type   status: ``dict``
 
@@ -8281,20 +9167,17 @@ class GCENodeDriver(NodeDriver):
         """
         error = None
         try:
-            response = self.connection.request(status['node_response'][
-                'selfLink']).object
+            status['node_future'].result()
         except GoogleBaseError:
             e = self._catch_error(ignore_errors=node_attrs['ignore_errors'])
             error = e.value
             code = e.code
-            response = {'status': 'DONE'}
-        if response['status'] == 'DONE':
-            status['node_response'] = None
-            if error:
-                status['node'] = GCEFailedNode(status['name'], error, code)
-            else:
-                status['node'] = self.ex_get_node(status['name'],
-                                                  node_attrs['location'])
+        status['node_response'] = None
+        if error:
+            status['node'] = GCEFailedNode(status['name'], error, code)
+        else:
+            status['node'] = self.ex_get_node(status['name'],
+                                              node_attrs['location'])
 
     def _create_vol_req(self, size, name, location=None, snapshot=None,
                         image=None, ex_disk_type='pd-standard'):
@@ -8747,13 +9630,143 @@ class GCENodeDriver(NodeDriver):
         """
         public_ips = []
         private_ips = []
+        for network_interface in node.get('networkInterfaces', []):
+            private_ips.append(network_interface.get('networkIP'))
+            for access_config in network_interface.get('accessConfigs', []):
+                public_ips.append(access_config.get('natIP'))
+
+        size = self._get_components_from_path(node['machineType'])['name']
+
+        if self.lazy_extra:
+            # Looking up the boot disk is deferred until the image or extra is
+            # accessed, whichever comes first
+            boot_disks = []
+
+            def get_boot_disk():
+                if not boot_disks:
+                    boot_disks.append(
+                        self._get_lazy_node_boot_disk(node, use_disk_cache))
+                return boot_disks[0]
+
+            def image_loader():
+                return self._get_node_image_name(node, get_boot_disk())
+
+            def extra_loader():
+                boot_disk = get_boot_disk()
+                image = self._get_node_image_name(node, boot_disk)
+                return self._to_node_extra(node, boot_disk, image)
+
+            # The image of nodes which weren't booted from a disk is known
+            return Node(id=node['id'], name=node['name'],
+                        state=self.NODE_STATE_MAP[node['status']],
+                        public_ips=public_ips, private_ips=private_ips,
+                        driver=self, size=size,
+                        image=self._get_node_image_name(node),
+                        image_loader=(None if node.get('image')
+                                      else image_loader),
+                        extra_loader=extra_loader)
+
+        boot_disk = self._get_node_boot_disk(node, use_disk_cache)
+        image = self._get_node_image_name(node, boot_disk)
+
+        return Node(id=node['id'], name=node['name'],
+                    state=self.NODE_STATE_MAP[node['status']],
+                    public_ips=public_ips, private_ips=private_ips,
+                    driver=self, size=size, image=image,
+                    extra=self._to_node_extra(node, boot_disk, image))
+
+    def _get_node_boot_disk(self, node, use_disk_cache=False):
+        """
+        Return the persistent boot disk of a node.
+
+        :param    node: The dictionary describing the node.
+        :type     node: ``dict``
+
+        :keyword  use_disk_cache: If true, ex_get_volume call will use cache.
+        :type     use_disk_cache: ``bool``
+
+        :rtype:   :class:`StorageVolume` or ``None``
+        """
+        boot_disk = None
+        for disk in node.get('disks', []):
+            if disk.get('boot') and disk.get('type') == 'PERSISTENT':
+                bd = self._get_components_from_path(disk['source'])
+                boot_disk = self.ex_get_volume(
+                    bd['name'], bd['zone'], use_cache=use_disk_cache)
+        return boot_disk
+
+    def _get_lazy_node_boot_disk(self, node, use_disk_cache=False):
+        """
+        Return the persistent boot disk of a node whose lookup has been
+        deferred by :attr:`lazy_extra`.
+
+        :param    node: The dictionary describing the node.
+        :type     node: ``dict``
+
+        :keyword  use_disk_cache: If true, ex_get_volume call will use cache.
+        :type     use_disk_cache: ``bool``
+
+        :rtype:   :class:`StorageVolume` or ``None``
+        """
+        if use_disk_cache:
+            self._ex_prepare_volume_dict(
+                self._get_components_from_path(node['zone'])['name'])
+
+        try:
+            return self._get_node_boot_disk(node, use_disk_cache)
+        except ResourceNotFoundError:
+            # The disk was deleted after the node was listed
+            return None
+
+    def _get_node_image_name(self, node, boot_disk=None):
+        """
+        Return the image name of a node, falling back to the source image of
+        its boot disk.
+
+        :param    node: The dictionary describing the node.
+        :type     node: ``dict``
+
+        :keyword  boot_disk: The boot disk of the node.
+        :type     boot_disk: :class:`StorageVolume` or ``None``
+
+        :rtype:   ``str`` or ``None``
+        """
+        # For the node attributes, use just machine and image names, not full
+        # paths.  Full paths are available in the "extra" dict.
+        image = None
+        if node.get('image'):
+            image = self._get_components_from_path(node['image'])['name']
+        else:
+            if boot_disk and \
+                    hasattr(boot_disk, 'extra') and \
+                    'sourceImage' in boot_disk.extra and \
+                    boot_disk.extra['sourceImage'] is not None:
+                src_image = boot_disk.extra['sourceImage']
+                image = self._get_components_from_path(src_image)['name']
+        return image
+
+    def _to_node_extra(self, node, boot_disk, image):
+        """
+        Build the extra dictionary for a node.
+
+        :param    node: The dictionary describing the node.
+        :type     node: ``dict``
+
+        :param    boot_disk: The boot disk of the node.
+        :type     boot_disk: :class:`StorageVolume` or ``None``
+
+        :param    image: Name of the node image.
+        :type     image: ``str`` or ``None``
+
+        :rtype:   ``dict``
+        """
         extra = {}
 
         extra['status'] = node.get('status', "UNKNOWN")
         extra['statusMessage'] = node.get('statusMessage')
         extra['description'] = node.get('description')
         extra['zone'] = self.ex_get_zone(node['zone'])
-        extra['image'] = node.get('image')
+        extra['image'] = node.get('image') or image
         extra['machineType'] = node.get('machineType')
         extra['disks'] = node.get('disks', [])
         extra['networkInterfaces'] = node.get('networkInterfaces')
@@ -8768,47 +9781,17 @@ class GCENodeDriver(NodeDriver):
         extra['deprecated'] = True if node.get('deprecated', None) else False
         extra['canIpForward'] = node.get('canIpForward')
         extra['serviceAccounts'] = node.get('serviceAccounts', [])
-        extra['scheduling'] = node.get('scheduling', {})
-        extra['boot_disk'] = None
+        extra['boot_disk'] = boot_disk
         extra['labels'] = node.get('labels')
         extra['labelFingerprint'] = node.get('labelFingerprint')
 
-        for disk in extra['disks']:
-            if disk.get('boot') and disk.get('type') == 'PERSISTENT':
-                bd = self._get_components_from_path(disk['source'])
-                extra['boot_disk'] = self.ex_get_volume(
-                    bd['name'], bd['zone'], use_cache=use_disk_cache)
-
         if 'items' in node['tags']:
             tags = node['tags']['items']
         else:
             tags = []
         extra['tags'] = tags
 
-        for network_interface in node.get('networkInterfaces', []):
-            private_ips.append(network_interface.get('networkIP'))
-            for access_config in network_interface.get('accessConfigs', []):
-                public_ips.append(access_config.get('natIP'))
-
-        # For the node attributes, use just machine and image names, not full
-        # paths.  Full paths are available in the "extra" dict.
-        image = None
-        if extra['image']:
-            image = self._get_components_from_path(extra['image'])['name']
-        else:
-            if extra['boot_disk'] and \
-                    hasattr(extra['boot_disk'], 'extra') and \
-                    'sourceImage' in extra['boot_disk'].extra and \
-                    extra['boot_disk'].extra['sourceImage'] is not None:
-                src_image = extra['boot_disk'].extra['sourceImage']
-                image = self._get_components_from_path(src_image)['name']
-            extra['image'] = image
-        size = self._get_components_from_path(node['machineType'])['name']
-
-        return Node(id=node['id'], name=node['name'],
-                    state=self.NODE_STATE_MAP[node['status']],
-                    public_ips=public_ips, private_ips=private_ips,
-                    driver=self, size=size, image=image, extra=extra)
+        return extra
 
     def _to_node_size(self, machine_type):
         """
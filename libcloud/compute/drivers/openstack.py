@@ -31,6 +31,7 @@ from libcloud.utils.py3 import httplib
 from libcloud.utils.py3 import b
 from libcloud.utils.py3 import next
 from libcloud.utils.py3 import urlparse
+from libcloud.utils.py3 import parse_qsl
 
 
 from libcloud.common.openstack import OpenStackBaseConnection
@@ -1212,6 +1213,99 @@ class OpenStack_1_1_NodeDriver(OpenStackNodeDriver):
                                                     None))
         super(OpenStack_1_1_NodeDriver, self).__init__(*args, **kwargs)
 
+    def list_nodes(self, ex_all_tenants=False):
+        """
+        List the nodes in a tenant
+
+        Nova caps the number of servers in a response, the remaining pages
+        are retrieved by following the next links.
+
+        :param ex_all_tenants: List nodes for all the tenants. Note: Your user
+                               must have admin privileges for this
+                               functionality to work.
+        :type ex_all_tenants: ``bool``
+        """
+        return list(self.iterate_nodes(ex_all_tenants=ex_all_tenants))
+
+    def iterate_nodes(self, ex_all_tenants=False, ex_page_size=None):
+        """
+        Return a generator of nodes which are retrieved page by page.
+
+        :param ex_all_tenants: List nodes for all the tenants. Note: Your user
+                               must have admin privileges for this
+                               functionality to work.
+        :type ex_all_tenants: ``bool``
+
+        :param ex_page_size: Maximum number of nodes to retrieve per request.
+                             If not provided, the page size is chosen by the
+                             API.
+        :type ex_page_size: ``int``
+
+        :rtype: ``generator`` of :class:`Node`
+        """
+        params = {}
+        if ex_all_tenants:
+            params = {'all_tenants': 1}
+
+        for response in self._request_pages('/servers/detail', 'servers',
+                                            params=params,
+                                            page_size=ex_page_size):
+            for node in self._to_nodes(response):
+                yield node
+
+    def list_volumes(self):
+        return list(self.iterate_volumes())
+
+    def iterate_volumes(self, ex_page_size=None):
+        """
+        Return a generator of volumes which are retrieved page by page.
+
+        :param ex_page_size: Maximum number of volumes to retrieve per
+                             request. If not provided, the page size is
+                             chosen by the API.
+        :type ex_page_size: ``int``
+
+        :rtype: ``generator`` of :class:`StorageVolume`
+        """
+        for response in self._request_pages('/os-volumes', 'volumes',
+                                            page_size=ex_page_size):
+            for volume in self._to_volumes(response):
+                yield volume
+
+    def list_images(self, location=None, ex_only_active=True):
+        """
+        Lists all active images
+
+        @inherits: :class:`NodeDriver.list_images`
+
+        :param ex_only_active: True if list only active (optional)
+        :type ex_only_active: ``bool``
+        """
+        return list(self.iterate_images(location=location,
+                                        ex_only_active=ex_only_active))
+
+    def iterate_images(self, location=None, ex_only_active=True,
+                       ex_page_size=None):
+        """
+        Return a generator of images which are retrieved page by page.
+
+        @inherits: :class:`NodeDriver.iterate_images`
+
+        :param ex_only_active: True if list only active (optional)
+        :type ex_only_active: ``bool``
+
+        :param ex_page_size: Maximum number of images to retrieve per
+                             request. If not provided, the page size is
+                             chosen by the API.
+        :type ex_page_size: ``int``
+
+        :rtype: ``generator`` of :class:`NodeImage`
+        """
+        for response in self._request_pages('/images/detail', 'images',
+                                            page_size=ex_page_size):
+            for image in self._to_images(response, ex_only_active):
+                yield image
+
     def create_node(self, **kwargs):
         """Create a new node
 
@@ -1279,6 +1373,64 @@ class OpenStack_1_1_NodeDriver(OpenStackNodeDriver):
 
         return self._to_node(server_object)
 
+    def _request_pages(self, action, key, params=None, page_size=None,
+                       connection=None):
+        """
+        Perform a request and yield the response object for each page of
+        results, following the next links until the results are exhausted.
+
+        Nova and Cinder return the next link in ``<key>_links`` and Glance
+        v2 returns it in ``next``. The query of the link (``marker``,
+        ``limit`` and the filters) is used for the following request.
+
+        :param action: Path of the listing.
+        :type action: ``str``
+
+        :param key: Key of the items in the response, e.g. ``servers``.
+        :type key: ``str``
+
+        :param params: Request parameters.
+        :type params: ``dict``
+
+        :param page_size: Value for the ``limit`` parameter. If not provided,
+                          the page size is chosen by the API.
+        :type page_size: ``int``
+
+        :param connection: Connection to use, defaults to ``self.connection``.
+        :type connection: :class:`OpenStackBaseConnection`
+
+        :rtype: ``generator`` of ``dict``
+        """
+        connection = connection or self.connection
+        params = dict(params or {})
+
+        if page_size:
+            params['limit'] = page_size
+
+        while True:
+            response = connection.request(action, params=params).object
+            yield response
+
+            next_url = response.get('next')
+
+            for link in response.get('%s_links' % (key), []):
+                if link.get('rel') == 'next':
+                    next_url = link['href']
+
+            if not next_url:
+                break
+
+            next_params = dict(params)
+            next_params.update(
+                parse_qsl(urlparse.urlparse(next_url).query))
+
+            if next_params == params:
+                # The link doesn't move the marker, stop instead of
+                # requesting the same page forever
+                break
+
+            params = next_params
+
     def _to_images(self, obj, ex_only_active):
         images = []
         for image in obj['images']:
@@ -1690,8 +1842,24 @@ class OpenStack_1_1_NodeDriver(OpenStackNodeDriver):
         return resp
 
     def ex_list_snapshots(self):
-        return self._to_snapshots(
-            self.connection.request('/os-snapshots').object)
+        return list(self.iterate_snapshots())
+
+    def iterate_snapshots(self, ex_page_size=None):
+        """
+        Return a generator of volume snapshots which are retrieved page by
+        page.
+
+        :param ex_page_size: Maximum number of snapshots to retrieve per
+                             request. If not provided, the page size is
+                             chosen by the API.
+        :type ex_page_size: ``int``
+
+        :rtype: ``generator`` of :class:`VolumeSnapshot`
+        """
+        for response in self._request_pages('/os-snapshots', 'snapshots',
+                                            page_size=ex_page_size):
+            for snapshot in self._to_snapshots(response):
+                yield snapshot
 
     def list_volume_snapshots(self, volume):
         return [snapshot for snapshot in self.ex_list_snapshots()
@@ -2573,11 +2741,37 @@ class OpenStack_2_NodeDriver(OpenStack_1_1_NodeDriver):
             raise NotImplementedError(
                 "ex_only_active in list_images is not implemented "
                 "in the OpenStack_2_NodeDriver")
-        response = self.image_connection.request('/v2/images')
-        images = []
-        for image in response.object['images']:
-            images.append(self._to_image(image))
-        return images
+        return list(self.iterate_images())
+
+    def iterate_images(self, location=None, ex_only_active=True,
+                       ex_page_size=None):
+        """
+        Return a generator of images which are retrieved page by page using
+        the V2 Glance API
+
+        @inherits: :class:`OpenStack_1_1_NodeDriver.iterate_images`
+
+        :param ex_page_size: Maximum number of images to retrieve per
+                             request. If not provided, the page size is
+                             chosen by the API.
+        :type ex_page_size: ``int``
+
+        :rtype: ``generator`` of :class:`NodeImage`
+        """
+        if location is not None:
+            raise NotImplementedError(
+                "location in iterate_images is not implemented "
+                "in the OpenStack_2_NodeDriver")
+        if not ex_only_active:
+            raise NotImplementedError(
+                "ex_only_active in iterate_images is not implemented "
+                "in the OpenStack_2_NodeDriver")
+
+        for response in self._request_pages('/v2/images', 'images',
+                                            page_size=ex_page_size,
+                                            connection=self.image_connection):
+            for image in response['images']:
+                yield self._to_image(image)
 
     def ex_update_image(self, image_id, data):
         """
@@ -17,13 +17,52 @@
 Wraps multiple ways to communicate over SSH.
 """
 
-have_paramiko = False
-
 try:
-    import paramiko
-    have_paramiko = True
+    from importlib.util import find_spec
 except ImportError:
-    pass
+    # Python 2
+    find_spec = None
+
+
+def _is_module_available(name):
+    if find_spec is not None:
+        return find_spec(name) is not None
+
+    import imp
+
+    try:
+        imp.find_module(name)
+    except ImportError:
+        return False
+
+    return True
+
+
+# Importing paramiko (and cryptography) accounts for most of the time it takes
+# to import libcloud.compute, so we only check that it's available here and
+# import it once a ParamikoSSHClient is actually used.
+have_paramiko = _is_module_available('paramiko')
+
+
+def _import_paramiko():
+    """
+    Import and return paramiko, or return None if it can't be imported (e.g.
+    because it's installed but broken). ``have_paramiko`` is set to False in
+    that case.
+    """
+    global have_paramiko
+
+    if not have_paramiko:
+        return None
+
+    try:
+        import paramiko
+    except ImportError:
+        have_paramiko = False
+        return None
+
+    return paramiko
+
 
 # Depending on your version of Paramiko, it may cause a deprecation
 # warning on Python 2.6.
@@ -31,9 +70,11 @@ except ImportError:
 
 import os
 import time
+import select
 import subprocess
 import logging
 import warnings
+import threading
 
 from os.path import split as psplit
 from os.path import join as pjoin
@@ -46,6 +87,7 @@ __all__ = [
     'BaseSSHClient',
     'ParamikoSSHClient',
     'ShellOutSSHClient',
+    'SSHClientPool',
 
     'SSHCommandTimeoutError'
 ]
@@ -144,6 +186,32 @@ class BaseSSHClient(object):
         raise NotImplementedError(
             'put not implemented for this ssh client')
 
+    def putfo(self, path, fo, chmod=None, mode='w'):
+        """
+        Upload the content of a file-like object to the remote node.
+
+        The default implementation reads the whole object in memory and
+        passes it to :meth:`put`, clients which support it stream the data
+        instead.
+
+        :type path: ``str``
+        :keyword path: File path on the remote node.
+
+        :type fo: File-like object
+        :keyword fo: Object which is read until EOF.
+
+        :type chmod: ``int``
+        :keyword chmod: chmod file to this after creation.
+
+        :type mode: ``str``
+        :keyword mode: Mode in which the file is opened.
+
+        :return: Full path to the location where a file has been saved.
+        :rtype: ``str``
+        """
+        return self.put(path=path, contents=fo.read(), chmod=chmod,
+                        mode=mode)
+
     def delete(self, path):
         """
         Delete/Unlink a file on the remote node.
@@ -181,6 +249,15 @@ class BaseSSHClient(object):
         raise NotImplementedError(
             'close not implemented for this ssh client')
 
+    def is_connected(self):
+        """
+        Return True if the connection to the remote node has been established
+        and can be reused.
+
+        :rtype: ``bool``
+        """
+        return False
+
     def _get_and_setup_logger(self):
         logger = logging.getLogger('libcloud.compute.ssh')
         path = os.getenv('LIBCLOUD_DEBUG')
@@ -197,15 +274,29 @@ class BaseSSHClient(object):
 class ParamikoSSHClient(BaseSSHClient):
     """
     A SSH Client powered by Paramiko.
+
+    If paramiko is installed but can't be imported, a
+    :class:`MockSSHClient` is returned instead, as if paramiko wasn't
+    installed at all.
     """
 
     # Maximum number of bytes to read at once from a socket
     CHUNK_SIZE = 4096
 
-    # How long to sleep while waiting for command to finish (to prevent busy
-    # waiting)
+    # Maximum number of bytes sent in a single SFTP write request
+    PUT_CHUNK_SIZE = 32768
+
+    # Maximum time to wait for new output before checking if the command has
+    # finished (the wait is interrupted as soon as new output arrives)
     SLEEP_DELAY = 0.2
 
+    def __new__(cls, *args, **kwargs):
+        if _import_paramiko() is None:
+            kwargs.pop('key_material', None)
+            return MockSSHClient(*args, **kwargs)
+
+        return super(ParamikoSSHClient, cls).__new__(cls)
+
     def __init__(self, hostname, port=22, username='root', password=None,
                  key=None, key_files=None, key_material=None, timeout=None):
         """
@@ -232,11 +323,19 @@ class ParamikoSSHClient(BaseSSHClient):
 
         self.key_material = key_material
 
+        import paramiko
+
         self.client = paramiko.SSHClient()
+        self.sftp_client = None
+        self._connected = False
         self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
         self.logger = self._get_and_setup_logger()
 
     def connect(self):
+        if self.is_connected():
+            # Reuse the already established transport
+            return True
+
         conninfo = {'hostname': self.hostname,
                     'port': self.port,
                     'username': self.username,
@@ -264,20 +363,74 @@ class ParamikoSSHClient(BaseSSHClient):
         self.logger.debug('Connecting to server', extra=extra)
 
         self.client.connect(**conninfo)
+        self._connected = True
         return True
 
     def put(self, path, contents=None, chmod=None, mode='w'):
         extra = {'_path': path, '_mode': mode, '_chmod': chmod}
         self.logger.debug('Uploading file', extra=extra)
 
-        sftp = self.client.open_sftp()
+        ak, file_path = self._open_remote_file(path=path, mode=mode)
+        ak.write(contents)
+        if chmod is not None:
+            ak.chmod(chmod)
+        ak.close()
+
+        return file_path
+
+    def putfo(self, path, fo, chmod=None, mode='w'):
+        """
+        Upload the content of a file-like object to the remote node.
+
+        The data is read and sent in chunks of ``PUT_CHUNK_SIZE`` bytes. The
+        writes are pipelined (the client doesn't wait for the server to
+        acknowledge a chunk before sending the next one) which makes the
+        throughput much less dependant on the network latency.
+
+        See also :meth:`BaseSSHClient.putfo`
+        """
+        extra = {'_path': path, '_mode': mode, '_chmod': chmod}
+        self.logger.debug('Uploading file', extra=extra)
+
+        ak, file_path = self._open_remote_file(path=path, mode=mode)
+        ak.set_pipelined(True)
+
+        try:
+            while True:
+                data = fo.read(self.PUT_CHUNK_SIZE)
+
+                if not data:
+                    break
+
+                ak.write(data)
+
+            if chmod is not None:
+                ak.chmod(chmod)
+        finally:
+            # Close waits for all the pending writes to be acknowledged
+            ak.close()
+
+        return file_path
+
+    def _open_remote_file(self, path, mode):
+        """
+        Open a remote file for writing, creating the parent directories if
+        needed.
+
+        :return: ``tuple`` of the opened SFTP file and the full path of the
+                 file.
+        """
+        sftp = self._get_sftp_client()
         # less than ideal, but we need to mkdir stuff otherwise file() fails
         head, tail = psplit(path)
 
         if path[0] == "/":
             sftp.chdir("/")
         else:
-            # Relative path - start from a home directory (~)
+            # Relative path - start from a home directory (~). The SFTP
+            # session is reused so the working directory needs to be reset
+            # first.
+            sftp.chdir(None)
             sftp.chdir('.')
 
         for part in head.split("/"):
@@ -293,36 +446,49 @@ class ParamikoSSHClient(BaseSSHClient):
         cwd = sftp.getcwd()
 
         ak = sftp.file(tail, mode=mode)
-        ak.write(contents)
-        if chmod is not None:
-            ak.chmod(chmod)
-        ak.close()
-        sftp.close()
 
         if path[0] == '/':
             file_path = path
         else:
             file_path = pjoin(cwd, path)
 
-        return file_path
+        return ak, file_path
 
     def delete(self, path):
         extra = {'_path': path}
         self.logger.debug('Deleting file', extra=extra)
 
-        sftp = self.client.open_sftp()
+        sftp = self._get_sftp_client()
         sftp.unlink(path)
-        sftp.close()
         return True
 
-    def run(self, cmd, timeout=None):
+    def run(self, cmd, timeout=None, stdout_handler=None,
+            stderr_handler=None):
         """
         Note: This function is based on paramiko's exec_command()
         method.
 
+        Instead of polling the channel at a fixed interval, this method waits
+        (using ``select``) until new output is available, so output is
+        consumed as soon as it arrives without busy waiting.
+
+        By default the whole output is buffered in memory and returned. For
+        commands which produce a lot of output, ``stdout_handler`` and
+        ``stderr_handler`` can be used to stream the output somewhere else
+        (e.g. ``fp.write`` of an open file) with bounded memory usage. In this
+        case the corresponding returned value is an empty string.
+
         :param timeout: How long to wait (in seconds) for the command to
                         finish (optional).
         :type timeout: ``float``
+
+        :param stdout_handler: Function which is called with every chunk of
+                               stdout data (optional).
+        :type stdout_handler: ``callable``
+
+        :param stderr_handler: Function which is called with every chunk of
+                               stderr data (optional).
+        :type stderr_handler: ``callable``
         """
         extra = {'_cmd': cmd}
         self.logger.debug('Executing command', extra=extra)
@@ -339,6 +505,9 @@ class ParamikoSSHClient(BaseSSHClient):
         stdout = StringIO()
         stderr = StringIO()
 
+        stdout_handler = stdout_handler or stdout.write
+        stderr_handler = stderr_handler or stderr.write
+
         # Create a stdin file and immediately close it to prevent any
         # interactive script from hanging the process.
         stdin = chan.makefile('wb', bufsize)
@@ -354,12 +523,6 @@ class ParamikoSSHClient(BaseSSHClient):
         # which is not ready will block for indefinitely.
         exit_status_ready = chan.exit_status_ready()
 
-        if exit_status_ready:
-            # It's possible that some data is already available when exit
-            # status is ready
-            stdout.write(self._consume_stdout(chan).getvalue())
-            stderr.write(self._consume_stderr(chan).getvalue())
-
         while not exit_status_ready:
             current_time = time.time()
             elapsed_time = (current_time - start_time)
@@ -370,18 +533,28 @@ class ParamikoSSHClient(BaseSSHClient):
 
                 raise SSHCommandTimeoutError(cmd=cmd, timeout=timeout)
 
-            stdout.write(self._consume_stdout(chan).getvalue())
-            stderr.write(self._consume_stderr(chan).getvalue())
+            self._consume_output(chan=chan, stdout_handler=stdout_handler,
+                                 stderr_handler=stderr_handler)
 
             # We need to check the exist status here, because the command could
-            # print some output and exit during this sleep below.
+            # print some output and exit while we are waiting below.
             exit_status_ready = chan.exit_status_ready()
 
             if exit_status_ready:
                 break
 
-            # Short sleep to prevent busy waiting
-            time.sleep(self.SLEEP_DELAY)
+            wait_time = self.SLEEP_DELAY
+
+            if timeout:
+                wait_time = max(min(wait_time, timeout - elapsed_time), 0)
+
+            # Wait until new output is available (or the channel is closed)
+            self._wait_for_output(chan=chan, timeout=wait_time)
+
+        # Output which has been received before the exit status is still
+        # available in the channel buffers
+        self._consume_output(chan=chan, stdout_handler=stdout_handler,
+                             stderr_handler=stderr_handler)
 
         # Receive the exit status code of the command we ran.
         status = chan.recv_exit_status()
@@ -389,7 +562,10 @@ class ParamikoSSHClient(BaseSSHClient):
         stdout = stdout.getvalue()
         stderr = stderr.getvalue()
 
-        extra = {'_status': status, '_stdout': stdout, '_stderr': stderr}
+        duration = time.time() - start_time
+
+        extra = {'_status': status, '_stdout': stdout, '_stderr': stderr,
+                 '_duration': '%.3f' % (duration)}
         self.logger.debug('Command finished', extra=extra)
 
         return [stdout, stderr, status]
@@ -397,9 +573,68 @@ class ParamikoSSHClient(BaseSSHClient):
     def close(self):
         self.logger.debug('Closing server connection')
 
+        if self.sftp_client:
+            self.sftp_client.close()
+            self.sftp_client = None
+
         self.client.close()
+        self._connected = False
         return True
 
+    def is_connected(self):
+        if not self._connected:
+            return False
+
+        transport = self.client.get_transport()
+        return transport is not None and transport.is_active()
+
+    def _get_sftp_client(self):
+        """
+        Return a SFTP session for this connection.
+
+        The session is opened on first use and reused by the subsequent
+        ``put`` and ``delete`` calls.
+        """
+        if self.sftp_client is not None:
+            channel = self.sftp_client.get_channel()
+
+            if channel is None or channel.closed:
+                self.sftp_client = None
+
+        if self.sftp_client is None:
+            self.sftp_client = self.client.open_sftp()
+
+        return self.sftp_client
+
+    def _consume_output(self, chan, stdout_handler, stderr_handler):
+        """
+        Pass stdout and stderr data which is available on the channel to the
+        provided handlers.
+        """
+        stdout = self._consume_stdout(chan).getvalue()
+        if stdout:
+            stdout_handler(stdout)
+
+        stderr = self._consume_stderr(chan).getvalue()
+        if stderr:
+            stderr_handler(stderr)
+
+    def _wait_for_output(self, chan, timeout):
+        """
+        Block until data is available on the channel, the channel is closed
+        or the timeout is reached.
+        """
+        if chan.closed:
+            # A closed channel is always readable, prevent busy waiting
+            time.sleep(timeout)
+            return
+
+        try:
+            select.select([chan], [], [], timeout)
+        except (select.error, ValueError):
+            # Channel has been closed in the mean time
+            pass
+
     def _consume_stdout(self, chan):
         """
         Try to consume stdout data from chan if it's receive ready.
@@ -453,6 +688,7 @@ class ParamikoSSHClient(BaseSSHClient):
         """
         Try to detect private key type and return paramiko.PKey object.
         """
+        import paramiko
 
         for cls in [paramiko.RSAKey, paramiko.DSSKey, paramiko.ECDSAKey]:
             try:
@@ -526,6 +762,10 @@ class ShellOutSSHClient(BaseSSHClient):
     def close(self):
         return True
 
+    def is_connected(self):
+        # A new connection is established for every command
+        return True
+
     def _get_base_ssh_command(self):
         cmd = ['ssh']
 
@@ -564,6 +804,67 @@ class MockSSHClient(BaseSSHClient):
     pass
 
 
+class SSHClientPool(object):
+    """
+    Pool of SSH clients keyed by the remote host, port and username.
+
+    Clients returned by the pool stay connected after a deployment has
+    finished so the following deployments to the same host reuse the
+    established transport and SFTP session instead of opening new ones.
+
+    A client must not be used by multiple threads at the same time.
+    """
+
+    def __init__(self, client_cls=None):
+        """
+        :param client_cls: SSH client class used to create new clients
+                           (defaults to :class:`SSHClient`).
+        :type client_cls: ``type``
+        """
+        self.client_cls = client_cls
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def get_client(self, hostname, port=22, username='root', **kwargs):
+        """
+        Return a pooled client for the provided host and user. A new client
+        is created if there is no client for that host or if its connection
+        has been closed.
+
+        Keep in mind that the returned client might not be connected yet,
+        calling ``connect`` on an already connected client is a no-op.
+
+        :param kwargs: Additional arguments which are passed to the client
+                       constructor (``password``, ``key_files``,
+                       ``timeout``, ...).
+
+        :rtype: :class:`BaseSSHClient`
+        """
+        key = (hostname, port, username)
+
+        with self._lock:
+            client = self._clients.get(key, None)
+
+            if client is None or not client.is_connected():
+                client_cls = self.client_cls or SSHClient
+                client = client_cls(hostname=hostname, port=port,
+                                    username=username, **kwargs)
+                self._clients[key] = client
+
+        return client
+
+    def close(self):
+        """
+        Close all the pooled connections.
+        """
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients = {}
+
+        for client in clients:
+            client.close()
+
+
 SSHClient = ParamikoSSHClient
 if not have_paramiko:
     SSHClient = MockSSHClient
@@ -20,6 +20,7 @@ verification, depending on libcloud.security settings.
 
 import os
 import warnings
+import threading
 import requests
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.poolmanager import PoolManager
@@ -174,9 +175,12 @@ class LibcloudBaseConnection(object):
 class LibcloudConnection(LibcloudBaseConnection):
     timeout = None
     host = None
-    response = None
 
     def __init__(self, host, port, secure=None, **kwargs):
+        # The last response is stored per thread so multiple threads can
+        # issue requests using the same connection
+        self._thread_state = threading.local()
+
         scheme = 'https' if secure is not None and secure else 'http'
         self.host = '{0}://{1}{2}'.format(
             'https' if port == 443 else scheme,
@@ -199,6 +203,17 @@ class LibcloudConnection(LibcloudBaseConnection):
             self.set_http_proxy(proxy_url=proxy_url)
         self.session.timeout = kwargs.get('timeout', 60)
 
+    @property
+    def response(self):
+        """
+        Response to the last request made by the current thread.
+        """
+        return getattr(self._thread_state, 'response', None)
+
+    @response.setter
+    def response(self, value):
+        self._thread_state.response = value
+
     @property
     def verification(self):
         """
@@ -39,7 +39,8 @@ __all__ = [
     'get_size_price',
     'set_pricing',
     'clear_pricing_data',
-    'download_pricing_file'
+    'download_pricing_file',
+    'register_pricing_invalidation_callback'
 ]
 
 # Default URL to the pricing file
@@ -57,6 +58,11 @@ PRICING_DATA = {
 
 VALID_PRICING_DRIVER_TYPES = ['compute', 'storage']
 
+# Functions which are called with (driver_type, driver_name) arguments when
+# the pricing data changes. Both arguments are None if the pricing data for
+# all the drivers has been invalidated.
+PRICING_INVALIDATION_CALLBACKS = []
+
 
 def get_pricing_file_path(file_path=None):
     if os.path.exists(CUSTOM_PRICING_FILE_PATH) and \
@@ -124,6 +130,8 @@ def set_pricing(driver_type, driver_name, pricing):
     """
 
     PRICING_DATA[driver_type][driver_name] = pricing
+    _call_invalidation_callbacks(driver_type=driver_type,
+                                 driver_name=driver_name)
 
 
 def get_size_price(driver_type, driver_name, size_id):
@@ -160,6 +168,7 @@ def invalidate_pricing_cache():
     """
     PRICING_DATA['compute'] = {}
     PRICING_DATA['storage'] = {}
+    _call_invalidation_callbacks(driver_type=None, driver_name=None)
 
 
 def clear_pricing_data():
@@ -185,6 +194,31 @@ def invalidate_module_pricing_cache(driver_type, driver_name):
     if driver_name in PRICING_DATA[driver_type]:
         del PRICING_DATA[driver_type][driver_name]
 
+    _call_invalidation_callbacks(driver_type=driver_type,
+                                 driver_name=driver_name)
+
+
+def register_pricing_invalidation_callback(callback):
+    """
+    Register a function which is called when the pricing data changes
+    (:func:`set_pricing`, :func:`invalidate_pricing_cache` and
+    :func:`invalidate_module_pricing_cache`).
+
+    This allows drivers to cache data which is derived from the pricing.
+
+    :type callback: ``callable``
+    :param callback: Function which is called with ``driver_type`` and
+                     ``driver_name`` keyword arguments. Both are None if the
+                     pricing data for all the drivers has been invalidated.
+    """
+    if callback not in PRICING_INVALIDATION_CALLBACKS:
+        PRICING_INVALIDATION_CALLBACKS.append(callback)
+
+
+def _call_invalidation_callbacks(driver_type, driver_name):
+    for callback in PRICING_INVALIDATION_CALLBACKS:
+        callback(driver_type=driver_type, driver_name=driver_name)
+
 
 def download_pricing_file(file_url=DEFAULT_FILE_URL,
                           file_path=CUSTOM_PRICING_FILE_PATH):
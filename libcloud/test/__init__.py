@@ -15,6 +15,7 @@
 
 import unittest
 import random
+import threading
 import requests
 from libcloud.common.base import Response
 from libcloud.http import LibcloudConnection
@@ -103,6 +104,10 @@ class MockHttp(LibcloudConnection):
     test = None  # TestCase instance which is using this mock
     proxy_url = None
 
+    # requests_mock patches requests globally so mocked requests made by
+    # multiple threads need to be serialized
+    _lock = threading.RLock()
+
     def __init__(self, *args, **kwargs):
         # Load assertion methods into the class, incase people want to assert
         # within a response
@@ -135,7 +140,7 @@ class MockHttp(LibcloudConnection):
         # this is to catch any special chars e.g. ~ in the request. URL
         url = urlquote(url)
 
-        with requests_mock.mock() as m:
+        with self._lock, requests_mock.mock() as m:
             m.register_uri(method, url, text=r_body, reason=r_reason,
                            headers=r_headers, status_code=r_status)
             try:
@@ -152,7 +157,7 @@ class MockHttp(LibcloudConnection):
         headers = self._normalize_headers(headers=headers)
         r_status, r_body, r_headers, r_reason = self._get_request(method, url, body, headers)
 
-        with requests_mock.mock() as m:
+        with self._lock, requests_mock.mock() as m:
             m.register_uri(method, url, text=r_body, reason=r_reason,
                            headers=r_headers, status_code=r_status)
             super(MockHttp, self).prepared_request(
@@ -15,10 +15,15 @@
 """
 Tests for Google Connection classes.
 """
+import base64
 import datetime
 import mock
 import os
+import shutil
 import sys
+import tempfile
+import threading
+import time
 import unittest
 
 try:
@@ -34,17 +39,17 @@ from libcloud.common.google import (GoogleAuthError,
                                     GoogleGCEServiceAcctAuthConnection,
                                     GoogleOAuth2Credential,
                                     GoogleBaseConnection,
+                                    CryptographyJWTSigner,
+                                    JWT_SIGNER_CACHE,
+                                    get_jwt_signer_class,
                                     _utcnow,
                                     _utc_timestamp)
 from libcloud.test import MockHttp, LibcloudTestCase
 from libcloud.utils.py3 import httplib
 
 
-# Skip some tests if PyCrypto is unavailable
-try:
-    from Crypto.Hash import SHA256
-except ImportError:
-    SHA256 = None
+# Skip some tests if neither cryptography nor PyCrypto is available
+SIGNER_CLASS = get_jwt_signer_class()
 
 
 SCRIPT_PATH = os.path.dirname(os.path.realpath(__file__))
@@ -128,6 +133,9 @@ class GoogleTestCase(LibcloudTestCase):
     _write_token_file_patcher = mock.patch(
         'libcloud.common.google.GoogleOAuth2Credential._write_token_to_file')
 
+    _lock_token_file_patcher = mock.patch(
+        'libcloud.common.google.GoogleOAuth2Credential._lock_token_file')
+
     _ia_get_code_patcher = mock.patch(
         'libcloud.common.google.GoogleInstalledAppAuthConnection.get_code',
         return_value=1234
@@ -184,6 +192,65 @@ class GoogleBaseAuthConnectionTest(GoogleTestCase):
         self.assertEqual(new_token['expire_time'], _utc_timestamp(exp))
 
 
+@unittest.skipIf(not CryptographyJWTSigner.is_available(),
+                 'cryptography library unavailable')
+class GoogleServiceAcctAuthConnectionTest(GoogleTestCase):
+    """
+    Tests for GoogleServiceAcctAuthConnection
+    """
+
+    def setUp(self):
+        from cryptography.hazmat.backends import default_backend
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+
+        JWT_SIGNER_CACHE.clear()
+
+        # The key in the fixtures is not a valid key
+        self.private_key = rsa.generate_private_key(
+            public_exponent=65537, key_size=2048, backend=default_backend())
+        self.key = self.private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.TraditionalOpenSSL,
+            encryption_algorithm=serialization.NoEncryption()).decode('utf-8')
+        self.user_id = GCE_PARAMS[0]
+
+    def test_signer_is_shared(self):
+        conn1 = GoogleServiceAcctAuthConnection(self.user_id, self.key)
+        conn2 = GoogleServiceAcctAuthConnection(self.user_id, self.key)
+        conn1.signer_class = conn2.signer_class = CryptographyJWTSigner
+
+        with mock.patch.object(CryptographyJWTSigner, '__init__',
+                               wraps=CryptographyJWTSigner.__init__,
+                               autospec=True) as init:
+            conn1.get_jwt_assertion()
+            conn2.get_jwt_assertion()
+            conn1.get_jwt_assertion()
+
+        # The key is only parsed once
+        self.assertEqual(init.call_count, 1)
+        self.assertEqual(len(JWT_SIGNER_CACHE), 1)
+
+    def test_jwt_assertion_signature(self):
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+
+        conn = GoogleServiceAcctAuthConnection(self.user_id, self.key)
+        conn.signer_class = CryptographyJWTSigner
+        message, signature = conn.get_jwt_assertion().rsplit(b'.', 1)
+
+        claim_set = message.split(b'.')[1]
+        claim_set = json.loads(
+            base64.urlsafe_b64decode(claim_set).decode('utf-8'))
+        self.assertEqual(claim_set['iss'], self.user_id)
+        self.assertEqual(claim_set['exp'] - claim_set['iat'], 3600)
+
+        # Raises InvalidSignature if the signature doesn't match
+        self.private_key.public_key().verify(
+            base64.urlsafe_b64decode(signature), message,
+            padding.PKCS1v15(), hashes.SHA256())
+
+
 class GoogleInstalledAppAuthConnectionTest(GoogleTestCase):
     """
     Tests for GoogleInstalledAppAuthConnection
@@ -273,6 +340,80 @@ class GoogleOAuth2CredentialTest(GoogleTestCase):
         cred.access_token
         self.assertTrue(cred._refresh_token.called)
 
+    def test_init_reuses_token_from_other_process(self):
+        # Another process wrote a token while we were waiting for the lock
+        kwargs = {'auth_type': GoogleAuthType.IA}
+        with mock.patch.object(GoogleOAuth2Credential, '_get_token_from_file',
+                               side_effect=[None, STUB_TOKEN_FROM_FILE]):
+            with mock.patch.object(GoogleInstalledAppAuthConnection,
+                                   'get_new_token') as get_new_token:
+                cred = GoogleOAuth2Credential(*GCE_PARAMS, **kwargs)
+
+        self.assertEqual(cred.token, STUB_TOKEN_FROM_FILE)
+        self.assertFalse(get_new_token.called)
+        self.assertTrue(cred._lock_token_file.called)
+
+    def test_refresh_reuses_token_from_other_process(self):
+        args = list(GCE_PARAMS) + [GoogleAuthType.IA]
+        cred = GoogleOAuth2Credential(*args)
+        cred.oauth2_conn.refresh_token = mock.Mock()
+
+        expired = STUB_UTCNOW - datetime.timedelta(seconds=60)
+        cred.token = {'access_token': 'Access Token!',
+                      'expire_time': _utc_timestamp(expired)}
+
+        self.assertEqual(cred.access_token, 'token_from_file')
+        self.assertFalse(cred.oauth2_conn.refresh_token.called)
+
+        # The file token is about to expire as well, so it's refreshed
+        expiring = STUB_UTCNOW + datetime.timedelta(seconds=60)
+        cred.token = {'access_token': 'Access Token!',
+                      'expire_time': _utc_timestamp(expired)}
+        cred.oauth2_conn.refresh_token.return_value = STUB_REFRESH_TOKEN
+        with mock.patch.object(GoogleOAuth2Credential, '_get_token_from_file',
+                               return_value={
+                                   'access_token': 'token_from_file',
+                                   'expire_time': _utc_timestamp(expiring)}):
+            self.assertEqual(cred.access_token, 'refreshrefresh')
+        cred.oauth2_conn.refresh_token.assert_called_once_with(
+            {'access_token': 'Access Token!',
+             'expire_time': _utc_timestamp(expired)})
+
+    def test_refresh_in_background(self):
+        args = list(GCE_PARAMS) + [GoogleAuthType.GCE]
+        cred = GoogleOAuth2Credential(*args)
+        cred._refresh_token = mock.Mock()
+
+        # The token is still valid but expires within the refresh margin
+        expiring = STUB_UTCNOW + datetime.timedelta(seconds=60)
+        cred.token = {'access_token': 'Access Token!',
+                      'expire_time': _utc_timestamp(expiring)}
+        self.assertEqual(cred.access_token, 'Access Token!')
+
+        cred._refresh_thread.join()
+        cred._refresh_token.assert_called_once_with()
+
+    def test_failed_background_refresh_is_not_retried_immediately(self):
+        args = list(GCE_PARAMS) + [GoogleAuthType.GCE]
+        cred = GoogleOAuth2Credential(*args)
+        cred._refresh_token = mock.Mock(side_effect=GoogleAuthError('down'))
+
+        expiring = STUB_UTCNOW + datetime.timedelta(seconds=60)
+        cred.token = {'access_token': 'Access Token!',
+                      'expire_time': _utc_timestamp(expiring)}
+        self.assertEqual(cred.access_token, 'Access Token!')
+        cred._refresh_thread.join()
+
+        self.assertEqual(cred.access_token, 'Access Token!')
+        self.assertFalse(cred._refresh_thread.is_alive())
+        self.assertEqual(cred._refresh_token.call_count, 1)
+
+        # Refreshes are attempted again after the retry interval
+        cred._refresh_failed_at -= cred.token_refresh_retry_interval
+        self.assertEqual(cred.access_token, 'Access Token!')
+        cred._refresh_thread.join()
+        self.assertEqual(cred._refresh_token.call_count, 2)
+
     def test_auth_connection(self):
         # Test a bogus auth type
         self.assertRaises(GoogleAuthError, GoogleOAuth2Credential, *GCE_PARAMS,
@@ -284,7 +425,7 @@ class GoogleOAuth2CredentialTest(GoogleTestCase):
 
         kwargs = {}
 
-        if SHA256:
+        if SIGNER_CLASS:
             kwargs['auth_type'] = GoogleAuthType.SA
             cred1 = GoogleOAuth2Credential(*GCE_PARAMS_PEM_KEY, **kwargs)
             self.assertTrue(isinstance(cred1.oauth2_conn,
@@ -309,6 +450,51 @@ class GoogleOAuth2CredentialTest(GoogleTestCase):
                                    GoogleGCEServiceAcctAuthConnection))
 
 
+class GoogleOAuth2CredentialTokenFileLockTest(LibcloudTestCase):
+    """
+    Tests for the lock on the credential file, which is mocked in
+    GoogleTestCase.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+
+        # The constructor would request a token
+        self.cred = GoogleOAuth2Credential.__new__(GoogleOAuth2Credential)
+        self.cred.credential_file = os.path.join(self.tmp_dir, 'credentials')
+
+    def test_lock_token_file(self):
+        events = []
+
+        def acquire_token(name):
+            with self.cred._lock_token_file():
+                events.append('%s acquired' % (name))
+                time.sleep(0.05)
+                events.append('%s released' % (name))
+
+        threads = [threading.Thread(target=acquire_token, args=(name,))
+                   for name in ['a', 'b']]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # The lock is held by a single thread at a time
+        self.assertEqual([event.split()[1] for event in events],
+                         ['acquired', 'released', 'acquired', 'released'])
+        self.assertEqual(events[0].split()[0], events[1].split()[0])
+        self.assertTrue(os.path.exists(self.cred.credential_file + '.lock'))
+
+    def test_lock_token_file_unwritable_directory(self):
+        # Failing to create the lock file isn't fatal
+        self.cred.credential_file = os.path.join(self.tmp_dir, 'missing',
+                                                 'credentials')
+
+        with self.cred._lock_token_file():
+            pass
+
+
 class GoogleBaseConnectionTest(GoogleTestCase):
     """
     Tests for GoogleBaseConnection
@@ -13,18 +13,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import sys
+import shutil
 import datetime
+import tempfile
 
 try:
     import simplejson as json
 except ImportError:
     import json
 
+import mock
 from mock import Mock
 
 from libcloud.utils.py3 import httplib
+from libcloud.common.types import LibcloudError
 from libcloud.common.openstack import OpenStackBaseConnection
+from libcloud.common.openstack_identity import AUTH_CACHE
 from libcloud.common.openstack_identity import AUTH_TOKEN_EXPIRES_GRACE_SECONDS
 from libcloud.common.openstack_identity import get_class_for_auth_version
 from libcloud.common.openstack_identity import OpenStackServiceCatalog
@@ -33,6 +39,7 @@ from libcloud.common.openstack_identity import OpenStackIdentity_3_0_Connection
 from libcloud.common.openstack_identity import OpenStackIdentity_3_0_Connection_OIDC_access_token
 from libcloud.common.openstack_identity import OpenStackIdentityUser
 from libcloud.compute.drivers.openstack import OpenStack_1_0_NodeDriver
+from libcloud.compute.drivers.openstack import OpenStack_1_1_NodeDriver
 from libcloud.common.openstack_identity import OpenStackIdentity_2_0_Connection_VOMS
 
 from libcloud.test import unittest
@@ -40,6 +47,7 @@ from libcloud.test import MockHttp
 from libcloud.test.secrets import OPENSTACK_PARAMS
 from libcloud.test.file_fixtures import ComputeFileFixtures
 from libcloud.test.compute.test_openstack import OpenStackMockHttp
+from libcloud.test.compute.test_openstack import OpenStack_1_1_MockHttp
 from libcloud.test.compute.test_openstack import OpenStack_2_0_MockHttp
 
 
@@ -222,6 +230,161 @@ class OpenStackIdentityConnectionTestCase(unittest.TestCase):
         return connection
 
 
+class OpenStackAuthenticationCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        AUTH_CACHE.clear()
+        OpenStack_1_1_NodeDriver.connectionCls.conn_class = \
+            OpenStack_2_0_MockHttp
+        OpenStack_1_1_NodeDriver.connectionCls.auth_url = \
+            'https://auth.api.example.com'
+        OpenStack_2_0_MockHttp.type = None
+
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        AUTH_CACHE.clear()
+        shutil.rmtree(self.tmp_dir)
+
+    def _authenticate(self, *args, **kwargs):
+        """
+        Create a driver, authenticate it and return the number of requests
+        made to the identity service.
+        """
+        args = args or OPENSTACK_PARAMS
+        kwargs.setdefault('ex_force_auth_version', '2.0')
+        kwargs.setdefault('ex_auth_cache', True)
+        driver = OpenStack_1_1_NodeDriver(*args, **kwargs)
+
+        original = OpenStackIdentity_2_0_Connection._authenticate_2_0_with_body
+        with mock.patch.object(OpenStackIdentity_2_0_Connection,
+                               '_authenticate_2_0_with_body', autospec=True,
+                               side_effect=original) as authenticate:
+            driver.connection._populate_hosts_and_request_paths()
+
+        self.assertEqual(driver.connection.auth_token,
+                         'aaaaaaaaaaaa-bbb-cccccccccccccc')
+        return authenticate.call_count, driver
+
+    def test_token_is_shared_between_drivers(self):
+        count, driver1 = self._authenticate()
+        self.assertEqual(count, 1)
+
+        count, driver2 = self._authenticate()
+        self.assertEqual(count, 0)
+        self.assertTrue(driver2.connection.service_catalog is
+                        driver1.connection.service_catalog)
+        self.assertEqual(driver2.connection.host, driver1.connection.host)
+
+        # Different credentials
+        count, _ = self._authenticate(OPENSTACK_PARAMS[0], 'other key')
+        self.assertEqual(count, 1)
+        count, _ = self._authenticate(ex_tenant_name='other')
+        self.assertEqual(count, 1)
+
+        # Cache disabled
+        count, _ = self._authenticate(ex_auth_cache=False)
+        self.assertEqual(count, 1)
+
+    def test_cache_is_disabled_by_default(self):
+        driver = OpenStack_1_1_NodeDriver(*OPENSTACK_PARAMS,
+                                          ex_force_auth_version='2.0')
+        driver.connection._populate_hosts_and_request_paths()
+        self.assertEqual(AUTH_CACHE._entries, {})
+
+    def test_invalid_entries_are_not_cached(self):
+        AUTH_CACHE.put('key', {'auth_token': 'token',
+                               'auth_token_expires': mock.Mock()})
+        AUTH_CACHE.put('key', {'auth_token': None,
+                               'auth_token_expires': datetime.datetime.now()})
+        self.assertEqual(AUTH_CACHE._entries, {})
+
+    def test_expired_token_is_not_shared(self):
+        self._authenticate()
+
+        key = list(AUTH_CACHE._entries.keys())[0]
+        AUTH_CACHE._entries[key]['auth_token_expires'] = \
+            datetime.datetime.utcnow() - datetime.timedelta(seconds=1)
+
+        count, _ = self._authenticate()
+        self.assertEqual(count, 1)
+
+    def test_rejected_token_is_evicted(self):
+        cache_file = os.path.join(self.tmp_dir, 'auth_cache.json')
+        self._authenticate(ex_auth_cache_file=cache_file)
+
+        # The cached token has been revoked
+        key = list(AUTH_CACHE._entries.keys())[0]
+        AUTH_CACHE._entries[key]['auth_token'] = 'revoked'
+        AUTH_CACHE.put(key, AUTH_CACHE._entries[key], cache_file=cache_file)
+
+        servers_detail = OpenStack_1_1_MockHttp._v1_1_slug_servers_detail
+
+        def reject_revoked_token(mock_http, method, url, body, headers):
+            if headers['X-Auth-Token'] == 'revoked':
+                return (httplib.UNAUTHORIZED, '', {},
+                        httplib.responses[httplib.UNAUTHORIZED])
+            return servers_detail(mock_http, method, url, body, headers)
+
+        driver = OpenStack_1_1_NodeDriver(*OPENSTACK_PARAMS,
+                                          ex_force_auth_version='2.0',
+                                          ex_auth_cache_file=cache_file)
+
+        original = OpenStackIdentity_2_0_Connection._authenticate_2_0_with_body
+        with mock.patch.object(OpenStack_1_1_MockHttp,
+                               '_v1_1_slug_servers_detail',
+                               reject_revoked_token):
+            with mock.patch.object(OpenStackIdentity_2_0_Connection,
+                                   '_authenticate_2_0_with_body',
+                                   autospec=True,
+                                   side_effect=original) as authenticate:
+                nodes = driver.list_nodes()
+
+        self.assertEqual(len(nodes), 2)
+        self.assertEqual(authenticate.call_count, 1)
+        self.assertEqual(driver.connection.auth_token,
+                         'aaaaaaaaaaaa-bbb-cccccccccccccc')
+
+        # The new token replaced the rejected one in the cache
+        AUTH_CACHE.clear()
+        self.assertEqual(AUTH_CACHE.get(key, cache_file)['auth_token'],
+                         'aaaaaaaaaaaa-bbb-cccccccccccccc')
+
+    def test_invalidate_keeps_newer_token(self):
+        self._authenticate()
+        key = list(AUTH_CACHE._entries.keys())[0]
+
+        AUTH_CACHE.invalidate(key, auth_token='revoked')
+        self.assertFalse(AUTH_CACHE.get(key) is None)
+
+        AUTH_CACHE.invalidate(key, auth_token='aaaaaaaaaaaa-bbb-cccccccccccccc')
+        self.assertTrue(AUTH_CACHE.get(key) is None)
+
+    def test_token_is_persisted_to_cache_file(self):
+        cache_file = os.path.join(self.tmp_dir, 'auth_cache.json')
+
+        count, _ = self._authenticate(ex_auth_cache_file=cache_file)
+        self.assertEqual(count, 1)
+        self.assertEqual(os.stat(cache_file).st_mode & int('777', 8),
+                         int('600', 8))
+
+        with open(cache_file, 'r') as fp:
+            content = fp.read()
+        self.assertTrue('aaaaaaaaaaaa-bbb-cccccccccccccc' in content)
+        self.assertFalse(OPENSTACK_PARAMS[1] in content)
+
+        # Another process only has the file
+        AUTH_CACHE.clear()
+        count, _ = self._authenticate(ex_auth_cache_file=cache_file)
+        self.assertEqual(count, 0)
+
+        # Corrupted files are ignored
+        AUTH_CACHE.clear()
+        with open(cache_file, 'w') as fp:
+            fp.write('{')
+        count, _ = self._authenticate(ex_auth_cache_file=cache_file)
+        self.assertEqual(count, 1)
+
+
 class OpenStackIdentity_2_0_ConnectionTests(unittest.TestCase):
     def setUp(self):
         mock_cls = OpenStackIdentity_2_0_MockHttp
@@ -619,6 +782,54 @@ class OpenStackServiceCatalogTestCase(unittest.TestCase):
                                          'cloudServersPreprod',
                                          'nova'])
 
+    def test_indexed_lookups_match_entries(self):
+        data = json.loads(self.fixtures.load('_v3__auth_multi_region.json'))
+        catalog = OpenStackServiceCatalog(
+            service_catalog=data['token']['catalog'], auth_version='3.x')
+        entries = catalog.get_entries()
+
+        service_types = sorted(set(e.service_type for e in entries))
+        names = sorted(set(e.service_name for e in entries))
+        regions = sorted(set(endpoint.region for e in entries
+                             for endpoint in e.endpoints))
+
+        self.assertEqual(len(regions), 6)
+        self.assertEqual(catalog.get_service_types(), service_types)
+        self.assertEqual(catalog.get_regions(), regions)
+        self.assertEqual(catalog.get_regions(service_type='placement'), [])
+
+        # Service without endpoints is available in every region
+        self.assertIn('placement', catalog.get_service_types(region='us-west'))
+        self.assertNotIn('compute',
+                         catalog.get_service_types(region='us-west'))
+
+        for service_type in [None] + service_types:
+            for name in [None] + names:
+                expected = [endpoint for e in entries
+                            if service_type in (None, e.service_type) and
+                            name in (None, e.service_name)
+                            for endpoint in e.endpoints]
+                endpoints = catalog.get_endpoints(service_type=service_type,
+                                                  name=name)
+                self.assertEqual(endpoints, expected)
+
+        endpoint = catalog.get_endpoint(service_type='compute', name='nova',
+                                        region='eu-central')
+        self.assertEqual(endpoint.url,
+                         'https://nova.eu-central.example.com/v1')
+
+        endpoint = catalog.get_endpoint(service_type='volumev3',
+                                        region='us-east',
+                                        endpoint_type='internal')
+        self.assertEqual(endpoint.url,
+                         'https://internal.cinderv3.us-east.example.com/v1')
+
+        # Two compute services in RegionOne
+        self.assertRaises(ValueError, catalog.get_endpoint,
+                          service_type='compute', region='RegionOne')
+        self.assertRaises(LibcloudError, catalog.get_endpoint,
+                          service_type='compute', region='invalid')
+
 
 class OpenStackIdentity_2_0_MockHttp(MockHttp):
     fixtures = ComputeFileFixtures('openstack_identity/v2')
@@ -13,12 +13,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import sys
+import pickle
 import unittest
 
 from libcloud.common.base import Connection, ConnectionKey, ConnectionUserAndKey
 from libcloud.common.types import LibcloudError
 from libcloud.compute.base import Node, NodeSize, NodeImage, NodeDriver, StorageVolume
 from libcloud.compute.base import NodeAuthSSHKey, NodeAuthPassword
+from libcloud.compute.base import VolumeSnapshot
 from libcloud.compute.types import StorageVolumeState
 
 
@@ -26,6 +28,10 @@ class FakeDriver(object):
     type = 0
 
 
+class FakeNode(Node):
+    pass
+
+
 class BaseTests(unittest.TestCase):
 
     def test_base_node(self):
@@ -42,9 +48,157 @@ class BaseTests(unittest.TestCase):
     def test_base_storage_volume(self):
         StorageVolume(id="0", name="0", size=10, driver=FakeDriver(), state=StorageVolumeState.AVAILABLE)
 
+    def test_base_objects_use_slots(self):
+        objects = [
+            Node(id=0, name=0, state=0, public_ips=0, private_ips=0,
+                 driver=FakeDriver()),
+            NodeSize(id=0, name=0, ram=0, disk=0, bandwidth=0, price=0,
+                     driver=FakeDriver()),
+            NodeImage(id=0, name=0, driver=FakeDriver()),
+            StorageVolume(id="0", name="0", size=10, driver=FakeDriver()),
+            VolumeSnapshot(id="0", driver=FakeDriver())
+        ]
+
+        for obj in objects:
+            self.assertEqual(type(obj).__dictoffset__, 0)
+            self.assertRaises(AttributeError, setattr, obj, 'foo', 'bar')
+
+        self.assertEqual(objects[0].get_uuid(), objects[0].uuid)
+
+    def test_base_node_extra_loader(self):
+        calls = []
+
+        def extra_loader():
+            calls.append(True)
+            return {'foo': 'bar'}
+
+        node = Node(id=0, name=0, state=0, public_ips=0, private_ips=0,
+                    driver=FakeDriver(), extra_loader=extra_loader)
+        self.assertEqual(calls, [])
+        self.assertEqual(node.extra, {'foo': 'bar'})
+        self.assertEqual(node.extra, {'foo': 'bar'})
+        self.assertEqual(len(calls), 1)
+
+        node = Node(id=0, name=0, state=0, public_ips=0, private_ips=0,
+                    driver=FakeDriver(), extra_loader=extra_loader)
+        node.extra = {'bar': 'baz'}
+        self.assertEqual(node.extra, {'bar': 'baz'})
+        self.assertEqual(len(calls), 1)
+
+    def test_base_node_image_loader(self):
+        calls = []
+
+        def image_loader():
+            calls.append(True)
+            return 'image'
+
+        node = Node(id=0, name=0, state=0, public_ips=0, private_ips=0,
+                    driver=FakeDriver(), image_loader=image_loader)
+        self.assertEqual(calls, [])
+        self.assertEqual(node.image, 'image')
+        self.assertEqual(node.image, 'image')
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(vars(node)['image'], 'image')
+        self.assertFalse('_image_loader' in vars(node))
+
+        node = Node(id=0, name=0, state=0, public_ips=0, private_ips=0,
+                    driver=FakeDriver(), image_loader=image_loader)
+        node.image = 'other'
+        self.assertEqual(node.image, 'other')
+        self.assertEqual(len(calls), 1)
+
+    def test_base_objects_vars(self):
+        size = NodeSize(id=0, name=0, ram=0, disk=0, bandwidth=0, price=0,
+                        driver=FakeDriver())
+        self.assertEqual(sorted(vars(size)),
+                         ['_uuid', 'bandwidth', 'disk', 'driver', 'extra',
+                          'id', 'name', 'price', 'ram'])
+
+        node = Node(id=0, name=0, state=0, public_ips=0, private_ips=0,
+                    driver=FakeDriver(), extra_loader=lambda: {'foo': 'bar'})
+        self.assertEqual(vars(node)['extra'], {'foo': 'bar'})
+        self.assertFalse('_extra_loader' in vars(node))
+
+    def test_base_objects_pickle(self):
+        objects = [
+            Node(id=1, name='node', state=0, public_ips=['1.2.3.4'],
+                 private_ips=[], driver=FakeDriver(),
+                 image_loader=lambda: 'image',
+                 extra_loader=lambda: {'foo': 'bar'}),
+            NodeSize(id=1, name='size', ram=1, disk=2, bandwidth=3, price=4,
+                     driver=FakeDriver(), extra={'foo': 'bar'}),
+            NodeImage(id=1, name='image', driver=FakeDriver(),
+                      extra={'foo': 'bar'}),
+            StorageVolume(id='1', name='volume', size=10,
+                          driver=FakeDriver(), extra={'foo': 'bar'}),
+            VolumeSnapshot(id='1', driver=FakeDriver(), extra={'foo': 'bar'})
+        ]
+
+        for obj in objects:
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                loaded = pickle.loads(pickle.dumps(obj, protocol))
+
+                self.assertTrue(type(loaded) is type(obj))
+                self.assertEqual(loaded.id, obj.id)
+                self.assertEqual(loaded.extra, {'foo': 'bar'})
+
+                if hasattr(obj, 'uuid'):
+                    self.assertEqual(loaded.uuid, obj.uuid)
+
+        node = FakeNode(id=1, name='node', state=0, public_ips=[],
+                        private_ips=[], driver=FakeDriver())
+        node.foo = 'bar'
+
+        loaded = pickle.loads(pickle.dumps(node))
+        self.assertEqual(loaded.name, 'node')
+        self.assertEqual(loaded.foo, 'bar')
+
+    def test_base_node_subclass_without_slots(self):
+        class CustomNode(Node):
+            pass
+
+        node = CustomNode(id=0, name=0, state=0, public_ips=0, private_ips=0,
+                          driver=FakeDriver())
+        node.foo = 'bar'
+        self.assertEqual(node.foo, 'bar')
+
     def test_base_node_driver(self):
         NodeDriver('foo')
 
+    def test_base_node_driver_create_nodes(self):
+        driver = NodeDriver('foo')
+        driver.create_node = lambda **kwargs: Node(
+            id=kwargs['name'], name=kwargs['name'], state=0, public_ips=0,
+            private_ips=0, driver=driver)
+
+        nodes = driver.create_nodes(3, name='web', max_workers=2)
+        self.assertEqual([node.name for node in nodes],
+                         ['web-1', 'web-2', 'web-3'])
+        self.assertEqual(driver.create_nodes(1, name='web')[0].name, 'web')
+
+    def test_base_node_driver_destroy_and_reboot_nodes(self):
+        driver = NodeDriver('foo')
+        nodes = [Node(id=i, name=i, state=0, public_ips=0, private_ips=0,
+                      driver=driver) for i in range(1, 6)]
+
+        driver.destroy_node = lambda node: node.id != '3'
+        driver.reboot_node = lambda node: True
+        self.assertEqual(driver.destroy_nodes(nodes, max_workers=3),
+                         [True, True, False, True, True])
+        self.assertEqual(driver.reboot_nodes(nodes), [True] * 5)
+
+        destroyed = []
+
+        def destroy_node(node):
+            if node.id == '2':
+                raise LibcloudError('failed')
+            destroyed.append(node.id)
+            return True
+
+        driver.destroy_node = destroy_node
+        self.assertRaises(LibcloudError, driver.destroy_nodes, nodes)
+        self.assertEqual(sorted(destroyed), ['1', '3', '4', '5'])
+
     def test_base_connection_key(self):
         ConnectionKey('foo')
 
@@ -19,6 +19,8 @@ from __future__ import with_statement
 import os
 import sys
 import time
+import zlib
+import hashlib
 import unittest
 
 from libcloud.utils.py3 import httplib
@@ -28,9 +30,9 @@ from libcloud.utils.py3 import PY3
 from libcloud.compute.deployment import MultiStepDeployment, Deployment
 from libcloud.compute.deployment import SSHKeyDeployment, ScriptDeployment
 from libcloud.compute.deployment import ScriptFileDeployment, FileDeployment
-from libcloud.compute.base import Node
+from libcloud.compute.base import Node, wait_until_nodes_running
 from libcloud.compute.types import NodeState, DeploymentError, LibcloudError
-from libcloud.compute.ssh import BaseSSHClient
+from libcloud.compute.ssh import BaseSSHClient, have_paramiko
 from libcloud.compute.drivers.rackspace import RackspaceFirstGenNodeDriver as Rackspace
 
 from libcloud.test import MockHttp, XML_HEADERS
@@ -46,6 +48,20 @@ class MockDeployment(Deployment):
         return node
 
 
+class RecordingDeployment(Deployment):
+
+    def __init__(self, fail_node_id=None):
+        self.fail_node_id = fail_node_id
+        self.nodes = []
+
+    def run(self, node, client):
+        if node.id == self.fail_node_id:
+            raise Exception('deployment failed')
+
+        self.nodes.append(node.id)
+        return node
+
+
 class MockClient(BaseSSHClient):
 
     def __init__(self, *args, **kwargs):
@@ -103,6 +119,60 @@ class DeploymentTests(unittest.TestCase):
         self.assertEqual(self.node, fd.run(
             node=self.node, client=MockClient(hostname='localhost')))
 
+    def _file_deployment_client(self, checksum=None):
+        client = MockClient(hostname='localhost')
+        client.uploaded = {}
+        client.commands = []
+
+        def putfo(path, fo, chmod=None, mode='w'):
+            chunks = []
+            while True:
+                chunk = fo.read(1000)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            client.uploaded[path] = b''.join(chunks)
+            return path
+
+        def run(cmd):
+            client.commands.append(cmd)
+            if cmd.startswith('sha256sum'):
+                return '%s  /tmp/target\n' % (checksum), '', 0
+            return '', '', 0
+
+        client.putfo = putfo
+        client.run = run
+        return client
+
+    def test_file_deployment_compress_and_verify_checksum(self):
+        with open(__file__, 'rb') as fp:
+            content = fp.read()
+
+        checksum = hashlib.sha256(content).hexdigest()
+        client = self._file_deployment_client(checksum=checksum)
+
+        fd = FileDeployment(__file__, '/tmp/target dir/target',
+                            compress=True, verify_checksum=True)
+        self.assertEqual(self.node, fd.run(node=self.node, client=client))
+
+        compressed = client.uploaded['/tmp/target dir/target.gz']
+        self.assertTrue(len(compressed) < len(content))
+        self.assertEqual(zlib.decompress(compressed, 16 + zlib.MAX_WBITS),
+                         content)
+        self.assertEqual(client.commands,
+                         ["gzip -d -f '/tmp/target dir/target.gz'",
+                          "sha256sum '/tmp/target dir/target'"])
+
+    def test_file_deployment_checksum_mismatch(self):
+        client = self._file_deployment_client(checksum='0' * 64)
+
+        fd = FileDeployment(__file__, '/tmp/target', verify_checksum=True)
+        self.assertRaisesRegexp(LibcloudError, 'Checksum of the uploaded file',
+                                fd.run, node=self.node, client=client)
+
+        with open(__file__, 'rb') as fp:
+            self.assertEqual(client.uploaded['/tmp/target'], fp.read())
+
     def test_script_deployment(self):
         sd1 = ScriptDeployment(script='foobar', delete=True)
         sd2 = ScriptDeployment(script='foobar', delete=False)
@@ -320,6 +390,77 @@ class DeploymentTests(unittest.TestCase):
         else:
             self.fail('Exception was not thrown')
 
+    def _wait_with_fake_clock(self, **kwargs):
+        """
+        Call wait_until_running with a fake clock which is only advanced by
+        time.sleep and return the list of the slept periods.
+        """
+        clock = [1000.0]
+        periods = []
+
+        def sleep(period):
+            periods.append(period)
+            clock[0] += period
+
+        with patch('libcloud.compute.base.time.sleep', side_effect=sleep):
+            with patch('libcloud.compute.base.time.time',
+                       side_effect=lambda: clock[0]):
+                self.assertRaises(LibcloudError,
+                                  self.driver.wait_until_running,
+                                  nodes=[self.node], **kwargs)
+
+        return periods
+
+    def test_wait_until_running_wait_period_progression(self):
+        RackspaceMockHttp.type = 'TIMEOUT'
+        periods = self._wait_with_fake_clock(wait_period=1, timeout=20,
+                                             backoff=2, max_wait_period=4)
+
+        # Last period is cut short so the deadline isn't exceeded
+        self.assertEqual(periods, [1, 2, 4, 4, 4, 4, 1])
+
+    @patch('libcloud.compute.base.random.uniform', return_value=0.5)
+    def test_wait_until_running_jitter(self, mock_uniform):
+        RackspaceMockHttp.type = 'TIMEOUT'
+        periods = self._wait_with_fake_clock(wait_period=2, timeout=10,
+                                             jitter=0.5)
+
+        mock_uniform.assert_called_with(-0.5, 0.5)
+        self.assertEqual(periods, [3, 3, 3, 1])
+
+    def test_wait_until_nodes_running_multiple_drivers(self):
+        driver2 = Rackspace(*RACKSPACE_PARAMS)
+        driver2.connection._populate_hosts_and_request_paths()
+        RackspaceMockHttp.type = 'MULTIPLE_NODES'
+
+        node1 = Node(id=12345, name='test', state=NodeState.RUNNING,
+                     public_ips=['1.2.3.4'], private_ips=['1.2.3.5'],
+                     driver=self.driver)
+        node2 = Node(id=123456, name='test', state=NodeState.RUNNING,
+                     public_ips=['1.2.3.4'], private_ips=['1.2.3.5'],
+                     driver=driver2)
+
+        with patch.object(driver2, 'wait_until_running',
+                          wraps=driver2.wait_until_running) as mock_wait:
+            nodes = wait_until_nodes_running([node2, node1], wait_period=0.1,
+                                             timeout=0.5)
+
+        mock_wait.assert_called_once_with(nodes=[node2], wait_period=0.1,
+                                          timeout=0.5)
+        self.assertEqual(node2.uuid, nodes[0][0].uuid)
+        self.assertEqual(node1.uuid, nodes[1][0].uuid)
+        self.assertEqual(['67.23.21.34'], nodes[0][1])
+        self.assertEqual(['67.23.21.33'], nodes[1][1])
+
+    def test_wait_until_nodes_running_timeout(self):
+        RackspaceMockHttp.type = 'TIMEOUT'
+        node = Node(id=12345, name='test', state=NodeState.RUNNING,
+                    public_ips=['1.2.3.4'], private_ips=['1.2.3.5'],
+                    driver=self.driver)
+
+        self.assertRaises(LibcloudError, wait_until_nodes_running, [node],
+                          wait_period=0.1, timeout=0.3)
+
     def test_wait_until_running_running_wait_for_multiple_nodes(self):
         RackspaceMockHttp.type = 'MULTIPLE_NODES'
 
@@ -354,6 +495,20 @@ class DeploymentTests(unittest.TestCase):
         else:
             self.fail('Exception was not thrown')
 
+    @unittest.skipIf(not have_paramiko, 'Skipping because paramiko is not available')
+    def test_ssh_client_connect_retries_paramiko_exceptions(self):
+        from paramiko.ssh_exception import AuthenticationException
+
+        mock_ssh_client = Mock()
+        mock_ssh_client.connect = Mock()
+        mock_ssh_client.connect.side_effect = [
+            AuthenticationException('not yet'), None]
+
+        ssh_client = self.driver._ssh_client_connect(
+            ssh_client=mock_ssh_client, wait_period=0, timeout=2)
+        self.assertEqual(mock_ssh_client, ssh_client)
+        self.assertEqual(mock_ssh_client.connect.call_count, 2)
+
     def test_run_deployment_script_success(self):
         task = Mock()
         ssh_client = Mock()
@@ -489,6 +644,191 @@ class DeploymentTests(unittest.TestCase):
         node = self.driver.deploy_node(deploy=Mock())
         self.assertEqual(self.node.id, node.id)
 
+    @patch('libcloud.compute.base.SSHClient')
+    @patch('libcloud.compute.ssh')
+    def test_deploy_node_generated_password(self, mock_ssh_module,
+                                            ssh_client):
+        mock_ssh_module.have_paramiko = True
+
+        # The password is only returned by create_node and not when the
+        # nodes are listed by wait_until_running
+        self.node.extra['password'] = 'secret'
+        self.driver.create_node = Mock(return_value=self.node)
+
+        node = self.driver.deploy_node(deploy=Mock())
+        self.assertEqual(self.node.id, node.id)
+        self.assertEqual(node.extra['password'], 'secret')
+        self.assertEqual(ssh_client.call_args[1]['password'], 'secret')
+
+    @patch('libcloud.compute.base.SSHClient')
+    @patch('libcloud.compute.ssh')
+    def test_deploy_node_ssh_pool(self, mock_ssh_module, ssh_client):
+        self.driver.create_node = Mock(return_value=self.node)
+        mock_ssh_module.have_paramiko = True
+        ssh_pool = Mock()
+
+        node = self.driver.deploy_node(deploy=Mock(), ssh_pool=ssh_pool,
+                                       ssh_username='ubuntu')
+        self.assertEqual(self.node.id, node.id)
+
+        self.assertFalse(ssh_client.called)
+        ssh_pool.get_client.assert_called_once_with(
+            hostname='67.23.21.33', port=22, username='ubuntu', password=None,
+            key_files=None, timeout=10)
+
+        # Pooled connection is left open
+        pooled_client = ssh_pool.get_client.return_value
+        pooled_client.connect.assert_called_once_with()
+        self.assertFalse(pooled_client.close.called)
+
+    def _create_nodes_mock(self, fail_index=None):
+        def create_node(**kwargs):
+            index = int(kwargs['name'].split('-')[-1])
+            if index == fail_index:
+                raise Exception('quota exceeded')
+
+            return Node(id=index, name=kwargs['name'],
+                        state=NodeState.RUNNING, public_ips=['1.2.3.%s' % index],
+                        private_ips=[], driver=self.driver)
+
+        self.driver.create_node = Mock(side_effect=create_node)
+        self.driver.wait_until_running = Mock(
+            side_effect=lambda nodes, **kwargs: [(node, node.public_ips)
+                                                 for node in nodes])
+
+    @patch('libcloud.compute.base.SSHClient')
+    @patch('libcloud.compute.ssh')
+    def test_deploy_nodes_success(self, mock_ssh_module, _):
+        mock_ssh_module.have_paramiko = True
+        self._create_nodes_mock()
+        deploy = RecordingDeployment()
+
+        results = self.driver.deploy_nodes(count=3, name='web', deploy=deploy,
+                                           max_workers=2)
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual([result.node.name for result in results],
+                         ['web-1', 'web-2', 'web-3'])
+        self.assertEqual(self.driver.wait_until_running.call_count, 3)
+
+        for result in results:
+            self.assertTrue(result.success)
+            self.assertEqual(result.ip_addresses, result.node.public_ips)
+            self.assertEqual(result.deployment.nodes, [result.node.id])
+            self.assertTrue(result.create_time is not None)
+            self.assertTrue(result.wait_time is not None)
+            self.assertTrue(result.deploy_time is not None)
+
+        # Every node gets its own copy of the deployment
+        self.assertEqual(deploy.nodes, [])
+
+    @patch('libcloud.compute.base.SSHClient')
+    @patch('libcloud.compute.ssh')
+    def test_deploy_nodes_running_nodes_in_different_order(self,
+                                                           mock_ssh_module,
+                                                           ssh_client):
+        mock_ssh_module.have_paramiko = True
+        self._create_nodes_mock()
+
+        create_node = self.driver.create_node.side_effect
+
+        def create_node_with_password(**kwargs):
+            node = create_node(**kwargs)
+            node.extra['password'] = 'secret-%s' % (node.id)
+            return node
+
+        def list_nodes_reversed(nodes, **kwargs):
+            # Nodes are listed in reverse order and without the password
+            listed = [Node(id=node.id, name=node.name, state=node.state,
+                           public_ips=['5.6.7.%s' % (node.id)],
+                           private_ips=[], driver=self.driver)
+                      for node in reversed(nodes)]
+            return [(node, node.public_ips) for node in listed]
+
+        self.driver.create_node.side_effect = create_node_with_password
+        self.driver.wait_until_running.side_effect = list_nodes_reversed
+
+        results = self.driver.deploy_nodes(count=3, name='web',
+                                           deploy=RecordingDeployment())
+
+        self.assertEqual([result.node.id for result in results],
+                         ['1', '2', '3'])
+        self.assertEqual([result.ip_addresses for result in results],
+                         [['5.6.7.1'], ['5.6.7.2'], ['5.6.7.3']])
+        self.assertEqual([result.deployment.nodes for result in results],
+                         [['1'], ['2'], ['3']])
+
+        for result in results:
+            self.assertTrue(result.success)
+            self.assertEqual(result.node.extra['password'],
+                             'secret-%s' % (result.node.id))
+
+        passwords = dict((call[1]['hostname'], call[1]['password'])
+                         for call in ssh_client.call_args_list)
+        self.assertEqual(passwords, {'5.6.7.1': 'secret-1',
+                                     '5.6.7.2': 'secret-2',
+                                     '5.6.7.3': 'secret-3'})
+
+    @patch('libcloud.compute.base.SSHClient')
+    @patch('libcloud.compute.ssh')
+    def test_deploy_nodes_partial_failure(self, mock_ssh_module, _):
+        mock_ssh_module.have_paramiko = True
+        self._create_nodes_mock(fail_index=2)
+
+        results = self.driver.deploy_nodes(
+            count=4, name='web', deploy=RecordingDeployment(fail_node_id='3'))
+
+        self.assertEqual([result.success for result in results],
+                         [True, False, False, True])
+
+        self.assertTrue(results[1].node is None)
+        self.assertEqual(str(results[1].error), 'quota exceeded')
+
+        self.assertEqual(results[2].node.id, '3')
+        self.assertTrue(isinstance(results[2].error, DeploymentError))
+        self.assertEqual(results[2].error.node.id, '3')
+
+    @patch('libcloud.compute.ssh')
+    def test_deploy_nodes_wait_until_running_failure(self, mock_ssh_module):
+        mock_ssh_module.have_paramiko = True
+        self._create_nodes_mock()
+        self.driver.wait_until_running.side_effect = LibcloudError('Timed out')
+
+        results = self.driver.deploy_nodes(count=2, name='web',
+                                           deploy=RecordingDeployment())
+
+        for result in results:
+            self.assertFalse(result.success)
+            self.assertTrue(isinstance(result.error, DeploymentError))
+            self.assertEqual(result.error.node, result.node)
+            self.assertTrue(result.deploy_time is None)
+
+    @patch('libcloud.compute.base.SSHClient')
+    @patch('libcloud.compute.ssh')
+    def test_deploy_nodes_wait_until_running_partial_failure(self,
+                                                             mock_ssh_module,
+                                                             _):
+        mock_ssh_module.have_paramiko = True
+        self._create_nodes_mock()
+
+        def wait_until_running(nodes, **kwargs):
+            if nodes[0].id == '2':
+                raise LibcloudError('Timed out')
+            return [(node, node.public_ips) for node in nodes]
+
+        self.driver.wait_until_running.side_effect = wait_until_running
+
+        results = self.driver.deploy_nodes(count=3, name='web',
+                                           deploy=RecordingDeployment())
+
+        self.assertEqual([result.success for result in results],
+                         [True, False, True])
+        self.assertTrue(isinstance(results[1].error, DeploymentError))
+        self.assertEqual(results[1].error.node.id, '2')
+        self.assertTrue(results[1].deploy_time is None)
+        self.assertEqual([result.deployment.nodes for result in results
+                          if result.success], [['1'], ['3']])
+
 
 class RackspaceMockHttp(MockHttp):
     fixtures = ComputeFileFixtures('openstack')
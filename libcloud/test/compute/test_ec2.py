@@ -20,7 +20,12 @@ import sys
 from datetime import datetime
 from libcloud.utils.iso8601 import UTC
 
-from libcloud.utils.py3 import httplib
+from mock import Mock, patch
+
+import libcloud.pricing
+
+from libcloud.utils.py3 import httplib, ET
+from libcloud.utils.xml import findall, findattr
 
 from libcloud.compute.drivers.ec2 import EC2NodeDriver
 from libcloud.compute.drivers.ec2 import EC2PlacementGroup
@@ -30,8 +35,12 @@ from libcloud.compute.drivers.ec2 import IdempotentParamError
 from libcloud.compute.drivers.ec2 import REGION_DETAILS, VALID_EC2_REGIONS
 from libcloud.compute.drivers.ec2 import ExEC2AvailabilityZone
 from libcloud.compute.drivers.ec2 import EC2NetworkSubnet
+from libcloud.compute.drivers.ec2 import NAMESPACE
+from libcloud.compute.drivers.ec2 import RESOURCE_EXTRA_ATTRIBUTES_MAP
+from libcloud.compute.drivers.ec2 import _get_extra_attributes_plan
 from libcloud.compute.base import Node, NodeImage, NodeSize, NodeLocation
 from libcloud.compute.base import StorageVolume, VolumeSnapshot
+from libcloud.common.exceptions import BaseHTTPError
 from libcloud.compute.types import KeyPairDoesNotExistError, StorageVolumeState, \
     VolumeSnapshotState
 
@@ -87,6 +96,34 @@ class BaseEC2Tests(LibcloudTestCase):
         if unsupported_regions:
             self.fail('Cannot list sizes from ec2 regions: %s' % unsupported_regions)
 
+    def test_get_extra_dict_matches_findtext(self):
+        driver = EC2NodeDriver(*EC2_PARAMS)
+        body = ComputeFileFixtures('ec2').load('describe_instances.xml')
+        elem = ET.XML(body)
+        items = findall(element=elem,
+                        xpath='reservationSet/item/instancesSet/item',
+                        namespace=NAMESPACE)
+        mappings = [RESOURCE_EXTRA_ATTRIBUTES_MAP['node'],
+                    RESOURCE_EXTRA_ATTRIBUTES_MAP['ebs_instance_block_device']]
+
+        for item in items:
+            for mapping in mappings:
+                extra = driver._get_extra_dict(item, mapping)
+
+                for attribute, values in mapping.items():
+                    value = findattr(element=item, xpath=values['xpath'],
+                                     namespace=NAMESPACE)
+                    if value is not None:
+                        value = values['transform_func'](value)
+                    self.assertEqual(extra[attribute], value)
+
+        # Plans are only built once per mapping
+        plan = _get_extra_attributes_plan(mappings[0])
+        self.assertTrue(plan is _get_extra_attributes_plan(mappings[0]))
+        self.assertEqual(dict((a, t) for a, t, _ in plan)['availability'],
+                         ('{%s}placement' % (NAMESPACE),
+                          '{%s}availabilityZone' % (NAMESPACE)))
+
 
 class EC2Tests(LibcloudTestCase, TestCaseMixin):
     image_name = 'ec2-public-images/fedora-8-i386-base-v1.04.manifest.xml'
@@ -139,6 +176,18 @@ class EC2Tests(LibcloudTestCase, TestCaseMixin):
         self.assertEqual(node.extra['tags']['Name'], 'foo')
         self.assertEqual(len(node.extra['tags']), 1)
 
+    def test_create_nodes(self):
+        EC2MockHttp.type = 'create_nodes'
+        image = NodeImage(id='ami-be3adfd7',
+                          name=self.image_name,
+                          driver=self.driver)
+        size = NodeSize('m1.small', 'Small Instance', None, None, None, None,
+                        driver=self.driver)
+        nodes = self.driver.create_nodes(count=3, name='foo', image=image,
+                                         size=size)
+        self.assertEqual([node.id for node in nodes], ['i-2ba64342'])
+        self.assertEqual(nodes[0].name, 'foo')
+
     def test_create_node_with_ex_assign_public_ip(self):
         # assertions are done in _create_ex_assign_public_ip_RunInstances
         EC2MockHttp.type = 'create_ex_assign_public_ip'
@@ -415,6 +464,50 @@ class EC2Tests(LibcloudTestCase, TestCaseMixin):
         ret = self.driver.destroy_node(node)
         self.assertTrue(ret)
 
+    def test_destroy_nodes(self):
+        nodes = [Node(node_id, None, None, None, None, self.driver)
+                 for node_id in ['i-4382922a', 'i-unknown', 'i-4382922a']]
+        self.driver.INSTANCE_ACTION_BATCH_SIZE = 2
+
+        with patch.object(self.driver.connection, 'request',
+                          wraps=self.driver.connection.request) as request:
+            ret = self.driver.destroy_nodes(nodes)
+
+        self.assertEqual(ret, [True, False, True])
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(request.call_args_list[0][1]['params']['InstanceId.2'],
+                         'i-unknown')
+
+    def test_destroy_nodes_failed_batch(self):
+        nodes = [Node(node_id, None, None, None, None, self.driver)
+                 for node_id in ['i-missing', 'i-4382922a', 'i-4382922a']]
+        self.driver.INSTANCE_ACTION_BATCH_SIZE = 1
+
+        original_request = self.driver.connection.request
+
+        def request(action, params=None, **kwargs):
+            if params['InstanceId.1'] == 'i-missing':
+                raise BaseHTTPError(400, 'InvalidInstanceID.NotFound')
+            return original_request(action, params=params, **kwargs)
+
+        with patch.object(self.driver.connection, 'request',
+                          side_effect=request) as request:
+            self.assertRaises(BaseHTTPError, self.driver.destroy_nodes, nodes)
+
+        # The other batches are still processed
+        self.assertEqual(request.call_count, 3)
+
+    def test_reboot_nodes(self):
+        nodes = [Node(node_id, None, None, None, None, self.driver)
+                 for node_id in ['i-4382922a', 'i-4382922b']]
+
+        with patch.object(self.driver.connection, 'request',
+                          wraps=self.driver.connection.request) as request:
+            ret = self.driver.reboot_nodes(nodes)
+
+        self.assertEqual(ret, [True, True])
+        self.assertEqual(request.call_count, 1)
+
     def test_list_sizes(self):
         region_old = self.driver.region_name
 
@@ -468,6 +561,34 @@ class EC2Tests(LibcloudTestCase, TestCaseMixin):
 
         self.driver.region_name = region_old
 
+    def test_list_sizes_uses_shared_catalog(self):
+        sizes = self.driver.list_sizes()
+
+        with patch.object(self.driver, '_get_size_price') as get_size_price:
+            cached_sizes = self.driver.list_sizes()
+            self.assertFalse(get_size_price.called)
+
+        self.assertEqual([size.id for size in sizes],
+                         [size.id for size in cached_sizes])
+        self.assertTrue(cached_sizes[0].driver is self.driver)
+
+        # Sizes don't share the mutable attributes
+        sizes[0].extra['foo'] = 'bar'
+        self.assertFalse('foo' in self.driver.list_sizes()[0].extra)
+
+    def test_list_sizes_pricing_invalidation(self):
+        size_id = self.driver.list_sizes()[0].id
+
+        libcloud.pricing.set_pricing(driver_type='compute',
+                                     driver_name=self.driver.api_name,
+                                     pricing={size_id: 1.5})
+        try:
+            self.assertEqual(self.driver.list_sizes()[0].price, 1.5)
+        finally:
+            libcloud.pricing.invalidate_pricing_cache()
+
+        self.assertNotEqual(self.driver.list_sizes()[0].price, 1.5)
+
     def test_ex_create_node_with_ex_iam_profile(self):
         iamProfile = {
             'id': 'AIDGPMS9RO4H3FEXAMPLE',
@@ -493,6 +614,17 @@ class EC2Tests(LibcloudTestCase, TestCaseMixin):
         self.assertEqual(node2.extra['iam_profile'], iamProfile['id'])
         self.assertEqual(node3.extra['iam_profile'], iamProfile['id'])
 
+    def test_iterate_images(self):
+        images = list(self.driver.iterate_images())
+        self.assertEqual([image.id for image in images],
+                         ['ami-57ba933a', 'ami-85b2a8ae'])
+
+    def test_ex_iterate_security_groups(self):
+        EC2MockHttp.type = 'paginated'
+        groups = list(self.driver.ex_iterate_security_groups())
+        self.assertEqual(len(groups), 2)
+        self.assertEqual(groups[0].id, 'sg-443d0a12')
+
     def test_list_images(self):
         images = self.driver.list_images()
 
@@ -778,6 +910,89 @@ class EC2Tests(LibcloudTestCase, TestCaseMixin):
         self.assertTrue(node2.id in nodes_elastic_ips2)
         self.assertEqual(nodes_elastic_ips2[node2.id], [])
 
+    def test_list_nodes_lazy_extra(self):
+        nodes = self.driver.list_nodes()
+        self.driver.lazy_extra = True
+        lazy_nodes = self.driver.list_nodes()
+
+        self.assertEqual(len(nodes), len(lazy_nodes))
+
+        for node, lazy_node in zip(nodes, lazy_nodes):
+            self.assertTrue(lazy_node._extra_loader is not None)
+            self.assertEqual(lazy_node.name, node.name)
+            self.assertEqual(lazy_node.public_ips, node.public_ips)
+            self.assertEqual(lazy_node.extra['tags'], node.extra['tags'])
+            self.assertEqual(lazy_node.extra['block_device_mapping'],
+                             node.extra['block_device_mapping'])
+            self.assertEqual(sorted(lazy_node.extra.keys()),
+                             sorted(node.extra.keys()))
+            self.assertTrue(lazy_node._extra_loader is None)
+
+    def test_list_nodes_for_wait_filters_by_instance_id(self):
+        EC2MockHttp.type = 'wait'
+        node1 = Node('i-4382922a', None, None, None, None, self.driver)
+        node2 = Node('i-8474834a', None, None, None, None, self.driver)
+
+        nodes = self.driver._list_nodes_for_wait(
+            nodes=[node1, node2],
+            ex_list_nodes_kwargs={'ex_filters': {'tag:Group': 'VPC Test'}})
+        self.assertEqual(len(nodes), 2)
+
+    def test_list_nodes_for_wait_splits_instance_id_filter(self):
+        nodes = [Node('i-%08d' % (index), None, None, None, None, self.driver)
+                 for index in range(450)]
+
+        def list_nodes(ex_filters):
+            self.assertTrue(len(ex_filters['instance-id']) <= 200)
+            self.assertEqual(ex_filters['tag:Group'], 'VPC Test')
+            return [node for node in nodes
+                    if node.id in ex_filters['instance-id']]
+
+        self.driver.list_nodes = Mock(side_effect=list_nodes)
+
+        result = self.driver._list_nodes_for_wait(
+            nodes=nodes,
+            ex_list_nodes_kwargs={'ex_filters': {'tag:Group': 'VPC Test'}})
+        self.assertEqual(self.driver.list_nodes.call_count, 3)
+        self.assertEqual([node.id for node in result],
+                         [node.id for node in nodes])
+
+    def test_iterate_nodes(self):
+        EC2MockHttp.type = 'paginated'
+        nodes = list(self.driver.iterate_nodes(ex_page_size=5))
+
+        self.assertEqual([node.id for node in nodes],
+                         ['i-4382922c', 'i-4382922a', 'i-8474834a'])
+        self.assertEqual(nodes[0].public_ips, ['1.2.3.8'])
+        self.assertTrue('1.2.3.4' in nodes[1].public_ips)
+
+    def test_iterate_nodes_with_node_ids(self):
+        nodes = list(self.driver.iterate_nodes(ex_node_ids=['i-4382922a']))
+        self.assertEqual(len(nodes), 2)
+
+    def test_list_nodes_many_elastic_ips(self):
+        EC2MockHttp.type = 'many_nodes'
+        _to_addresses = self.driver._to_addresses
+
+        with patch.object(self.driver, '_to_addresses',
+                          side_effect=_to_addresses) as mock_to_addresses:
+            nodes = self.driver.list_nodes()
+
+        # The DescribeAddresses response should only be parsed once,
+        # regardless of the number of nodes
+        self.assertEqual(mock_to_addresses.call_count, 1)
+        self.assertEqual(len(nodes), 500)
+
+        for index, node in enumerate(nodes):
+            self.assertEqual(node.id, 'i-%08x' % (index))
+
+            if index % 5 == 0:
+                self.assertEqual(sorted(node.public_ips),
+                                 ['10.%d.%d.1' % (index // 256, index % 256),
+                                  '10.%d.%d.2' % (index // 256, index % 256)])
+            else:
+                self.assertEqual(node.public_ips, [])
+
     def test_ex_describe_all_addresses(self):
         EC2MockHttp.type = 'all_addresses'
         elastic_ips1 = self.driver.ex_describe_all_addresses()
@@ -875,6 +1090,12 @@ class EC2Tests(LibcloudTestCase, TestCaseMixin):
         result = self.driver.ex_change_node_size(node=node, new_size=size)
         self.assertTrue(result)
 
+    def test_iterate_volumes(self):
+        EC2MockHttp.type = 'paginated'
+        volumes = list(self.driver.iterate_volumes())
+        self.assertEqual([volume.id for volume in volumes],
+                         ['vol-10ae5e2b', 'vol-v24bfh75', 'vol-b6c851ec'])
+
     def test_list_volumes(self):
         volumes = self.driver.list_volumes()
 
@@ -963,6 +1184,12 @@ class EC2Tests(LibcloudTestCase, TestCaseMixin):
         # 2013-08-15T16:22:30.000Z
         self.assertEqual(datetime(2013, 8, 15, 16, 22, 30, tzinfo=UTC), snap.created)
 
+    def test_iterate_snapshots(self):
+        EC2MockHttp.type = 'paginated'
+        snapshots = list(self.driver.iterate_snapshots(owner='self'))
+        self.assertEqual(len(snapshots), 3)
+        self.assertEqual('snap-428abd35', snapshots[0].id)
+
     def test_list_snapshots(self):
         snaps = self.driver.list_snapshots()
 
@@ -1402,6 +1629,14 @@ class EC2MockHttp(MockHttp):
         body = self.fixtures.load('run_instances.xml')
         return (httplib.OK, body, {}, httplib.responses[httplib.OK])
 
+    def _create_nodes_RunInstances(self, method, url, body, headers):
+        self.assertUrlContainsQueryParams(url, {
+            'MinCount': '3',
+            'MaxCount': '3'
+        })
+        body = self.fixtures.load('run_instances.xml')
+        return (httplib.OK, body, {}, httplib.responses[httplib.OK])
+
     def _create_ex_assign_public_ip_RunInstances(self, method, url, body, headers):
         self.assertUrlContainsQueryParams(url, {
             'NetworkInterface.1.AssociatePublicIpAddress': "true",
@@ -1528,6 +1763,78 @@ class EC2MockHttp(MockHttp):
         body = self.fixtures.load('release_address.xml')
         return (httplib.OK, body, {}, httplib.responses[httplib.OK])
 
+    def _wait_DescribeInstances(self, method, url, body, headers):
+        if 'InstanceId.1' in url:
+            raise AssertionError('Unexpected InstanceId param')
+        self.assertUrlContainsQueryParams(url, {
+            'Filter.1.Name': 'tag:Group',
+            'Filter.1.Value.1': 'VPC Test',
+            'Filter.2.Name': 'instance-id',
+            'Filter.2.Value.1': 'i-4382922a',
+            'Filter.2.Value.2': 'i-8474834a'
+        })
+        return self._DescribeInstances(method, url, body, headers)
+
+    def _wait_DescribeAddresses(self, method, url, body, headers):
+        return self._DescribeAddresses(method, url, body, headers)
+
+    def _paginated_DescribeInstances(self, method, url, body, headers):
+        self.assertUrlContainsQueryParams(url, {'MaxResults': '5'})
+
+        if 'NextToken' in url:
+            self.assertUrlContainsQueryParams(
+                url, {'NextToken': 'eyJ2IjoiMiIsImMiOiJ0b2tlbi0yIn0='})
+            body = self.fixtures.load('describe_instances.xml')
+        else:
+            body = self.fixtures.load('describe_instances_next_token.xml')
+        return (httplib.OK, body, {}, httplib.responses[httplib.OK])
+
+    def _paginated_DescribeAddresses(self, method, url, body, headers):
+        return self._DescribeAddresses(method, url, body, headers)
+
+    def _paginated_DescribeVolumes(self, method, url, body, headers):
+        self.assertUrlContainsQueryParams(url, {'MaxResults': '500'})
+        return self._DescribeVolumes(method, url, body, headers)
+
+    def _paginated_DescribeSnapshots(self, method, url, body, headers):
+        self.assertUrlContainsQueryParams(url, {'MaxResults': '1000',
+                                                'Owner.1': 'self'})
+        return self._DescribeSnapshots(method, url, body, headers)
+
+    def _paginated_DescribeSecurityGroups(self, method, url, body, headers):
+        self.assertUrlContainsQueryParams(url, {'MaxResults': '1000'})
+        return self._DescribeSecurityGroups(method, url, body, headers)
+
+    def _many_nodes_DescribeInstances(self, method, url, body, headers):
+        item = ('<item><instanceId>i-%08x</instanceId>'
+                '<instanceState><code>16</code><name>running</name>'
+                '</instanceState>'
+                '<launchTime>2013-12-02T11:58:11.000Z</launchTime></item>')
+        items = ''.join([item % (index) for index in range(500)])
+        body = ('<DescribeInstancesResponse '
+                'xmlns="http://ec2.amazonaws.com/doc/2016-11-15/">'
+                '<reservationSet><item><instancesSet>%s</instancesSet></item>'
+                '</reservationSet></DescribeInstancesResponse>' % (items))
+        return (httplib.OK, body, {}, httplib.responses[httplib.OK])
+
+    def _many_nodes_DescribeAddresses(self, method, url, body, headers):
+        item = ('<item><publicIp>10.%d.%d.%d</publicIp>'
+                '<instanceId>i-%08x</instanceId></item>')
+        items = []
+
+        # Two addresses for every fifth node plus a few unassociated ones
+        for index in range(0, 500, 5):
+            for suffix in (1, 2):
+                items.append(item % (index // 256, index % 256, suffix,
+                                     index))
+
+        items.append('<item><publicIp>10.255.255.1</publicIp></item>')
+        body = ('<DescribeAddressesResponse '
+                'xmlns="http://ec2.amazonaws.com/doc/2016-11-15/">'
+                '<addressesSet>%s</addressesSet>'
+                '</DescribeAddressesResponse>' % (''.join(items)))
+        return (httplib.OK, body, {}, httplib.responses[httplib.OK])
+
     def _all_addresses_DescribeAddresses(self, method, url, body, headers):
         body = self.fixtures.load('describe_addresses_all.xml')
         return (httplib.OK, body, {}, httplib.responses[httplib.OK])
@@ -1782,6 +2089,15 @@ class NimbusTests(EC2Tests):
         ip_addresses = self.driver.ex_describe_addresses_for_node(node)
         self.assertEqual(len(ip_addresses), 0)
 
+    def test_list_nodes_many_elastic_ips(self):
+        # overridden from EC2Tests -- Nimbus doesn't support elastic IPs.
+        EC2MockHttp.type = 'many_nodes'
+        nodes = self.driver.list_nodes()
+        self.assertEqual(len(nodes), 500)
+
+        for node in nodes:
+            self.assertEqual(node.public_ips, [])
+
     def test_ex_describe_addresses(self):
         # overridden from EC2Tests -- Nimbus doesn't support elastic IPs.
         node = Node('i-4382922a', None, None, None, None, self.driver)
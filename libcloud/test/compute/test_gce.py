@@ -16,17 +16,24 @@
 Tests for Google Compute Engine Driver
 """
 
+import os
+import json
+import shutil
 import datetime
 import mock
 import sys
+import tempfile
 import unittest
 
 from libcloud.utils.py3 import httplib
 from libcloud.compute.drivers.gce import (
-    GCENodeDriver, API_VERSION, timestamp_to_datetime, GCEAddress, GCEBackend,
+    GCENodeDriver, API_VERSION, LOCATION_CACHE, IMAGE_INDEX_CACHE,
+    GCEImageIndex, GCEOperationWaiter, GCEOperationTimeoutError,
+    timestamp_to_datetime, GCEAddress, GCEBackend,
     GCEBackendService, GCEFirewall, GCEForwardingRule, GCEHealthCheck,
     GCENetwork, GCENodeImage, GCERoute, GCERegion, GCETargetHttpProxy,
     GCEUrlMap, GCEZone, GCESubnetwork)
+from libcloud.common.types import LibcloudError
 from libcloud.common.google import (GoogleBaseAuthConnection,
                                     ResourceNotFoundError, ResourceExistsError,
                                     GoogleBaseError)
@@ -39,6 +46,9 @@ from libcloud.test.file_fixtures import ComputeFileFixtures
 
 from libcloud.test.secrets import GCE_PARAMS, GCE_KEYWORD_PARAMS
 
+DEBIAN_CLOUD_IMAGES_URL = ('https://www.googleapis.com/compute/%s/projects/'
+                           'debian-cloud/global/images' % (API_VERSION))
+
 
 class GCENodeDriverTest(GoogleTestCase, TestCaseMixin):
     """
@@ -58,6 +68,7 @@ class GCENodeDriverTest(GoogleTestCase, TestCaseMixin):
         kwargs['auth_type'] = 'IA'
         kwargs['datacenter'] = self.datacenter
         self.driver = GCENodeDriver(*GCE_PARAMS, **kwargs)
+        IMAGE_INDEX_CACHE.clear()
 
     def test_default_scopes(self):
         self.assertEqual(self.driver.scopes, None)
@@ -90,6 +101,94 @@ class GCENodeDriverTest(GoogleTestCase, TestCaseMixin):
         region2 = self.driver._get_region_from_zone(zone2)
         self.assertEqual(region2.name, expected_region2)
 
+    def _get_driver(self, **kwargs):
+        driver_kwargs = GCE_KEYWORD_PARAMS.copy()
+        driver_kwargs['auth_type'] = 'IA'
+        driver_kwargs['datacenter'] = self.datacenter
+        driver_kwargs.update(kwargs)
+        return GCENodeDriver(*GCE_PARAMS, **driver_kwargs)
+
+    def _get_requested_paths(self, driver, func):
+        with mock.patch.object(driver.connection, 'request',
+                               wraps=driver.connection.request) as request:
+            func()
+
+        return [call[0][0] for call in request.call_args_list]
+
+    def test_locations_are_loaded_lazily(self):
+        LOCATION_CACHE.clear()
+
+        with mock.patch.object(GCENodeDriver, '_get_location_catalog') as get:
+            driver = self._get_driver()
+            self.assertFalse(get.called)
+
+        paths = self._get_requested_paths(driver, lambda: driver.zone)
+        self.assertEqual(paths, ['/zones'])
+        self.assertEqual(driver.zone.name, self.datacenter)
+
+        paths = self._get_requested_paths(driver, lambda: driver.region)
+        self.assertEqual(paths, ['/regions'])
+        self.assertEqual(driver.region.name, 'us-central1')
+
+    def test_locations_are_shared_between_drivers(self):
+        LOCATION_CACHE.clear()
+        self.assertEqual(self.driver.zone.name, self.datacenter)
+        self.assertTrue(self.driver.region_list)
+
+        driver = self._get_driver()
+        paths = self._get_requested_paths(
+            driver, lambda: (driver.zone_list, driver.region_list))
+        self.assertEqual(paths, [])
+        self.assertEqual(driver.zone.name, self.datacenter)
+        self.assertTrue(driver.zone.driver is driver)
+
+        # Expired entries are requested again
+        driver = self._get_driver(location_cache_ttl=-1)
+        paths = self._get_requested_paths(driver, lambda: driver.zone)
+        self.assertEqual(paths, ['/zones'])
+
+    def test_location_cache_file(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        cache_file = os.path.join(tmp_dir, 'locations.json')
+
+        LOCATION_CACHE.clear()
+        driver = self._get_driver(location_cache_file=cache_file)
+        zone_names = [zone.name for zone in driver.zone_list]
+
+        with open(cache_file) as fp:
+            data = json.load(fp)
+        self.assertEqual(
+            [item['name'] for item in data[driver.project]['zones']['items']],
+            zone_names)
+
+        # A new process starts with an empty in-memory cache
+        LOCATION_CACHE.clear()
+        driver = self._get_driver(location_cache_file=cache_file)
+        paths = self._get_requested_paths(driver, lambda: driver.zone_list)
+        self.assertEqual(paths, [])
+        self.assertEqual([zone.name for zone in driver.zone_list],
+                         zone_names)
+
+    def test_location_cache_file_invalid(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        cache_file = os.path.join(tmp_dir, 'locations.json')
+
+        with open(cache_file, 'w') as fp:
+            fp.write('not json')
+
+        LOCATION_CACHE.clear()
+        driver = self._get_driver(location_cache_file=cache_file)
+        paths = self._get_requested_paths(driver, lambda: driver.zone_list)
+        self.assertEqual(paths, ['/zones'])
+
+        # The invalid file is replaced
+        with open(cache_file) as fp:
+            self.assertTrue(driver.project in json.load(fp))
+        self.assertEqual(sorted(os.listdir(tmp_dir)),
+                         ['locations.json', 'locations.json.lock'])
+
     def test_get_volume(self):
         volume_name = 'lcdisk'
         volume = self.driver.ex_get_volume(volume_name)
@@ -128,6 +227,90 @@ class GCENodeDriverTest(GoogleTestCase, TestCaseMixin):
         image = self.driver._match_images(project, 'backports')
         self.assertEqual(image.name, 'backports-debian-7-wheezy-v20131127')
 
+    def test_image_index(self):
+        items = [
+            {'name': 'debian-7-wheezy-v20131014', 'family': 'debian-7',
+             'creationTimestamp': '2013-10-14T12:00:00.000-07:00',
+             'deprecated': {'state': 'DEPRECATED'}},
+            {'name': 'debian-7-wheezy-v20131120', 'family': 'debian-7',
+             'creationTimestamp': '2013-11-20T12:00:00.000-07:00'},
+            {'name': 'debian-7-wheezy-v20131010', 'family': 'debian-7',
+             'creationTimestamp': '2013-10-10T12:00:00.000-07:00'},
+            {'name': 'debian-8-jessie-v20150101',
+             'creationTimestamp': '2015-01-01T12:00:00.000-07:00'},
+        ]
+        index = GCEImageIndex('debian-cloud', items)
+
+        self.assertEqual(index.get('debian-8-jessie-v20150101'), items[3])
+        self.assertEqual(index.get('debian-8'), None)
+        self.assertEqual(index.match('debian-7'), items[1])
+        self.assertEqual(index.match('debian'), items[3])
+        self.assertEqual(index.match('debian-9'), None)
+        self.assertEqual(index.match('zzz'), None)
+        self.assertEqual(index.get_family('debian-7'), items[1])
+        self.assertEqual(index.get_family('debian-8'), None)
+
+        self.assertFalse(index.is_expired(60))
+        index.timestamp -= 120
+        self.assertTrue(index.is_expired(60))
+
+    def test_match_images_uses_shared_index(self):
+        image = self.driver._match_images('debian-cloud', 'debian-7')
+        self.assertEqual(image.name, 'debian-7-wheezy-v20131120')
+        self.assertTrue('debian-cloud' in IMAGE_INDEX_CACHE)
+
+        driver = self._get_driver()
+        paths = self._get_requested_paths(
+            driver, lambda: driver._match_images('debian-cloud', 'backports'))
+        self.assertEqual(paths, [])
+
+        image = driver._match_images('debian-cloud', 'debian-7')
+        self.assertEqual(image.name, 'debian-7-wheezy-v20131120')
+        self.assertTrue(image.driver is driver)
+
+        # Expired indexes are rebuilt
+        driver = self._get_driver(image_index_ttl=-1)
+        paths = self._get_requested_paths(
+            driver, lambda: driver._match_images('debian-cloud', 'debian-7'))
+        self.assertEqual(paths, [DEBIAN_CLOUD_IMAGES_URL])
+
+    def test_match_images_rebuilds_cached_index_on_miss(self):
+        self.driver._match_images('debian-cloud', 'debian-7')
+
+        # The image has been created after the index was built
+        index = IMAGE_INDEX_CACHE['debian-cloud']
+        del index.images['debian-7-wheezy-v20131120']
+        index.names.remove('debian-7-wheezy-v20131120')
+
+        driver = self._get_driver()
+        paths = self._get_requested_paths(
+            driver,
+            lambda: driver._match_images('debian-cloud',
+                                         'debian-7-wheezy-v20131120'))
+        self.assertEqual(paths, [DEBIAN_CLOUD_IMAGES_URL])
+        self.assertTrue(IMAGE_INDEX_CACHE['debian-cloud'] is not index)
+
+        # The index is only rebuilt once for an image which doesn't exist
+        paths = self._get_requested_paths(
+            driver, lambda: driver._match_images('debian-cloud', 'missing'))
+        self.assertEqual(paths, [DEBIAN_CLOUD_IMAGES_URL])
+
+    def test_image_index_is_invalidated_on_changes(self):
+        image = self.driver.ex_get_image('debian-7')
+        self.assertTrue(self.driver.project in IMAGE_INDEX_CACHE)
+
+        self.driver.ex_delete_image(image)
+        self.assertFalse(self.driver.project in IMAGE_INDEX_CACHE)
+
+    def test_ex_get_image_from_family_uses_loaded_index(self):
+        self.driver._match_images('coreos-cloud', 'coreos-beta')
+        paths = self._get_requested_paths(
+            self.driver,
+            lambda: self.driver.ex_get_image_from_family(
+                'coreos-beta', ex_project_list=['coreos-cloud'],
+                ex_standard_projects=False))
+        self.assertEqual(paths, [])
+
     def test_build_disk_gce_struct(self):
         device_name = 'disk_name'
         disk_name = None
@@ -619,6 +802,92 @@ class GCENodeDriverTest(GoogleTestCase, TestCaseMixin):
         names = [n.name for n in nodes_all]
         self.assertTrue('node-name' in names)
 
+    def test_list_nodes_lazy_extra(self):
+        nodes = self.driver.list_nodes(ex_zone='all')
+        self.driver.lazy_extra = True
+        lazy_nodes = self.driver.list_nodes(ex_zone='all')
+
+        self.assertEqual(len(nodes), len(lazy_nodes))
+
+        for node, lazy_node in zip(nodes, lazy_nodes):
+            self.assertTrue(lazy_node._extra_loader is not None)
+            self.assertEqual(lazy_node.image, node.image)
+            self.assertEqual(lazy_node.public_ips, node.public_ips)
+            self.assertEqual(sorted(lazy_node.extra.keys()),
+                             sorted(node.extra.keys()))
+            self.assertEqual(lazy_node.extra['image'], node.extra['image'])
+            self.assertEqual(lazy_node.extra['zone'].name,
+                             node.extra['zone'].name)
+            self.assertTrue(lazy_node._extra_loader is None)
+
+    def test_list_nodes_lazy_extra_defers_disk_lookup(self):
+        driver = self._get_driver()
+        driver.lazy_extra = True
+
+        nodes = []
+        paths = self._get_requested_paths(
+            driver, lambda: nodes.extend(driver.list_nodes(ex_zone='all')))
+        self.assertEqual(paths, ['/aggregated/instances'])
+
+        node = [n for n in nodes if n.name == 'node-name'][0]
+        paths = self._get_requested_paths(driver, lambda: node.image)
+        self.assertTrue('/zones/us-central1-a/disks' in paths)
+        self.assertEqual(node.image, 'debian-7-wheezy-v20131120')
+
+        # The boot disk is only looked up once
+        paths = self._get_requested_paths(driver, lambda: node.extra)
+        self.assertEqual(paths, [])
+        self.assertEqual(node.extra['boot_disk'].name, 'node-name')
+
+    def test_list_nodes_reuses_volume_index(self):
+        driver = self._get_driver()
+
+        paths = self._get_requested_paths(
+            driver, lambda: driver.list_nodes(ex_zone='all'))
+        self.assertEqual(paths.count('/aggregated/disks'), 1)
+
+        paths = self._get_requested_paths(
+            driver, lambda: driver.list_nodes(ex_zone='all'))
+        self.assertEqual(paths, ['/aggregated/instances'])
+
+        paths = self._get_requested_paths(
+            driver, lambda: driver.list_nodes(ex_zone='us-central1-a'))
+        self.assertEqual(paths, ['/zones/us-central1-a/instances'])
+
+        # The index is dropped once it's expired
+        driver._ex_volume_dict_expires = 0
+        paths = self._get_requested_paths(
+            driver, lambda: driver.list_nodes(ex_zone='us-central1-a'))
+        self.assertEqual(paths, ['/zones/us-central1-a/instances',
+                                 '/zones/us-central1-a/disks'])
+        self.assertEqual(driver._ex_volume_dict_zones,
+                         set(['us-central1-a']))
+
+    def test_ex_get_volume_fetches_missing_disk_only(self):
+        driver = self._get_driver()
+
+        paths = self._get_requested_paths(
+            driver, lambda: driver.ex_get_volume('lcdisk', 'us-central1-a',
+                                                 use_cache=True))
+        self.assertEqual(paths, ['/zones/us-central1-a/disks/lcdisk'])
+
+        paths = self._get_requested_paths(
+            driver, lambda: driver.ex_get_volume('lcdisk', 'us-central1-a',
+                                                 use_cache=True))
+        self.assertEqual(paths, [])
+
+        # Without a zone every disk has to be listed
+        paths = self._get_requested_paths(
+            driver, lambda: driver.ex_get_volume('lcnode-000',
+                                                 use_cache=True))
+        self.assertEqual(paths, ['/aggregated/disks'])
+
+        volume = driver.ex_get_volume('lcdisk', 'us-central1-a',
+                                      use_cache=True)
+        driver.destroy_volume(volume)
+        self.assertFalse('us-central1-a' in
+                         driver._ex_volume_dict.get('lcdisk', {}))
+
     def test_ex_list_regions(self):
         regions = self.driver.ex_list_regions()
         self.assertEqual(len(regions), 3)
@@ -1395,6 +1664,14 @@ class GCENodeDriverTest(GoogleTestCase, TestCaseMixin):
         self.assertEqual(nodes[0].extra['boot_disk'].size, disk_size)
         self.assertEqual(nodes[1].extra['boot_disk'].size, disk_size)
 
+    def test_create_nodes(self):
+        image = self.driver.ex_get_image('debian-7')
+        size = self.driver.ex_get_size('n1-standard-1')
+        nodes = self.driver.create_nodes(2, 'lcnode', size, image,
+                                         poll_interval=0, max_workers=2)
+        self.assertEqual([node.name for node in nodes],
+                         ['lcnode-000', 'lcnode-001'])
+
     def test_ex_create_multiple_nodes_image_family(self):
         base_name = 'lcnode'
         image = None
@@ -1700,6 +1977,117 @@ class GCENodeDriverTest(GoogleTestCase, TestCaseMixin):
         for d in destroyed:
             self.assertTrue(d)
 
+    def _get_aggregated_pages(self):
+        return [
+            {'items': {'zones/us-central1-a': {'disks': [{'name': 'd1'}]},
+                       'zones/us-east1-b': {'warning': {'code': 'NO'}}},
+             'nextPageToken': 'page2'},
+            {'items': {'zones/us-central1-a': {'disks': [{'name': 'd2'}]},
+                       'zones/europe-west1-a': {'disks': [{'name': 'd3'}]}}},
+        ]
+
+    def test_iterate_aggregated_items(self):
+        pages = self._get_aggregated_pages()
+        connection = self.driver.connection
+
+        with mock.patch.object(connection, 'request') as request:
+            request.side_effect = [mock.Mock(object=page) for page in pages]
+            items = connection.iterate_aggregated_items('disks')
+
+            # Pages are only requested as the items are consumed
+            self.assertEqual(request.call_count, 0)
+            self.assertEqual(next(items),
+                             ('zones/us-central1-a', [{'name': 'd1'}]))
+            self.assertEqual(request.call_count, 1)
+
+            items = [next(items)[0]] + [key for key, _ in items]
+
+        self.assertEqual(sorted(items), ['zones/europe-west1-a',
+                                         'zones/us-central1-a'])
+        self.assertEqual(request.call_args_list[0][1]['params'],
+                         {'maxResults': 500})
+        self.assertEqual(request.call_args_list[1][1]['params'],
+                         {'maxResults': 500, 'pageToken': 'page2'})
+
+    def test_request_aggregated_items(self):
+        pages = self._get_aggregated_pages()
+        connection = self.driver.connection
+
+        with mock.patch.object(connection, 'request') as request:
+            request.side_effect = [mock.Mock(object=page) for page in pages]
+            result = connection.request_aggregated_items('disks')
+
+        self.assertEqual(result, {'items': {
+            'zones/us-central1-a': {'disks': [{'name': 'd1'},
+                                              {'name': 'd2'}]},
+            'zones/europe-west1-a': {'disks': [{'name': 'd3'}]}}})
+
+    def test_request_zonal_items(self):
+        connection = self.driver.connection
+        result = connection.request_zonal_items(
+            'disks', ['us-central1-a', 'europe-west1-a'], max_workers=2)
+
+        self.assertEqual(sorted(result['items'].keys()),
+                         ['zones/europe-west1-a', 'zones/us-central1-a'])
+        disks = result['items']['zones/us-central1-a']['disks']
+        self.assertTrue(len(disks) > 0)
+        self.assertTrue('lcdisk' in [disk['name'] for disk in disks])
+
+    def test_operation_waiter_is_shared(self):
+        waiter = self.driver.operation_waiter
+        self.assertTrue(isinstance(waiter, GCEOperationWaiter))
+        self.assertTrue(self.driver.operation_waiter is waiter)
+        self.assertTrue(waiter.connection is self.driver.connection)
+
+    def test_multiple_nodes_use_shared_operation_waiter(self):
+        waiter = self.driver.operation_waiter
+        image = self.driver.ex_get_image('debian-7')
+        size = self.driver.ex_get_size('n1-standard-1')
+
+        with mock.patch.object(waiter, 'submit',
+                               side_effect=waiter.submit) as submit:
+            nodes = self.driver.ex_create_multiple_nodes(
+                'lcnode', size, image, 2, timeout=30, poll_interval=1)
+            self.assertEqual(submit.call_count, 2)
+            self.assertEqual(submit.call_args[1],
+                             {'timeout': 30, 'poll_interval': 1})
+
+            submit.reset_mock()
+            self.driver.ex_destroy_multiple_nodes(nodes)
+            self.assertEqual(submit.call_count, 2)
+
+    def test_multiple_nodes_operation_errors_are_not_timeouts(self):
+        nodes = [self.driver.ex_get_node('lcnode-000'),
+                 self.driver.ex_get_node('lcnode-001')]
+        future = mock.Mock()
+        future.result.side_effect = LibcloudError('Malformed response')
+
+        with mock.patch.object(self.driver.operation_waiter, 'submit',
+                               return_value=future):
+            try:
+                self.driver.ex_destroy_multiple_nodes(nodes)
+            except LibcloudError:
+                e = sys.exc_info()[1]
+                self.assertEqual(e.value, 'Malformed response')
+            else:
+                self.fail('Exception was not thrown')
+
+        future.result.side_effect = GCEOperationTimeoutError('Timed out')
+        with mock.patch.object(self.driver.operation_waiter, 'submit',
+                               return_value=future):
+            try:
+                self.driver.ex_destroy_multiple_nodes(nodes)
+            except Exception:
+                e = sys.exc_info()[1]
+                self.assertTrue(str(e).startswith('Timeout'))
+            else:
+                self.fail('Exception was not thrown')
+
+    def test_destroy_nodes(self):
+        nodes = [self.driver.ex_get_node('lcnode-000'),
+                 self.driver.ex_get_node('lcnode-001')]
+        self.assertEqual(self.driver.destroy_nodes(nodes), [True, True])
+
     def test_destroy_targethttpproxy(self):
         proxy = self.driver.ex_get_targethttpproxy('web-proxy')
         destroyed = proxy.destroy()
@@ -2160,6 +2548,100 @@ class GCENodeDriverTest(GoogleTestCase, TestCaseMixin):
         self.assertEqual(zone_no_mw.time_until_mw, None)
 
 
+class FakeOperationConnection(object):
+    poll_interval = 0
+    timeout = 10
+
+    def __init__(self, statuses):
+        # Map of operation selfLink to the list of statuses returned by
+        # consecutive polls
+        self.statuses = statuses
+        self.requests = []
+
+    def request(self, action):
+        self.requests.append(action)
+        status = self.statuses[action].pop(0)
+
+        if isinstance(status, Exception):
+            raise status
+
+        return mock.Mock(object={'name': action, 'selfLink': action,
+                                 'status': status})
+
+
+class GCEOperationWaiterTest(unittest.TestCase):
+    def _get_operation(self, name, status='PENDING'):
+        return {'name': name, 'selfLink': name, 'status': status}
+
+    def test_submit_done_operation(self):
+        connection = FakeOperationConnection({})
+        waiter = GCEOperationWaiter(connection)
+
+        future = waiter.submit(self._get_operation('op1', 'DONE'))
+        self.assertTrue(future.done())
+        self.assertEqual(future.result()['name'], 'op1')
+        self.assertEqual(connection.requests, [])
+
+    def test_wait_for_multiple_operations(self):
+        connection = FakeOperationConnection({
+            'op1': ['RUNNING', 'DONE'],
+            'op2': ['RUNNING', 'RUNNING', 'RUNNING', 'DONE'],
+            'op3': ['DONE']})
+        waiter = GCEOperationWaiter(connection)
+
+        futures = [waiter.submit(self._get_operation(name))
+                   for name in ['op1', 'op2', 'op3']]
+        operations = waiter.wait(futures, timeout=5)
+
+        self.assertEqual([op['name'] for op in operations],
+                         ['op1', 'op2', 'op3'])
+        self.assertTrue(all(op['status'] == 'DONE' for op in operations))
+        self.assertEqual(sorted(connection.requests),
+                         ['op1'] * 2 + ['op2'] * 4 + ['op3'])
+
+    def test_operation_error(self):
+        error = GoogleBaseError('failed', None, None)
+        connection = FakeOperationConnection({'op1': ['RUNNING', error],
+                                              'op2': ['DONE']})
+        waiter = GCEOperationWaiter(connection)
+
+        future1 = waiter.submit(self._get_operation('op1'))
+        future2 = waiter.submit(self._get_operation('op2'))
+
+        self.assertRaises(GoogleBaseError, future1.result, 5)
+        self.assertEqual(future2.result(5)['status'], 'DONE')
+
+    def test_operation_timeout(self):
+        connection = FakeOperationConnection({'op1': ['RUNNING'] * 100})
+        waiter = GCEOperationWaiter(connection, poll_interval=0.01)
+
+        future = waiter.submit(self._get_operation('op1'), timeout=0)
+        self.assertRaises(GCEOperationTimeoutError, future.result, 5)
+        self.assertTrue(future.done())
+
+    def test_shortest_poll_interval_is_used(self):
+        connection = FakeOperationConnection({'op1': ['RUNNING', 'DONE'],
+                                              'op2': ['RUNNING', 'DONE']})
+        waiter = GCEOperationWaiter(connection, poll_interval=60)
+
+        with mock.patch('libcloud.compute.drivers.gce.time.sleep') as sleep:
+            futures = [waiter.submit(self._get_operation('op1')),
+                       waiter.submit(self._get_operation('op2'),
+                                     poll_interval=0.01)]
+            waiter.wait(futures, timeout=5)
+
+        sleep.assert_called_with(0.01)
+
+    def test_result_timeout(self):
+        connection = FakeOperationConnection({'op1': ['RUNNING'] * 1000})
+        waiter = GCEOperationWaiter(connection, poll_interval=0.01)
+
+        future = waiter.submit(self._get_operation('op1'), timeout=1)
+        self.assertRaises(GCEOperationTimeoutError, future.result, 0.05)
+        self.assertFalse(future.done())
+        self.assertRaises(GCEOperationTimeoutError, future.result, 5)
+
+
 class GCEMockHttp(MockHttp):
     fixtures = ComputeFileFixtures('gce')
     json_hdr = {'content-type': 'application/json; charset=UTF-8'}
@@ -3333,12 +3815,12 @@ class GCEMockHttp(MockHttp):
 
     def _zones_us_central1_a_disks_lcnode_000(self, method, url, body,
                                               headers):
-        body = self.fixtures.load('generic_disk.json')
+        body = self.fixtures.load('zones_us-central1-a_disks_lcnode-000.json')
         return (httplib.OK, body, self.json_hdr, httplib.responses[httplib.OK])
 
     def _zones_us_central1_a_disks_lcnode_001(self, method, url, body,
                                               headers):
-        body = self.fixtures.load('generic_disk.json')
+        body = self.fixtures.load('zones_us-central1-a_disks_lcnode-001.json')
         return (httplib.OK, body, self.json_hdr, httplib.responses[httplib.OK])
 
     def _zones_us_central1_b_disks_libcloud_lb_demo_www_000(self, method, url,
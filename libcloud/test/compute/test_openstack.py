@@ -490,6 +490,13 @@ class OpenStackMockHttp(MockHttp, unittest.TestCase):
         return (httplib.INTERNAL_SERVER_ERROR, "<h1>500: Internal Server Error</h1>", {},
                 httplib.responses[httplib.INTERNAL_SERVER_ERROR])
 
+    def _v1_0_slug_servers_detail_UNAUTHORIZED(self, method, url, body, headers):
+        # The token obtained by the previous driver has been revoked
+        return (httplib.UNAUTHORIZED, "", {}, httplib.responses[httplib.UNAUTHORIZED])
+
+    _v1_0_slug_servers_detail_UNAUTHORIZED_MISSING_KEY = _v1_0_slug_servers_detail_UNAUTHORIZED
+    _v1_0_slug_servers_detail_INTERNAL_SERVER_ERROR = _v1_0_slug_servers_detail_UNAUTHORIZED
+
     def _v1_0_slug_images_detail_NO_MESSAGE_IN_ERROR_BODY(self, method, url, body, headers):
         body = self.fixtures.load('300_multiple_choices.json')
         return (httplib.MULTIPLE_CHOICES, body, self.json_content_headers, httplib.responses[httplib.OK])
@@ -817,6 +824,24 @@ class OpenStack_1_1_Tests(unittest.TestCase, TestCaseMixin):
         nodes = self.driver.list_nodes()
         self.assertEqual(nodes[0].extra['imageId'], None)
 
+    def test_iterate_nodes_follows_next_links(self):
+        self.driver_klass.connectionCls.conn_class.type = 'PAGINATED'
+
+        nodes = list(self.driver.iterate_nodes(ex_page_size=1))
+        self.assertEqual([node.id for node in nodes], ['12065', '12064'])
+
+    def test_list_nodes_follows_next_links(self):
+        self.driver_klass.connectionCls.conn_class.type = 'PAGINATED'
+
+        nodes = self.driver.list_nodes()
+        self.assertEqual([node.id for node in nodes], ['12065', '12064'])
+
+    def test_iterate_volumes_sends_page_size(self):
+        self.driver_klass.connectionCls.conn_class.type = 'PAGINATED'
+
+        volumes = list(self.driver.iterate_volumes(ex_page_size=10))
+        self.assertEqual(len(volumes), 2)
+
     def test_list_volumes(self):
         volumes = self.driver.list_volumes()
         self.assertEqual(len(volumes), 2)
@@ -1622,6 +1647,14 @@ class OpenStack_2_Tests(OpenStack_1_1_Tests):
         self.assertEqual(image.extra['minDisk'], 40)
         self.assertEqual(image.extra['minRam'], 0)
 
+    def test_list_images_follows_next_link(self):
+        self.driver_klass.image_connectionCls.conn_class.type = 'PAGINATED'
+
+        images = self.driver.list_images()
+        self.assertEqual([image.id for image in images],
+                         ['f24a3c1b-d52a-4116-91da-25b3eee8f55e',
+                          '4bd743f8-7e7d-4568-8f31-b3f06b90e70a'])
+
     def test_ex_update_image(self):
         image_id = 'f24a3c1b-d52a-4116-91da-25b3eee8f55e'
         data = {
@@ -1727,6 +1760,18 @@ class OpenStack_1_1_MockHttp(MockHttp, unittest.TestCase):
         body = self.fixtures.load('_servers_detail_ERROR_STATE.json')
         return (httplib.OK, body, self.json_content_headers, httplib.responses[httplib.OK])
 
+    def _v1_1_slug_servers_detail_PAGINATED(self, method, url, body, headers):
+        if 'marker=12065' in url:
+            self.assertIn('limit=1', url)
+            body = self.fixtures.load('_servers_detail_paginated_2.json')
+        else:
+            body = self.fixtures.load('_servers_detail_paginated_1.json')
+        return (httplib.OK, body, self.json_content_headers, httplib.responses[httplib.OK])
+
+    def _v1_1_slug_os_volumes_PAGINATED(self, method, url, body, headers):
+        self.assertIn('limit=10', url)
+        return self._v1_1_slug_os_volumes(method, url, body, headers)
+
     def _v2_1337_servers_does_not_exist(self, *args, **kwargs):
         return httplib.NOT_FOUND, None, {}, httplib.responses[httplib.NOT_FOUND]
 
@@ -1883,6 +1928,13 @@ class OpenStack_1_1_MockHttp(MockHttp, unittest.TestCase):
         else:
             raise NotImplementedError()
 
+    def _v2_1337_v2_images_PAGINATED(self, method, url, body, headers):
+        if 'marker=f24a3c1b-d52a-4116-91da-25b3eee8f55e' in url:
+            body = self.fixtures.load('_images_v2_paginated_2.json')
+        else:
+            body = self.fixtures.load('_images_v2_paginated_1.json')
+        return (httplib.OK, body, self.json_content_headers, httplib.responses[httplib.OK])
+
     def _v1_1_slug_images_26365521_8c62_11f9_2c33_283d153ecc3a(self, method, url, body, headers):
         if method == "DELETE":
             return (httplib.NO_CONTENT, "", {}, httplib.responses[httplib.NO_CONTENT])
@@ -26,6 +26,7 @@ from libcloud.test import LibcloudTestCase
 from libcloud.test import unittest
 from libcloud.compute.ssh import ParamikoSSHClient
 from libcloud.compute.ssh import ShellOutSSHClient
+from libcloud.compute.ssh import SSHClientPool
 from libcloud.compute.ssh import have_paramiko
 
 from libcloud.utils.py3 import StringIO
@@ -252,6 +253,107 @@ class ParamikoSSHClientTests(LibcloudTestCase):
         mock.close()
         self.assertLogMsg('Closing server connection')
 
+    @patch('libcloud.compute.ssh.time.sleep')
+    @patch('libcloud.compute.ssh.select.select')
+    def test_run_waits_for_output_and_streams_it(self, mock_select,
+                                                 mock_sleep):
+        mock = self.ssh_cli
+        chan = mock.client.get_transport.return_value.open_session.return_value
+        chan.closed = False
+        chan.recv_exit_status.return_value = 0
+
+        stdout_chunks = ['foo', '', 'bar', 'baz']
+        stderr_chunks = ['', 'err', '', '']
+
+        for stdout_handler, stderr_handler in [(None, None),
+                                               (Mock(), Mock())]:
+            chan.exit_status_ready.side_effect = [False, False, False, True]
+            mock._consume_stdout = Mock(side_effect=[
+                StringIO(chunk) for chunk in stdout_chunks])
+            mock._consume_stderr = Mock(side_effect=[
+                StringIO(chunk) for chunk in stderr_chunks])
+            mock_select.reset_mock()
+
+            stdout, stderr, status = mock.run('ls', timeout=10,
+                                              stdout_handler=stdout_handler,
+                                              stderr_handler=stderr_handler)
+            self.assertEqual(status, 0)
+            self.assertEqual(mock_select.call_count, 2)
+            mock_select.assert_called_with([chan], [], [],
+                                           mock.SLEEP_DELAY)
+
+            if stdout_handler is None:
+                self.assertEqual(stdout, 'foobarbaz')
+                self.assertEqual(stderr, 'err')
+            else:
+                self.assertEqual(stdout, '')
+                self.assertEqual(stderr, '')
+                self.assertEqual([c[0][0] for c in
+                                  stdout_handler.call_args_list],
+                                 ['foo', 'bar', 'baz'])
+                stderr_handler.assert_called_once_with('err')
+
+        self.assertFalse(mock_sleep.called)
+        self.assertLogMsg('duration=')
+
+    def test_putfo_streams_pipelined_chunks(self):
+        mock = self.ssh_cli
+        mock.connect()
+        mock.PUT_CHUNK_SIZE = 4
+        remote_file = mock.client.open_sftp.return_value.file.return_value
+
+        path = mock.putfo('/root/artifact.tar', StringIO('0123456789'),
+                          chmod=int('644', 8))
+        self.assertEqual(path, '/root/artifact.tar')
+
+        remote_file.set_pipelined.assert_called_once_with(True)
+        self.assertEqual([c[0][0] for c in remote_file.write.call_args_list],
+                         ['0123', '4567', '89'])
+        remote_file.chmod.assert_called_once_with(int('644', 8))
+        remote_file.close.assert_called_once_with()
+
+    def test_sftp_session_is_reused(self):
+        mock = self.ssh_cli
+        mock.connect()
+        mock.client.open_sftp.return_value.get_channel.return_value.closed = \
+            False
+        mock.client.open_sftp.return_value.getcwd.return_value = '/home/ubuntu'
+
+        mock.put('/root/script1.sh', contents='a')
+        mock.put('script2.sh', contents='b')
+        mock.delete('/root/script1.sh')
+
+        self.assertEqual(mock.client.open_sftp.call_count, 1)
+        mock.client.open_sftp.return_value.chdir.assert_any_call(None)
+
+        # Closed channel, new session is opened
+        mock.client.open_sftp.return_value.get_channel.return_value.closed = \
+            True
+        mock.delete('script2.sh')
+        self.assertEqual(mock.client.open_sftp.call_count, 2)
+
+        mock.close()
+        mock.client.open_sftp.return_value.close.assert_called_once_with()
+        self.assertTrue(mock.sftp_client is None)
+
+    def test_connect_reuses_active_transport(self):
+        mock = self.ssh_cli
+        self.assertFalse(mock.is_connected())
+
+        mock.client.get_transport.return_value.is_active.return_value = True
+        mock.connect()
+        mock.connect()
+        self.assertTrue(mock.is_connected())
+        self.assertEqual(mock.client.connect.call_count, 1)
+
+        mock.client.get_transport.return_value.is_active.return_value = False
+        self.assertFalse(mock.is_connected())
+        mock.connect()
+        self.assertEqual(mock.client.connect.call_count, 2)
+
+        mock.close()
+        self.assertFalse(mock.is_connected())
+
     def assertLogMsg(self, expected_msg):
         with open(self.tmp_file, 'r') as fp:
             content = fp.read()
@@ -341,6 +443,35 @@ class ParamikoSSHClientTests(LibcloudTestCase):
         self.assertTrue(len(stderr) in [1, 2])
 
 
+class SSHClientPoolTests(LibcloudTestCase):
+
+    def test_get_client(self):
+        client_cls = Mock()
+        client_cls.return_value.is_connected.return_value = True
+        pool = SSHClientPool(client_cls=client_cls)
+
+        client1 = pool.get_client(hostname='1.2.3.4', username='root',
+                                  password='foo')
+        client2 = pool.get_client(hostname='1.2.3.4', username='root',
+                                  password='foo')
+        self.assertTrue(client1 is client2)
+        client_cls.assert_called_once_with(hostname='1.2.3.4', port=22,
+                                           username='root', password='foo')
+
+        pool.get_client(hostname='1.2.3.4', username='ubuntu')
+        pool.get_client(hostname='1.2.3.5', username='root')
+        self.assertEqual(client_cls.call_count, 3)
+
+        # Disconnected clients are replaced
+        client_cls.return_value.is_connected.return_value = False
+        pool.get_client(hostname='1.2.3.4', username='root')
+        self.assertEqual(client_cls.call_count, 4)
+
+        pool.close()
+        self.assertEqual(client_cls.return_value.close.call_count, 3)
+        self.assertEqual(pool._clients, {})
+
+
 class ShellOutSSHClientTests(LibcloudTestCase):
 
     def test_password_auth_not_supported(self):
@@ -18,6 +18,7 @@ import os
 import socket
 import sys
 import ssl
+import threading
 
 from mock import Mock, patch
 
@@ -208,6 +209,44 @@ class BaseConnectionClassTestCase(unittest.TestCase):
         conn2.connect()
         self.assertEqual(conn2.connection.host, 'http://localhost:8081')
 
+    def test_response_is_stored_per_thread(self):
+        conn = LibcloudConnection(host='localhost', port=80)
+        conn.response = 'main'
+
+        responses = []
+
+        def request():
+            responses.append(conn.response)
+            conn.response = 'thread'
+            responses.append(conn.getresponse())
+
+        thread = threading.Thread(target=request)
+        thread.start()
+        thread.join()
+
+        self.assertEqual(responses, [None, 'thread'])
+        self.assertEqual(conn.getresponse(), 'main')
+
+    def test_request_values_are_stored_per_thread(self):
+        conn = Connection()
+        conn.action, conn.method, conn.data = '/main', 'GET', 'main'
+
+        values = []
+
+        def request():
+            values.append((conn.action, conn.method, conn.data))
+            conn.action, conn.method, conn.data = '/thread', 'POST', 'thread'
+            values.append((conn.action, conn.method, conn.data))
+
+        thread = threading.Thread(target=request)
+        thread.start()
+        thread.join()
+
+        self.assertEqual(values, [(None, None, None),
+                                  ('/thread', 'POST', 'thread')])
+        self.assertEqual((conn.action, conn.method, conn.data),
+                         ('/main', 'GET', 'main'))
+
 
 class ConnectionClassTestCase(unittest.TestCase):
     def setUp(self):
@@ -16,7 +16,10 @@
 
 import os
 import sys
+import shutil
 import logging
+import tempfile
+import subprocess
 
 try:
     import paramiko
@@ -64,5 +67,51 @@ class TestUtils(unittest.TestCase):
         with self.assertRaises(DriverTypeNotFoundError):
             libcloud.get_driver('potato', 'potato')
 
+    def test_have_paramiko(self):
+        self.assertEqual(libcloud.have_paramiko, have_paramiko)
+
+    def test_compute_drivers_dont_import_paramiko(self):
+        # paramiko is slow to import and should only be imported once it's
+        # actually used
+        script = ('import sys; import libcloud.compute.drivers.ec2; '
+                  'import libcloud.compute.drivers.gce; '
+                  'print("paramiko" in sys.modules)')
+        root_dir = os.path.abspath(os.path.join(
+            os.path.dirname(libcloud.__file__), '../'))
+        env = os.environ.copy()
+        env['PYTHONPATH'] = root_dir
+        env.pop('LIBCLOUD_DEBUG', None)
+        # Other tests point this variable to invalid files
+        env.pop('SSL_CERT_FILE', None)
+
+        output = subprocess.check_output([sys.executable, '-c', script],
+                                         env=env)
+        self.assertEqual(output.decode('utf-8').strip(), 'False')
+
+    def test_broken_paramiko(self):
+        # paramiko is installed, but importing it fails
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        os.mkdir(os.path.join(tmp_dir, 'paramiko'))
+        with open(os.path.join(tmp_dir, 'paramiko', '__init__.py'), 'w') as fp:
+            fp.write('raise ImportError("broken")\n')
+
+        script = ('import libcloud; import libcloud.compute.ssh as ssh; '
+                  'client = ssh.SSHClient(hostname="localhost", '
+                  'key_material="key"); '
+                  'print("%s %s %s" % (libcloud.have_paramiko, '
+                  'ssh.have_paramiko, type(client).__name__))')
+        root_dir = os.path.abspath(os.path.join(
+            os.path.dirname(libcloud.__file__), '../'))
+        env = os.environ.copy()
+        env['PYTHONPATH'] = os.pathsep.join([tmp_dir, root_dir])
+        env['LIBCLOUD_DEBUG'] = os.path.join(tmp_dir, 'debug.log')
+        env.pop('SSL_CERT_FILE', None)
+
+        output = subprocess.check_output([sys.executable, '-c', script],
+                                         env=env)
+        self.assertEqual(output.decode('utf-8').strip(),
+                         'False False MockSSHClient')
+
 if __name__ == '__main__':
     sys.exit(unittest.main())
@@ -102,5 +102,27 @@ class PricingTestCase(unittest.TestCase):
                                      pricing={'foo': 1})
         self.assertTrue('foo' in libcloud.pricing.PRICING_DATA['compute'])
 
+    def test_invalidation_callbacks(self):
+        calls = []
+
+        def callback(driver_type, driver_name):
+            calls.append((driver_type, driver_name))
+
+        libcloud.pricing.register_pricing_invalidation_callback(callback)
+        libcloud.pricing.register_pricing_invalidation_callback(callback)
+
+        try:
+            libcloud.pricing.set_pricing(driver_type='compute',
+                                         driver_name='foo', pricing={})
+            libcloud.pricing.invalidate_module_pricing_cache(
+                driver_type='compute', driver_name='foo')
+            libcloud.pricing.invalidate_pricing_cache()
+        finally:
+            libcloud.pricing.PRICING_INVALIDATION_CALLBACKS.remove(callback)
+
+        self.assertEqual(calls, [('compute', 'foo'), ('compute', 'foo'),
+                                 (None, None)])
+
+
 if __name__ == '__main__':
     sys.exit(unittest.main())
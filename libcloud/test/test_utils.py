@@ -15,9 +15,13 @@
 # limitations under the License.
 
 import sys
+import mock
+import shutil
 import pytest
 import socket
+import time
 import codecs
+import tempfile
 import unittest
 import warnings
 import os.path
@@ -28,6 +32,7 @@ from itertools import chain
 warnings.simplefilter('default')
 
 import libcloud.utils.files
+import libcloud.utils.xml
 
 from libcloud.utils.misc import get_driver, set_driver
 
@@ -40,6 +45,8 @@ from libcloud.utils.py3 import urlquote
 from libcloud.compute.types import Provider
 from libcloud.compute.providers import DRIVERS
 from libcloud.utils.misc import get_secure_random_string
+from libcloud.utils.xml import fixxpath, findtext, findattr, findall
+from libcloud.utils.concurrency import run_concurrently
 from libcloud.utils.networking import is_public_subnet
 from libcloud.utils.networking import is_private_subnet
 from libcloud.utils.networking import is_valid_ip_address
@@ -80,6 +87,70 @@ class TestUtils(unittest.TestCase):
 
         self.assertTrue(mimetype.find('python') != -1)
 
+    def test_write_file_atomically(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        filename = os.path.join(tmp_dir, 'data.json')
+
+        libcloud.utils.files.write_file_atomically(filename, 'first',
+                                                   mode=int('600', 8))
+        if sys.platform != 'win32':
+            self.assertEqual(os.stat(filename).st_mode & int('777', 8),
+                             int('600', 8))
+
+        # Existing files are replaced
+        libcloud.utils.files.write_file_atomically(filename, 'second')
+
+        with open(filename) as fp:
+            self.assertEqual(fp.read(), 'second')
+        self.assertEqual(os.listdir(tmp_dir), ['data.json'])
+
+    def test_write_file_atomically_removes_temporary_file(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        filename = os.path.join(tmp_dir, 'data.json')
+
+        with mock.patch('libcloud.utils.files._replace_file',
+                        side_effect=OSError('rename failed')):
+            self.assertRaises(OSError,
+                              libcloud.utils.files.write_file_atomically,
+                              filename, 'data')
+
+        self.assertEqual(os.listdir(tmp_dir), [])
+
+    def test_write_file_atomically_concurrent_writers(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        filename = os.path.join(tmp_dir, 'data.json')
+
+        values = ['%s' % (index) * 10000 for index in range(10)]
+        run_concurrently(
+            lambda value: libcloud.utils.files.write_file_atomically(
+                filename, value), values, max_workers=10)
+
+        with open(filename) as fp:
+            self.assertTrue(fp.read() in values)
+        self.assertEqual(os.listdir(tmp_dir), ['data.json'])
+
+    def test_lock_file(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        filename = os.path.join(tmp_dir, 'counter')
+        libcloud.utils.files.write_file_atomically(filename, '0')
+
+        def increment(_):
+            with libcloud.utils.files.lock_file(filename + '.lock'):
+                with open(filename) as fp:
+                    value = int(fp.read())
+                time.sleep(0.001)
+                libcloud.utils.files.write_file_atomically(filename,
+                                                           str(value + 1))
+
+        run_concurrently(increment, range(20), max_workers=10)
+
+        with open(filename) as fp:
+            self.assertEqual(fp.read(), '20')
+
     def test_get_driver(self):
         driver = get_driver(drivers=DRIVERS, provider=Provider.DUMMY)
         self.assertTrue(driver is not None)
@@ -285,6 +356,96 @@ class TestUtils(unittest.TestCase):
             self.assertEqual(bchr(97), 'a')
 
 
+class XmlUtilsTestCase(unittest.TestCase):
+    namespace = 'http://example.com/doc/'
+    body = ('<root xmlns="http://example.com/doc/"><set><item><id>1</id>'
+            '<empty/></item><item><id>2</id></item></set></root>')
+
+    def setUp(self):
+        libcloud.utils.xml.clear_xpath_cache()
+
+    def tearDown(self):
+        libcloud.utils.xml.XPATH_CACHE_SIZE = 1024
+        libcloud.utils.xml.clear_xpath_cache()
+
+    def _assert_find_methods(self, element):
+        items = findall(element=element, xpath='set/item',
+                        namespace=self.namespace)
+        self.assertEqual(len(items), 2)
+        self.assertEqual(findtext(element=element, xpath='set/item/id',
+                                  namespace=self.namespace), '1')
+        self.assertEqual(findtext(element=items[1], xpath='id',
+                                  namespace=self.namespace), '2')
+        self.assertEqual(findtext(element=items[0], xpath='empty',
+                                  namespace=self.namespace,
+                                  no_text_value=None), None)
+        self.assertEqual(findattr(element=items[0], xpath='empty',
+                                  namespace=self.namespace), '')
+        self.assertEqual(findattr(element=items[0], xpath='missing',
+                                  namespace=self.namespace), None)
+
+    def test_fixxpath(self):
+        self.assertEqual(fixxpath('set/item'), 'set/item')
+
+        for _ in range(2):
+            self.assertEqual(fixxpath('set/item', self.namespace),
+                             '{http://example.com/doc/}set/'
+                             '{http://example.com/doc/}item')
+
+        self.assertEqual(len(libcloud.utils.xml._xpath_cache), 1)
+
+    def test_fixxpath_cache_is_bounded(self):
+        libcloud.utils.xml.XPATH_CACHE_SIZE = 10
+
+        for index in range(20):
+            fixxpath('item%s' % (index), self.namespace)
+
+        cache = libcloud.utils.xml._xpath_cache
+        self.assertEqual(len(cache), 10)
+        self.assertEqual(list(cache.keys())[0],
+                         ('item10', self.namespace))
+
+        # Least recently used entries are evicted first
+        fixxpath('item10', self.namespace)
+        fixxpath('item20', self.namespace)
+        self.assertTrue(('item10', self.namespace) in cache)
+        self.assertFalse(('item11', self.namespace) in cache)
+
+    def test_find_methods(self):
+        from xml.etree import ElementTree
+
+        self._assert_find_methods(ElementTree.XML(self.body))
+
+    def test_find_methods_lxml(self):
+        try:
+            from lxml import etree
+        except ImportError:
+            self.skipTest('lxml is not available')
+
+        self._assert_find_methods(etree.XML(self.body))
+
+
+class ConcurrencyUtilsTestCase(unittest.TestCase):
+    def test_run_concurrently(self):
+        def func(item):
+            if item == 3:
+                raise ValueError('bad item')
+            return item * 2
+
+        for max_workers in [1, 3, 20]:
+            results = run_concurrently(func, range(6),
+                                       max_workers=max_workers)
+
+            self.assertEqual([result for result, _ in results],
+                             [0, 2, 4, None, 8, 10])
+            self.assertEqual([exc is None for _, exc in results],
+                             [True, True, True, False, True, True])
+            self.assertTrue(isinstance(results[3][1], ValueError))
+
+    def test_run_concurrently_no_items(self):
+        self.assertEqual(run_concurrently(lambda item: item, []), [])
+
+
 class NetworkingUtilsTestCase(unittest.TestCase):
     def test_is_public_and_is_private_subnet(self):
         public_ips = [
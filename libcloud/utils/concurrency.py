@@ -0,0 +1,85 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import threading
+
+__all__ = [
+    'DEFAULT_MAX_WORKERS',
+    'run_concurrently'
+]
+
+# Default maximum number of threads used by run_concurrently
+DEFAULT_MAX_WORKERS = 10
+
+
+def run_concurrently(func, items, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Call ``func`` for every item using a bounded pool of threads.
+
+    Exceptions raised by ``func`` don't abort the processing of the remaining
+    items, they are returned next to the result instead so the caller can
+    decide how to handle partial failures.
+
+    :param func: Function which is called with a single item.
+    :type func: ``callable``
+
+    :param items: Items to process.
+    :type items: ``list``
+
+    :param max_workers: Maximum number of concurrently running threads.
+    :type max_workers: ``int``
+
+    :return: List of ``(result, exception)`` tuples in the same order as
+             ``items``. ``exception`` is None if the call succeeded.
+    :rtype: ``list`` of ``tuple``
+    """
+    items = list(items)
+    results = [None] * len(items)
+    lock = threading.Lock()
+    state = {'index': 0}
+
+    def worker():
+        while True:
+            with lock:
+                index = state['index']
+
+                if index >= len(items):
+                    return
+
+                state['index'] += 1
+
+            try:
+                results[index] = (func(items[index]), None)
+            except Exception:
+                results[index] = (None, sys.exc_info()[1])
+
+    workers_count = min(max(max_workers, 1), len(items))
+
+    if workers_count <= 1:
+        # No need to spawn threads for a single worker
+        worker()
+        return results
+
+    threads = [threading.Thread(target=worker) for _ in range(workers_count)]
+
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    return results
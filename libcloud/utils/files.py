@@ -14,7 +14,10 @@
 # limitations under the License.
 
 import os
+import tempfile
+import threading
 import mimetypes
+import contextlib
 
 from libcloud.utils.py3 import PY3
 from libcloud.utils.py3 import httplib
@@ -24,12 +27,24 @@ from libcloud.utils.py3 import b
 if PY3:
     from io import FileIO as file
 
+try:
+    import fcntl
+except ImportError:
+    # File locking is unavailable (e.g. on Windows)
+    fcntl = None
+
 CHUNK_SIZE = 8096
 
+# Serialises lock_file() between the threads of a process, also where
+# fcntl isn't available
+_THREAD_FILE_LOCK = threading.Lock()
+
 __all__ = [
     'read_in_chunks',
     'exhaust_iterator',
-    'guess_file_mime_type'
+    'guess_file_mime_type',
+    'write_file_atomically',
+    'lock_file'
 ]
 
 
@@ -127,3 +142,92 @@ def guess_file_mime_type(file_path):
     filename = os.path.basename(file_path)
     (mimetype, encoding) = mimetypes.guess_type(filename)
     return mimetype, encoding
+
+
+def write_file_atomically(filename, data, mode=None):
+    """
+    Write data to a file so that other processes never read a partially
+    written file.
+
+    The data is written to a uniquely named temporary file in the same
+    directory which then replaces the target file. The temporary file is
+    removed if anything fails.
+
+    Concurrent writers don't interfere with each other, but the last one
+    wins. Callers which read, modify and write the file back need to
+    serialise that themselves (e.g. using :func:`lock_file`).
+
+    :param filename: Path of the file to write.
+    :type filename: ``str``
+
+    :param data: Data to write.
+    :type data: ``str``
+
+    :param mode: Optional permissions of the file (e.g. ``int('644', 8)``).
+                 Only the owner can read and write the file by default.
+    :type mode: ``int``
+    """
+    fd, tmp_filename = tempfile.mkstemp(
+        dir=os.path.dirname(filename),
+        prefix='.%s.' % (os.path.basename(filename)), suffix='.tmp')
+
+    try:
+        with os.fdopen(fd, 'w') as fp:
+            fp.write(data)
+        if mode is not None:
+            os.chmod(tmp_filename, mode)
+        _replace_file(tmp_filename, filename)
+    except Exception:
+        _remove_file(tmp_filename)
+        raise
+
+
+@contextlib.contextmanager
+def lock_file(filename):
+    """
+    Hold an exclusive lock on a file while the block is executed. The lock
+    is shared by all the threads and processes which use this function.
+
+    Locking between processes is skipped if it's not supported (e.g. on
+    Windows) or if the lock file can't be opened.
+
+    :param filename: Path of the lock file. It's created if it's missing.
+    :type filename: ``str``
+    """
+    with _THREAD_FILE_LOCK:
+        try:
+            fd = os.open(filename, os.O_CREAT | os.O_RDWR, int('600', 8))
+        except OSError:
+            fd = None
+
+        try:
+            if fd is not None and fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            if fd is not None:
+                # Closing the file also releases the lock
+                os.close(fd)
+
+
+def _remove_file(filename):
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
+
+
+def _replace_file(source, destination):
+    if hasattr(os, 'replace'):
+        # Python 3.3+
+        os.replace(source, destination)
+        return
+
+    try:
+        os.rename(source, destination)
+    except OSError:
+        # os.rename() doesn't replace existing files on Windows
+        if not os.path.exists(destination):
+            raise
+        os.remove(destination)
+        os.rename(source, destination)
@@ -13,20 +13,70 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import OrderedDict
+
 __all__ = [
     'fixxpath',
     'findtext',
     'findattr',
-    'findall'
+    'findall',
+    'clear_xpath_cache'
 ]
 
+# Maximum number of entries held in the xpath cache
+XPATH_CACHE_SIZE = 1024
+
+# (xpath, namespace) -> namespaced xpath string
+_xpath_cache = OrderedDict()
+
+
+def _cache_get(cache, key):
+    """
+    Return the cached value for the provided key and mark it as the most
+    recently used one. Raises ``KeyError`` if the key is not cached.
+    """
+    value = cache.pop(key)
+    cache[key] = value
+    return value
+
+
+def _cache_set(cache, key, value):
+    """
+    Store a value in the cache, evicting the least recently used entry if
+    the cache is full.
+    """
+    while len(cache) >= XPATH_CACHE_SIZE:
+        try:
+            cache.popitem(last=False)
+        except KeyError:
+            # Emptied concurrently by another thread
+            break
+
+    cache[key] = value
+
+
+def clear_xpath_cache():
+    """
+    Clear the namespaced xpath cache.
+    """
+    _xpath_cache.clear()
+
 
 def fixxpath(xpath, namespace=None):
     # ElementTree wants namespaces in its xpaths, so here we add them.
     if not namespace:
         return xpath
 
-    return '/'.join(['{%s}%s' % (namespace, e) for e in xpath.split('/')])
+    key = (xpath, namespace)
+
+    try:
+        return _cache_get(_xpath_cache, key)
+    except KeyError:
+        pass
+
+    value = '/'.join(['{%s}%s' % (namespace, e) for e in xpath.split('/')])
+    _cache_set(_xpath_cache, key, value)
+    return value
 
 
 def findtext(element, xpath, namespace=None, no_text_value=''):